@@ -11,10 +11,9 @@ Endpoints:
 from __future__ import annotations
 from typing import List
 from datetime import datetime, timezone
-import hashlib
 import time
 import random
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlmodel import Session, select
 import json
 
@@ -25,8 +24,6 @@ from app.models.assessment import Assessment
 from app.models.text_entry import TextEntry
 from app.models.audio_recording import AudioRecording
 from app.models.video_recording import VideoRecording
-from app.models.questionnaire import QuestionnaireResponse
-from app.models.extracted_feature import ExtractedFeature
 from app.models.analysis_result import AnalysisResult
 from app.models.risk_score import RiskScore
 from app.models.recommendation import Recommendation
@@ -34,9 +31,11 @@ from app.models.safety_flag import SafetyFlag
 from app.models.inference_run import InferenceRun
 from app.schemas.analysis import AnalysisResultResponse, RiskScoreResponse
 from app.schemas.recommendation import RecommendationResponse, SafetyFlagResponse
-from app.services.scoring_service import compute_scores
+from app.services import analysis_snapshot_service, fusion_engine_service
+from app.services.feature_repository import FeatureRepository
 from app.services.recommendation_service import generate as generate_recommendations
 from app.core.config import get_settings
+from app.utils.wellness import compute_wellness_score
 
 router = APIRouter(prefix="/analysis", tags=["Analysis"])
 settings = get_settings()
@@ -108,40 +107,15 @@ async def get_checkin_prompts(current_user: User = Depends(get_current_user)):
         return base_fallback
 
 
-def _load_feature_json(session: Session, assessment_id: str, modality: str) -> dict | None:
-    feat = session.exec(
-        select(ExtractedFeature)
-        .where(ExtractedFeature.assessment_id == assessment_id)
-        .where(ExtractedFeature.modality_type == modality)
-        .order_by(ExtractedFeature.computed_at.desc())
-    ).first()
-    if feat and feat.feature_json:
-        try:
-            return json.loads(feat.feature_json)
-        except Exception:
-            pass
-    return None
-
-
-def _build_analysis_payload(session: Session, obj: AnalysisResult, scores: dict | None = None) -> dict:
+def _build_analysis_payload(features: FeatureRepository, obj: AnalysisResult, scores: dict | None = None) -> dict:
     """Build response payload with per-modality confidences."""
     inference_tracking = None
     if scores is None:
-        run = session.exec(
-            select(InferenceRun)
-            .where(InferenceRun.assessment_id == obj.assessment_id)
-            .order_by(InferenceRun.created_at.desc())
-        ).first()
-        if run and run.output_json:
-            try:
-                inference_tracking = json.loads(run.output_json)
-            except Exception:
-                inference_tracking = None
-
-    if scores is None:
-        text_feat = _load_feature_json(session, obj.assessment_id, "text") or {}
-        audio_feat = _load_feature_json(session, obj.assessment_id, "audio") or {}
-        video_feat = _load_feature_json(session, obj.assessment_id, "video") or {}
+        inference_tracking = features.latest_tracking(obj.assessment_id)
+        modality_features = features.features(obj.assessment_id)
+        text_feat = modality_features["text"] or {}
+        audio_feat = modality_features["audio"] or {}
+        video_feat = modality_features["video"] or {}
         text_conf = text_feat.get("text_emotion_confidence", text_feat.get("emotion_score"))
         text_integrity_score = text_feat.get("text_integrity_score")
         text_spoof_risk = text_feat.get("text_spoof_risk")
@@ -185,10 +159,6 @@ def _build_analysis_payload(session: Session, obj: AnalysisResult, scores: dict
             "overall_spoof_risk": overall_spoof_risk,
         }
 
-    stress_score = float(obj.stress_score or 0.0)
-    mood_score = float(obj.mood_score or 0.0)
-    wellness_score = int(round(((1.0 - stress_score) * 0.45 + mood_score * 0.55) * 100.0))
-
     return {
         "id": obj.id,
         "assessment_id": obj.assessment_id,
@@ -211,7 +181,7 @@ def _build_analysis_payload(session: Session, obj: AnalysisResult, scores: dict
         "visual_integrity_flags": visual_integrity_flags,
         "stress_score": obj.stress_score,
         "mood_score": obj.mood_score,
-        "wellness_score": wellness_score,
+        "wellness_score": compute_wellness_score(obj.stress_score, obj.mood_score),
         "emotional_distress_score": obj.emotional_distress_score,
         "final_risk_probability": (inference_tracking or {}).get("model_output_scores", {}).get("crisis_score"),
         "wellness_flag": obj.wellness_flag,
@@ -230,9 +200,40 @@ def _build_analysis_payload(session: Session, obj: AnalysisResult, scores: dict
     }
 
 
+def _cached_run_json(
+    session: Session,
+    features: FeatureRepository,
+    assessment_id: str,
+    user_id: int,
+    input_hash: str,
+    engine_version: str,
+) -> str | None:
+    """Stored result JSON when the latest completed run saw the same inputs and model versions."""
+    run = features.latest_run(assessment_id)
+    if not run or run.run_status != "completed" or run.input_snapshot_hash != input_hash:
+        return None
+    if (features.latest_tracking(assessment_id) or {}).get("engine_version") != engine_version:
+        return None
+
+    cached = analysis_snapshot_service.cached_json(session, assessment_id, user_id)
+    if cached is not None:
+        return cached
+    obj = session.exec(
+        select(AnalysisResult)
+        .where(AnalysisResult.assessment_id == assessment_id)
+        .where(AnalysisResult.user_id == user_id)
+    ).first()
+    if not obj:
+        return None
+    payload_json = analysis_snapshot_service.store(session, _build_analysis_payload(features, obj))
+    session.commit()
+    return payload_json
+
+
 @router.post("/run/{assessment_id}", response_model=AnalysisResultResponse)
 def run_analysis(
     assessment_id: str,
+    response: Response,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
@@ -240,35 +241,41 @@ def run_analysis(
     if not assessment or assessment.user_id != current_user.id:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Assessment not found")
 
-    # Load extracted features per modality
-    text_feat = _load_feature_json(session, assessment_id, "text")
-    audio_feat = _load_feature_json(session, assessment_id, "audio")
-    video_feat = _load_feature_json(session, assessment_id, "video")
+    result = analyse_assessment(session, assessment, current_user.id)
+    if isinstance(result, str):
+        return Response(content=result, media_type="application/json", headers={"X-Analysis-Cache": "hit"})
+    response.headers["X-Analysis-Cache"] = "miss"
+    return result
 
-    # Build questionnaire data dict if available
-    q_feat = _load_feature_json(session, assessment_id, "questionnaire")
-    if q_feat:
-        q_data = q_feat
-    else:
-        q_resp = session.exec(
-            select(QuestionnaireResponse)
-            .where(QuestionnaireResponse.assessment_id == assessment_id)
-            .order_by(QuestionnaireResponse.submitted_at.desc())
-        ).first()
-        q_data = {"total_score": q_resp.total_score} if q_resp else None
+
+def analyse_assessment(session: Session, assessment: Assessment, user_id: int) -> dict | str:
+    """Fuse the latest features and persist results (inline or from a ``run_analysis`` queue job).
+
+    Returns the fresh payload, or the stored result JSON when inputs and model
+    versions are unchanged since the last completed run.
+    """
+    assessment_id = assessment.id
+
+    # Latest extracted features per modality (one query), questionnaire falls back to the raw total
+    features = FeatureRepository(session)
+    inputs = features.scoring_inputs(assessment_id)
+    text_feat = inputs["text_features"]
+    audio_feat = inputs["audio_features"]
+    video_feat = inputs["video_features"]
+    q_data = inputs["questionnaire_data"]
+
+    # Same inputs and model versions as the last completed run: nothing to recompute or rewrite
+    input_hash = fusion_engine_service.input_fingerprint(inputs)
+    engine_version = fusion_engine_service.engine_version()
+    cached = _cached_run_json(session, features, assessment_id, user_id, input_hash, engine_version)
+    if cached is not None:
+        return cached
 
     start = time.perf_counter()
-    scores = compute_scores(
-        text_features=text_feat,
-        audio_features=audio_feat,
-        video_features=video_feat,
-        questionnaire_data=q_data,
-    )
+    scores = fusion_engine_service.compute_scores(assessment_id, **inputs)
     latency_ms = int((time.perf_counter() - start) * 1000)
 
     model_input_features = scores.get("model_input_features") or {}
-    hash_basis = json.dumps(model_input_features, sort_keys=True)
-    input_hash = hashlib.sha256(hash_basis.encode("utf-8")).hexdigest()
     
     # Sanitize modality features to prevent PII leakage - only store aggregated scores and metadata
     sanitized_modalities = {}
@@ -294,7 +301,11 @@ def run_analysis(
     
     inference_tracking = {
         "scoring_source": scores.get("scoring_source"),
+        "fusion_engine": scores.get("fusion_engine"),
+        "engine_version": engine_version,
         "model_name": scores.get("model_name"),
+        "model_version": scores.get("model_version"),
+        "calibration_source": scores.get("calibration_source"),
         "overall_integrity_score": scores.get("overall_integrity_score"),
         "overall_spoof_risk": scores.get("overall_spoof_risk"),
         "input_modalities": sanitized_modalities,
@@ -303,14 +314,17 @@ def run_analysis(
         "dominant_features": scores.get("dominant_features") or {},
     }
 
-    session.add(InferenceRun(
+    inference_run = InferenceRun(
         assessment_id=assessment_id,
+        model_id=scores.get("model_registry_id"),
         input_snapshot_hash=input_hash,
         output_json=json.dumps(inference_tracking),
         confidence_score=scores.get("confidence_score"),
         latency_ms=latency_ms,
         run_status="completed",
-    ))
+    )
+    session.add(inference_run)
+    features.remember_run(inference_run, inference_tracking)
 
     # Upsert AnalysisResult
     existing = session.exec(
@@ -324,7 +338,7 @@ def run_analysis(
     else:
         result_obj = AnalysisResult(
             assessment_id=assessment_id,
-            user_id=current_user.id,
+            user_id=user_id,
             text_emotion=scores.get("text_emotion"),
             audio_emotion=scores.get("audio_emotion"),
             video_emotion=scores.get("video_emotion"),
@@ -349,7 +363,7 @@ def run_analysis(
     else:
         session.add(RiskScore(
             assessment_id=assessment_id,
-            user_id=current_user.id,
+            user_id=user_id,
             stress_score=scores.get("stress_score"),
             low_mood_score=scores.get("low_mood_score"),
             burnout_score=scores.get("burnout_score"),
@@ -368,7 +382,7 @@ def run_analysis(
     for r in old_recs:
         session.delete(r)
 
-    for rec_data in generate_recommendations(assessment_id, current_user.id, scores):
+    for rec_data in generate_recommendations(assessment_id, user_id, scores):
         session.add(Recommendation(**rec_data))
 
     # Mark assessment complete
@@ -376,9 +390,12 @@ def run_analysis(
     assessment.completed_at = datetime.now(timezone.utc).isoformat()
     session.add(assessment)
 
+    # Materialize the GET /analysis/result response (stored tracking + features view)
+    session.flush()
+    analysis_snapshot_service.store(session, _build_analysis_payload(features, result_obj))
+
     session.commit()
-    session.refresh(result_obj)
-    return _build_analysis_payload(session, result_obj, scores)
+    return _build_analysis_payload(features, result_obj, scores)
 
 
 @router.get("/result/{assessment_id}", response_model=AnalysisResultResponse)
@@ -387,6 +404,10 @@ def get_result(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
+    cached = analysis_snapshot_service.cached_json(session, assessment_id, current_user.id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     obj = session.exec(
         select(AnalysisResult)
         .where(AnalysisResult.assessment_id == assessment_id)
@@ -394,7 +415,11 @@ def get_result(
     ).first()
     if not obj:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Analysis result not found. Run /analysis/run first.")
-    return _build_analysis_payload(session, obj)
+    # Snapshot missing (features changed, or written before snapshots existed): rebuild it
+    payload = _build_analysis_payload(FeatureRepository(session), obj)
+    analysis_snapshot_service.store(session, payload)
+    session.commit()
+    return payload
 
 
 @router.get("/risk/{assessment_id}", response_model=RiskScoreResponse)
@@ -3,13 +3,18 @@ Audio upload + analysis router.
 
 Endpoints:
   POST /audio/upload/{assessment_id} – upload audio file, run transcription + analysis
+                                       (or queue it and return 202 + job when ANALYSIS_JOBS_ENABLED)
   GET  /audio/{assessment_id}        – get audio record for an assessment
 """
 from __future__ import annotations
 import asyncio
+import logging
+import time
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi.responses import JSONResponse
 from sqlmodel import Session, select
 
+from app.core.config import get_settings
 from app.core.database import get_session
 from app.api.auth import get_current_user
 from app.models.user import User
@@ -17,13 +22,17 @@ from app.models.audio_recording import AudioRecording
 from app.models.extracted_feature import ExtractedFeature
 from app.models.safety_flag import SafetyFlag
 from app.schemas.audio import AudioRecordingResponse
-from app.services.audio_inference_service import analyse_audio
-from app.services.safety_service import scan_text, build_safety_flags
+from app.services import analysis_snapshot_service, job_queue_service
+from app.services.audio_inference_service import analyse_audio_async
+from app.services.replay_detection_service import apply_replay_check
+from app.services.safety_service import scan_text, build_safety_flags, persist_text_flags
 from app.services.assessment_scope_service import get_user_assessment_or_404
 from app.utils.file_handler import save_audio, full_path
 import json
 
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/audio", tags=["Audio Analysis"])
+settings = get_settings()
 
 
 @router.post("/upload/{assessment_id}", response_model=AudioRecordingResponse, status_code=status.HTTP_201_CREATED)
@@ -34,17 +43,86 @@ async def upload_audio(
     session: Session = Depends(get_session),
 ):
     get_user_assessment_or_404(session, assessment_id, current_user)
+    upload_start = time.perf_counter()
 
     storage_key = await save_audio(file)
+    if settings.analysis_jobs_enabled:
+        job = job_queue_service.enqueue("analyse_audio", assessment_id, current_user.id, {"storage_key": storage_key})
+        return JSONResponse(job_queue_service.queued_response(job), status_code=status.HTTP_202_ACCEPTED)
+    return await process_audio(session, assessment_id, current_user.id, storage_key, upload_start)
+
+
+async def process_audio(
+    session: Session,
+    assessment_id: str,
+    user_id: int,
+    storage_key: str,
+    upload_start: float | None = None,
+) -> AudioRecording:
+    """Analyse a stored audio upload and persist recording, features and safety flags.
+
+    Runs inline for the upload endpoint or from an ``analyse_audio`` queue job.
+    """
+    upload_start = upload_start or time.perf_counter()
+    # Database work runs in threads so a worker's other jobs keep heartbeating
+    existing = await asyncio.to_thread(_find_recording, session, assessment_id, storage_key)
+    if existing is not None:
+        # A retried queue job whose earlier attempt already committed
+        return existing
     file_path = full_path(storage_key)
 
-    # Run analysis in thread pool — analyse_audio makes blocking HTTP calls
-    result = await asyncio.to_thread(analyse_audio, file_path)
+    # Scan the transcript the moment ASR returns and commit any flag right away,
+    # while SER / pyin / fallbacks are still running.
+    early_scan: dict = {}
+
+    async def _flag_transcript(transcript_result: dict) -> None:
+        transcript = transcript_result.get("transcript", "")
+        if not transcript:
+            return
+        scan = await asyncio.to_thread(persist_text_flags, assessment_id, user_id, transcript, True)
+        early_scan.update(scan, time_to_flag_ms=round((time.perf_counter() - upload_start) * 1000, 1))
+        if scan["flags_persisted"]:
+            logger.info(
+                "Transcript safety flag (%s) persisted %.0f ms after upload for assessment %s",
+                scan["severity"], early_scan["time_to_flag_ms"], assessment_id,
+            )
+
+    # Hosted calls are awaited natively; only CPU-bound stages use worker threads
+    result = await analyse_audio_async(file_path, on_transcript=_flag_transcript)
+    return await asyncio.to_thread(_persist_audio_result, session, assessment_id, user_id, storage_key, result, early_scan)
+
+
+def _find_recording(session: Session, assessment_id: str, storage_key: str) -> AudioRecording | None:
+    return session.exec(
+        select(AudioRecording)
+        .where(AudioRecording.assessment_id == assessment_id)
+        .where(AudioRecording.storage_key == storage_key)
+    ).first()
+
+
+def _persist_audio_result(
+    session: Session,
+    assessment_id: str,
+    user_id: int,
+    storage_key: str,
+    result: dict,
+    early_scan: dict,
+) -> AudioRecording:
+    existing = _find_recording(session, assessment_id, storage_key)
+    if existing is not None:
+        return existing
+    result = apply_replay_check(session, result, "audio", assessment_id, user_id)
+    if early_scan:
+        result["safety_scan"] = {
+            "severity": early_scan["severity"],
+            "flags_persisted": early_scan["flags_persisted"],
+            "time_to_flag_ms": early_scan["time_to_flag_ms"],
+        }
     features = result.get("features", {})
 
     recording = AudioRecording(
         assessment_id=assessment_id,
-        user_id=current_user.id,
+        user_id=user_id,
         storage_key=storage_key,
         duration_seconds=features.get("duration_seconds"),
         transcript_text=result.get("transcript"),
@@ -63,12 +141,13 @@ async def upload_audio(
         extractor_version="2.0",
     )
     session.add(feature)
+    analysis_snapshot_service.invalidate(session, assessment_id)
 
-    # Safety scan on transcript
+    # Safety scan on transcript (already committed above when ASR returned)
     transcript = result.get("transcript", "")
-    if transcript:
+    if transcript and not early_scan:
         scan = scan_text(transcript)
-        for flag_data in build_safety_flags(assessment_id, current_user.id, scan):
+        for flag_data in build_safety_flags(assessment_id, user_id, scan):
             session.add(SafetyFlag(**flag_data))
 
     session.commit()
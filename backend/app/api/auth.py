@@ -21,8 +21,9 @@ security = HTTPBearer()
 
 
 # ── Dependency: get current user from JWT ─────────────────────
+# Plain def so FastAPI runs the sync DB lookup in its threadpool, not on the event loop.
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     session: DBSession = Depends(get_session),
 ) -> User:
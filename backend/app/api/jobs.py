@@ -0,0 +1,109 @@
+"""
+Analysis job router – status of queued media analysis and fusion runs.
+
+Endpoints:
+  POST /jobs/analysis/{assessment_id}          – queue a fusion run (run_analysis) for a worker
+  GET  /jobs/{job_id}                          – status / result of one job
+  GET  /jobs/assessment/{assessment_id}        – every job for an assessment
+  GET  /jobs/assessment/{assessment_id}/events – server-sent events as those jobs change state
+"""
+from __future__ import annotations
+import asyncio
+import json
+import time
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.database import engine, get_session
+from app.api.auth import get_current_user
+from app.models.user import User
+from app.services import job_queue_service
+from app.services.assessment_scope_service import get_user_assessment_or_404
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+settings = get_settings()
+
+_TERMINAL = {job_queue_service.SUCCEEDED, job_queue_service.FAILED}
+_KEEPALIVE_SECONDS = 15.0
+
+
+@router.post("/analysis/{assessment_id}", status_code=status.HTTP_202_ACCEPTED)
+def queue_analysis(
+    assessment_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    get_user_assessment_or_404(session, assessment_id, current_user)
+    job = job_queue_service.enqueue("run_analysis", assessment_id, current_user.id)
+    return JSONResponse(job_queue_service.queued_response(job), status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get("/{job_id}")
+def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    job = job_queue_service.get_job(session, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job_queue_service.job_to_dict(job)
+
+
+@router.get("/assessment/{assessment_id}")
+def list_assessment_jobs(
+    assessment_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    get_user_assessment_or_404(session, assessment_id, current_user)
+    return [job_queue_service.job_to_dict(job) for job in job_queue_service.assessment_jobs(session, assessment_id, current_user.id)]
+
+
+def _job_states(assessment_id: str, user_id: int) -> list[dict]:
+    with Session(engine) as session:
+        return [job_queue_service.job_to_dict(job) for job in job_queue_service.assessment_jobs(session, assessment_id, user_id)]
+
+
+async def _job_events(request: Request, assessment_id: str, user_id: int):
+    """Emit a ``job`` event per state change; ``done`` once every job has finished."""
+    sent: dict[str, tuple] = {}
+    started = last_write = time.monotonic()
+    while True:
+        if await request.is_disconnected():
+            return
+        jobs = await asyncio.to_thread(_job_states, assessment_id, user_id)
+        for job in jobs:
+            state = (job["status"], job["attempts"])
+            if sent.get(job["id"]) != state:
+                sent[job["id"]] = state
+                last_write = time.monotonic()
+                yield f"event: job\ndata: {json.dumps(job)}\n\n"
+        if jobs and all(job["status"] in _TERMINAL for job in jobs):
+            yield "event: done\ndata: {}\n\n"
+            return
+        now = time.monotonic()
+        if now - started > settings.job_events_timeout_seconds:
+            yield "event: timeout\ndata: {}\n\n"
+            return
+        if now - last_write > _KEEPALIVE_SECONDS:
+            last_write = now
+            yield ": keepalive\n\n"
+        await asyncio.sleep(settings.job_events_poll_seconds)
+
+
+@router.get("/assessment/{assessment_id}/events")
+async def stream_assessment_jobs(
+    assessment_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    get_user_assessment_or_404(session, assessment_id, current_user)
+    return StreamingResponse(
+        _job_events(request, assessment_id, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
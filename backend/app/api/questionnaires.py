@@ -25,6 +25,7 @@ from app.schemas.questionnaire import (
     QuestionnaireResponseCreate, QuestionnaireResponseOut,
 )
 import json
+from app.services import analysis_snapshot_service
 from app.services.assessment_scope_service import get_user_assessment_or_404
 from app.services.questionnaire_catalog_service import ensure_daily_checkin_template
 
@@ -152,6 +153,7 @@ def submit_questionnaire(
             extractor_name="questionnaire-aggregator",
             extractor_version="2.0",
         ))
+    analysis_snapshot_service.invalidate(session, data.assessment_id)
 
     session.commit()
     session.refresh(response)
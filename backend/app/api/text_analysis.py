@@ -3,12 +3,15 @@ Text entry + analysis router.
 
 Endpoints:
   POST /text/submit   – submit text for an assessment, runs analysis immediately
+                        (or queues it and returns 202 + job when ANALYSIS_JOBS_ENABLED)
   GET  /text/{assessment_id} – get text entry for an assessment
 """
 from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
 from sqlmodel import Session, select
 
+from app.core.config import get_settings
 from app.core.database import get_session
 from app.api.auth import get_current_user
 from app.models.user import User
@@ -16,12 +19,14 @@ from app.models.text_entry import TextEntry
 from app.models.extracted_feature import ExtractedFeature
 from app.models.safety_flag import SafetyFlag
 from app.schemas.text import TextEntryCreate, TextEntryResponse
+from app.services import analysis_snapshot_service, job_queue_service
 from app.services.text_inference_service import analyse_text
-from app.services.safety_service import scan_text, build_safety_flags
+from app.services.safety_service import scan_text, build_safety_flags, persist_text_flags
 from app.services.assessment_scope_service import get_user_assessment_or_404
 import json
 
 router = APIRouter(prefix="/text", tags=["Text Analysis"])
+settings = get_settings()
 
 
 @router.post("/submit", response_model=TextEntryResponse, status_code=status.HTTP_201_CREATED)
@@ -33,23 +38,53 @@ def submit_text(
     # Validate assessment belongs to user
     get_user_assessment_or_404(session, data.assessment_id, current_user)
 
+    if settings.analysis_jobs_enabled:
+        # Crisis language is flagged now, not when a worker gets to the job
+        persist_text_flags(data.assessment_id, current_user.id, data.raw_text)
+        job = job_queue_service.enqueue(
+            "analyse_text", data.assessment_id, current_user.id,
+            {"raw_text": data.raw_text, "language": data.language, "safety_scanned": True},
+        )
+        return JSONResponse(job_queue_service.queued_response(job), status_code=status.HTTP_202_ACCEPTED)
+    return process_text(session, data.assessment_id, current_user.id, data.raw_text, data.language)
+
+
+def process_text(
+    session: Session,
+    assessment_id: str,
+    user_id: int,
+    raw_text: str,
+    language: str = "en",
+    scan_safety: bool = True,
+    job_id: str | None = None,
+) -> TextEntry:
+    """Analyse text and persist the entry, features and safety flags (inline or from a queue job).
+
+    A retried job (``job_id`` already stored) returns the entry it created instead of adding another.
+    """
+    if job_id:
+        existing = session.exec(select(TextEntry).where(TextEntry.source_job_id == job_id)).first()
+        if existing:
+            return existing
+
     # Run text analysis
-    result = analyse_text(data.raw_text)
+    result = analyse_text(raw_text)
 
     # Persist text entry
     entry = TextEntry(
-        assessment_id=data.assessment_id,
-        user_id=current_user.id,
-        raw_text=data.raw_text,
-        language=data.language,
+        assessment_id=assessment_id,
+        user_id=user_id,
+        raw_text=raw_text,
+        language=language,
         word_count=result["word_count"],
         sentiment_summary=result["sentiment_summary"],
+        source_job_id=job_id,
     )
     session.add(entry)
 
     # Persist extracted features
     feature = ExtractedFeature(
-        assessment_id=data.assessment_id,
+        assessment_id=assessment_id,
         modality_type="text",
         feature_namespace="emotion",
         feature_json=json.dumps(result),
@@ -57,11 +92,13 @@ def submit_text(
         extractor_version="2.0",
     )
     session.add(feature)
+    analysis_snapshot_service.invalidate(session, assessment_id)
 
     # Safety scan
-    scan = scan_text(data.raw_text)
-    for flag_data in build_safety_flags(data.assessment_id, current_user.id, scan):
-        session.add(SafetyFlag(**flag_data))
+    if scan_safety:
+        scan = scan_text(raw_text)
+        for flag_data in build_safety_flags(assessment_id, user_id, scan):
+            session.add(SafetyFlag(**flag_data))
 
     session.commit()
     session.refresh(entry)
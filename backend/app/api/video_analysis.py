@@ -3,25 +3,35 @@ Video upload + analysis router.
 
 Endpoints:
   POST /video/upload/{assessment_id} – upload video file, run face/lighting analysis
+  POST /video/frames/{assessment_id} – upload client-sampled frames, skip video transcoding
+  (both upload endpoints queue the work and return 202 + job when ANALYSIS_JOBS_ENABLED)
+  GET  /video/frames/plan            – frame timestamps a client should capture
   GET  /video/{assessment_id}        – get video record for an assessment
 """
 from __future__ import annotations
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+import math
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, status
+from fastapi.responses import JSONResponse
 from sqlmodel import Session, select
 
+from app.core.config import get_settings
 from app.core.database import get_session
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.video_recording import VideoRecording
 from app.models.extracted_feature import ExtractedFeature
 from app.schemas.video import VideoRecordingResponse
-from app.services.video_inference_service import analyse_video
+from app.services import analysis_snapshot_service, job_queue_service
+from app.services.video_inference_service import analyse_frames_async, analyse_video_async, plan_frame_sample_timestamps
 from app.services.assessment_scope_service import get_user_assessment_or_404
-from app.utils.file_handler import save_video, full_path
+from app.services.replay_detection_service import apply_replay_check
+from app.utils.file_handler import load_frames, save_frames, save_video, full_path
 import json
 
 router = APIRouter(prefix="/video", tags=["Video Analysis"])
+settings = get_settings()
 
 
 @router.post("/upload/{assessment_id}", response_model=VideoRecordingResponse, status_code=status.HTTP_201_CREATED)
@@ -34,14 +44,106 @@ async def upload_video(
     get_user_assessment_or_404(session, assessment_id, current_user)
 
     storage_key = await save_video(file)
-    file_path = full_path(storage_key)
+    if settings.analysis_jobs_enabled:
+        job = job_queue_service.enqueue("analyse_video", assessment_id, current_user.id, {"storage_key": storage_key})
+        return JSONResponse(job_queue_service.queued_response(job), status_code=status.HTTP_202_ACCEPTED)
+    return await process_video(session, assessment_id, current_user.id, storage_key)
 
-    # Run analysis in thread pool — analyse_video does CPU-bound frame processing
-    result = await asyncio.to_thread(analyse_video, file_path)
 
+@router.post("/frames/{assessment_id}", response_model=VideoRecordingResponse, status_code=status.HTTP_201_CREATED)
+async def upload_video_frames(
+    assessment_id: str,
+    files: List[UploadFile] = File(...),
+    timestamps: str = Form("", description="Comma-separated capture timestamps in seconds, one per frame"),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    get_user_assessment_or_404(session, assessment_id, current_user)
+
+    # Validate before anything is written so a rejected batch leaves no orphaned frames
+    frame_timestamps = _parse_timestamps(timestamps, len(files))
+    storage_key, frames = await save_frames(files)
+    if settings.analysis_jobs_enabled:
+        job = job_queue_service.enqueue(
+            "analyse_frames", assessment_id, current_user.id,
+            {"storage_key": storage_key, "timestamps": frame_timestamps},
+        )
+        return JSONResponse(job_queue_service.queued_response(job), status_code=status.HTTP_202_ACCEPTED)
+
+    result = await analyse_frames_async(frames, frame_timestamps)
+    return await asyncio.to_thread(_persist_video_result, session, assessment_id, current_user.id, storage_key, result)
+
+
+async def process_video(session: Session, assessment_id: str, user_id: int, storage_key: str) -> VideoRecording:
+    """Analyse a stored video upload (inline or from an ``analyse_video`` queue job)."""
+    existing = await asyncio.to_thread(_find_recording, session, assessment_id, storage_key)
+    if existing is not None:
+        return existing
+    # Frame decoding/detection runs in worker threads; hosted face calls are awaited
+    result = await analyse_video_async(full_path(storage_key))
+    return await asyncio.to_thread(_persist_video_result, session, assessment_id, user_id, storage_key, result)
+
+
+async def process_frames(
+    session: Session,
+    assessment_id: str,
+    user_id: int,
+    storage_key: str,
+    timestamps: list[float],
+) -> VideoRecording:
+    """Analyse a stored frame batch from an ``analyse_frames`` queue job."""
+    existing = await asyncio.to_thread(_find_recording, session, assessment_id, storage_key)
+    if existing is not None:
+        return existing
+    result = await analyse_frames_async(load_frames(storage_key), timestamps)
+    return await asyncio.to_thread(_persist_video_result, session, assessment_id, user_id, storage_key, result)
+
+
+@router.get("/frames/plan")
+def get_frame_plan(
+    duration_seconds: float = Query(10.0, gt=0, le=15),
+    current_user: User = Depends(get_current_user),
+):
+    return {"duration_seconds": duration_seconds, "timestamps": plan_frame_sample_timestamps(duration_seconds)}
+
+
+def _parse_timestamps(raw: str, frame_count: int) -> list[float]:
+    if not raw.strip():
+        return [float(i) for i in range(frame_count)]
+    try:
+        values = [float(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail="timestamps must be comma-separated numbers")
+    if not all(math.isfinite(value) and value >= 0 for value in values):
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail="timestamps must be finite and non-negative")
+    if len(values) != frame_count:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Expected {frame_count} timestamps, got {len(values)}",
+        )
+    return values
+
+
+def _find_recording(session: Session, assessment_id: str, storage_key: str) -> VideoRecording | None:
+    return session.exec(
+        select(VideoRecording)
+        .where(VideoRecording.assessment_id == assessment_id)
+        .where(VideoRecording.storage_key == storage_key)
+    ).first()
+
+
+def _persist_video_result(session: Session, assessment_id: str, user_id: int, storage_key: str, result: dict) -> VideoRecording:
+    """Blocking database writes; async callers run this in a thread.
+
+    Returns the existing row when a retried queue job already stored ``storage_key``.
+    """
+    existing = _find_recording(session, assessment_id, storage_key)
+    if existing is not None:
+        return existing
+    result = apply_replay_check(session, result, "video", assessment_id, user_id)
     recording = VideoRecording(
         assessment_id=assessment_id,
-        user_id=current_user.id,
+        user_id=user_id,
         storage_key=storage_key,
         duration_seconds=result.get("duration_seconds"),
         fps=int(result["fps"]) if result.get("fps") else None,
@@ -62,6 +164,7 @@ async def upload_video(
         extractor_version="2.0",
     )
     session.add(feature)
+    analysis_snapshot_service.invalidate(session, assessment_id)
 
     session.commit()
     session.refresh(recording)
@@ -61,6 +61,58 @@ class Settings(BaseSettings):
         default=1,
         description="Retry count for transient Hugging Face inference failures"
     )
+    huggingface_connect_timeout_seconds: float = Field(
+        default=5.0,
+        description="TCP/TLS connect timeout for hosted Hugging Face requests"
+    )
+    huggingface_retry_backoff_seconds: float = Field(
+        default=0.5,
+        description="Base delay for jittered exponential backoff between hosted inference retries"
+    )
+    huggingface_pool_max_connections: int = Field(
+        default=20,
+        description="Maximum pooled connections to the hosted Hugging Face router"
+    )
+    huggingface_pool_max_keepalive: int = Field(
+        default=10,
+        description="Maximum idle keep-alive connections kept open to the hosted Hugging Face router"
+    )
+    huggingface_pool_keepalive_seconds: float = Field(
+        default=60.0,
+        description="Seconds an idle pooled connection is kept alive"
+    )
+    huggingface_http2: bool = Field(
+        default=True,
+        description="Use HTTP/2 for hosted inference when the h2 package is installed"
+    )
+    huggingface_breaker_failure_threshold: int = Field(
+        default=3,
+        description="Consecutive hosted failures that open a model endpoint's circuit breaker"
+    )
+    huggingface_breaker_open_seconds: float = Field(
+        default=30.0,
+        description="Seconds an open circuit fails fast before a single half-open probe is allowed"
+    )
+    huggingface_adaptive_timeouts: bool = Field(
+        default=True,
+        description="Derive hosted read timeouts from recent per-endpoint latency instead of the fixed timeout"
+    )
+    huggingface_adaptive_timeout_percentile: float = Field(
+        default=95.0,
+        description="Latency percentile used for adaptive hosted timeouts"
+    )
+    huggingface_adaptive_timeout_multiplier: float = Field(
+        default=2.0,
+        description="Adaptive timeout = latency percentile x this multiplier (capped by the configured timeout)"
+    )
+    huggingface_adaptive_timeout_min_seconds: float = Field(
+        default=2.0,
+        description="Lower bound for adaptive hosted timeouts"
+    )
+    huggingface_coalesce_scope: str = Field(
+        default="text,asr,audio_emotion,face",
+        description="Comma-separated hosted call types (text, asr, audio_emotion, face) whose identical concurrent requests share one upstream call; empty disables"
+    )
     huggingface_text_model: str = Field(
         default="j-hartmann/emotion-english-distilroberta-base",
         description="Hosted Hugging Face model for text emotion inference"
@@ -93,11 +145,181 @@ class Settings(BaseSettings):
         default=True,
         description="Enable local face emotion model as primary inference path (auto-downloads on first use, cached permanently)"
     )
+    huggingface_use_local_text_cache: bool = Field(
+        default=True,
+        description="Enable local text emotion model as primary inference path (loaded from the local cache, hosted API as fallback)"
+    )
     huggingface_face_emotion_model: str = Field(
         default="dima806/facial_emotions_image_detection",
         description="Hosted Hugging Face model for facial emotion inference"
     )
 
+    # Text emotion input handling
+    text_max_characters: int = Field(
+        default=20000,
+        description="Maximum characters of a journal entry sent to text emotion inference"
+    )
+    text_chunk_max_chars: int = Field(
+        default=1000,
+        description="Long entries are split on sentence boundaries into chunks of at most this many characters"
+    )
+    text_batch_max_size: int = Field(
+        default=16,
+        description="Maximum chunks per local text emotion forward pass (across concurrent requests)"
+    )
+    text_batch_max_wait_ms: float = Field(
+        default=10.0,
+        description="How long the local text batcher waits for more chunks before running a batch"
+    )
+
+    # Text emotion result cache
+    text_cache_enabled: bool = Field(
+        default=True,
+        description="Cache model-backed text emotion results by model name + normalized text hash"
+    )
+    text_cache_max_entries: int = Field(
+        default=4096,
+        description="Maximum cached text emotion results (least recently used are evicted first)"
+    )
+    text_cache_ttl_seconds: float = Field(
+        default=86400.0,
+        description="Seconds a cached text emotion result stays valid"
+    )
+    text_cache_persist_path: str = Field(
+        default="",
+        description="Optional JSON file the text emotion cache is saved to on shutdown and restored from on startup"
+    )
+
+    # Hosted model health probes
+    model_health_deadline_seconds: float = Field(
+        default=20.0,
+        description="Global deadline for one round of concurrent hosted model health probes"
+    )
+    model_health_refresh_seconds: float = Field(
+        default=300.0,
+        description="Interval between background model health refreshes; 0 runs the probes only once after startup"
+    )
+
+    # Fusion / calibration model hot reload (via model_registry)
+    model_reload_poll_seconds: float = Field(
+        default=30.0,
+        description="How often to check for retrained fusion/calibration artifacts and registry activations; 0 checks only at startup"
+    )
+
+    # Fusion engines (one serves, the others run in shadow for comparison)
+    fusion_primary_engine: str = Field(
+        default="nn_v1",
+        description="Fusion engine whose scores are served: nn_v1 or weighted_v2"
+    )
+    fusion_shadow_engines: str = Field(
+        default="weighted_v2",
+        description="Comma-separated engines scored in the background for comparison; empty disables shadowing"
+    )
+    fusion_shadow_sample_rate: float = Field(
+        default=0.1,
+        description="Fraction of analysis runs that also run the shadow engines (0-1)"
+    )
+
+    # Bulk historical re-scoring (python rescore_history.py)
+    rescore_batch_size: int = Field(
+        default=200,
+        description="Assessments re-scored and written per chunk/transaction"
+    )
+    rescore_throttle_seconds: float = Field(
+        default=0.5,
+        description="Pause between re-scoring chunks so API requests get the database"
+    )
+
+    # Analysis job queue (python worker.py)
+    analysis_jobs_enabled: bool = Field(
+        default=False,
+        description="Queue media analysis for worker.py and return 202 + job id instead of analysing inline"
+    )
+    job_lease_seconds: int = Field(
+        default=120,
+        description="Visibility timeout: a claimed job becomes claimable again if its worker stops heartbeating"
+    )
+    job_max_attempts: int = Field(
+        default=3,
+        description="Attempts per job before it is marked failed"
+    )
+    job_retry_backoff_seconds: float = Field(
+        default=15.0,
+        description="Delay before the first retry; doubles on each further attempt"
+    )
+    job_poll_interval_seconds: float = Field(
+        default=1.0,
+        description="How often an idle worker slot checks the queue"
+    )
+    worker_concurrency: int = Field(
+        default=2,
+        description="Jobs processed concurrently by one worker process"
+    )
+    job_events_poll_seconds: float = Field(
+        default=1.0,
+        description="How often the job event stream re-reads job state"
+    )
+    job_events_timeout_seconds: int = Field(
+        default=600,
+        description="Close the job event stream after this long even if jobs are still pending"
+    )
+
+    # Cascade inference (cheap first stage, heavy model only when uncertain)
+    cascade_inference_enabled: bool = Field(
+        default=True,
+        description="Run a cheap first-stage scorer before the text/face emotion models"
+    )
+    cascade_text_margin_threshold: float = Field(
+        default=0.7,
+        description="Minimum lexical first-stage margin required to skip the text emotion model"
+    )
+    cascade_face_margin_threshold: float = Field(
+        default=0.8,
+        description="Minimum smile-cascade first-stage margin required to skip the face emotion model"
+    )
+    cascade_audit_sample_rate: float = Field(
+        default=0.05,
+        description="Fraction of confident first-stage decisions still sent to the heavy model for offline threshold tuning"
+    )
+
+    # Early-reject pre-flight (skip all models for junk uploads)
+    early_reject_enabled: bool = Field(
+        default=True,
+        description="Run cheap duration/energy/face gates before expensive media inference"
+    )
+    early_reject_min_audio_seconds: float = Field(
+        default=1.0,
+        description="Audio clips shorter than this skip ASR/SER/pitch analysis"
+    )
+    early_reject_max_silence_ratio: float = Field(
+        default=0.97,
+        description="Audio clips with a larger share of silent frames skip ASR/SER/pitch analysis"
+    )
+    early_reject_min_video_seconds: float = Field(
+        default=1.0,
+        description="Videos shorter than this skip transcoding and face inference"
+    )
+
+    # CPU thread budget (local torch / OpenCV / BLAS inference)
+    cpu_budget_enabled: bool = Field(
+        default=True,
+        description="Share one CPU thread budget across concurrent local inference stages"
+    )
+    cpu_thread_budget: int = Field(
+        default=0,
+        description="Total intra-op threads for local inference; 0 autotunes from the host's usable cores"
+    )
+
+    # Replay detection (perceptual hashes of uploaded media)
+    replay_detection_enabled: bool = Field(
+        default=True,
+        description="Fingerprint photos, video face crops and audio to flag media re-submitted across assessments"
+    )
+    replay_hash_max_distance: int = Field(
+        default=3,
+        description="Maximum Hamming distance (0-3) between 64-bit fingerprints counted as the same media"
+    )
+
     # Groq API (LLM provider)
     groq_api_key: str = Field(
         default="",
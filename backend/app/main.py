@@ -20,12 +20,17 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.core.config import get_settings
 from app.core.database import create_db_and_tables
+from app.services.cascade_inference_service import get_cascade_stats
+from app.services.cpu_budget_service import autotune_cpu_budget, get_cpu_budget_stats
+from app.services.hf_inference_service import close_hf_client, get_hf_circuit_states, get_hf_connection_stats
 from app.services.model_health_service import run_startup_model_health_checks, get_cached_model_health
-from app.services.video_inference_service import preload_local_face_pipeline
-from app.services.audio_inference_service import preload_local_audio_pipelines
+from app.services.model_registry_service import get_model_versions, sync_models
+from app.services.text_emotion_cache import get_text_cache_stats, load_text_emotion_cache, save_text_emotion_cache
+from app.services.warmup_service import get_readiness, run_warmup
 
 import app.models  # noqa: F401
 
@@ -37,6 +42,7 @@ from app.api.video_analysis import router as video_router
 from app.api.questionnaires import router as questionnaires_router
 from app.api.analysis import router as analysis_router
 from app.api.history import router as history_router
+from app.api.jobs import router as jobs_router
 from app.api.routes.chat import router as assistant_chat_router
 from app.api.routes.chat_v2 import router as assistant_chat_v2_router
 from app.api.routes.assistant_actions import router as assistant_actions_router
@@ -64,32 +70,54 @@ def _setup_hf_environment() -> None:
     )
 
 
-def _preload_all_models() -> None:
-    """Load ALL local models from cache into memory. No network calls."""
-    logger.info("=== MODEL PRELOAD START (offline mode — loading from cache only) ===")
+async def _warmup() -> None:
+    """Size thread pools, then load and warm every local model off the startup path."""
+    try:
+        await asyncio.to_thread(autotune_cpu_budget)
+        await asyncio.to_thread(run_warmup)
+    except Exception as exc:
+        logger.error("Model warm-up failed: %s", exc, exc_info=True)
 
-    # Phase 1: Load face model (video) from cache
-    logger.info("[Preload] Loading face emotion model from cache...")
-    preload_local_face_pipeline()
 
-    # Phase 2: Load audio SER models from cache
-    logger.info("[Preload] Loading audio SER models from cache...")
-    preload_local_audio_pipelines()
+async def _model_health_loop(app: FastAPI) -> None:
+    """Probe hosted models off the startup path, then refresh periodically."""
+    while True:
+        try:
+            app.state.model_health = await asyncio.to_thread(run_startup_model_health_checks)
+        except Exception as exc:
+            logger.error("Model health check failed: %s", exc, exc_info=True)
+        if settings.model_health_refresh_seconds <= 0:
+            return
+        await asyncio.sleep(settings.model_health_refresh_seconds)
 
-    logger.info("=== MODEL PRELOAD COMPLETE — all models loaded from local cache ===")
+
+async def _model_registry_loop() -> None:
+    """Pick up retrained fusion / calibration artifacts and registry activations without a restart."""
+    while True:
+        try:
+            await asyncio.to_thread(sync_models)
+        except Exception as exc:
+            logger.error("Model registry sync failed: %s", exc, exc_info=True)
+        if settings.model_reload_poll_seconds <= 0:
+            return
+        await asyncio.sleep(settings.model_reload_poll_seconds)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
-    try:
-        _setup_hf_environment()
-        await asyncio.to_thread(_preload_all_models)
-        app.state.model_health = await asyncio.to_thread(run_startup_model_health_checks)
-    except Exception as exc:
-        logger.error("Model preload failed: %s", exc, exc_info=True)
-        app.state.model_health = get_cached_model_health()
+    load_text_emotion_cache()
+    app.state.model_health = get_cached_model_health()
+    _setup_hf_environment()
+    warmup_task = asyncio.create_task(_warmup())
+    health_task = asyncio.create_task(_model_health_loop(app))
+    registry_task = asyncio.create_task(_model_registry_loop())
     yield
+    warmup_task.cancel()
+    health_task.cancel()
+    registry_task.cancel()
+    save_text_emotion_cache()
+    await close_hf_client()
 
 
 app = FastAPI(
@@ -116,6 +144,7 @@ app.include_router(video_router)
 app.include_router(questionnaires_router)
 app.include_router(analysis_router)
 app.include_router(history_router)
+app.include_router(jobs_router)
 app.include_router(assistant_chat_router)
 app.include_router(assistant_chat_v2_router)
 app.include_router(assistant_actions_router)
@@ -135,9 +164,22 @@ def health_check():
     return {
         "status": "healthy",
         "model_health": get_cached_model_health(),
+        "circuit_breakers": get_hf_circuit_states(),
+        "model_versions": get_model_versions(),
+        "cascade": get_cascade_stats(),
+        "cpu_budget": get_cpu_budget_stats(),
+        "text_cache": get_text_cache_stats(),
+        "hf_connections": get_hf_connection_stats(),
     }
 
 
+@app.get("/ready")
+def readiness_check():
+    """503 until background warm-up has finished; /health stays a pure liveness probe."""
+    readiness = get_readiness()
+    return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -27,6 +27,11 @@ from app.models.risk_score import RiskScore  # noqa: F401
 from app.models.analysis_result import AnalysisResult  # noqa: F401
 from app.models.recommendation import Recommendation  # noqa: F401
 from app.models.safety_flag import SafetyFlag  # noqa: F401
+from app.models.media_fingerprint import MediaFingerprint  # noqa: F401
+from app.models.fusion_shadow_result import FusionShadowResult  # noqa: F401
+from app.models.rescore_job import RescoreJob  # noqa: F401
+from app.models.analysis_snapshot import AnalysisSnapshot  # noqa: F401
+from app.models.analysis_job import AnalysisJob  # noqa: F401
 
 # ── Assistant system ───────────────────────────────────────────
 from app.models.assistant_models import (  # noqa: F401
@@ -54,6 +59,7 @@ __all__ = [
     "PassiveBehaviorMetric",
     "ExtractedFeature", "ModelRegistry", "InferenceRun",
     "RiskScore", "AnalysisResult", "Recommendation", "SafetyFlag",
+    "MediaFingerprint", "FusionShadowResult", "RescoreJob", "AnalysisSnapshot", "AnalysisJob",
     "ChatSession", "ChatMessage", "AssistantToolAction",
     "ClinicSearchLog", "ClinicResultsCache",
     "AppointmentRequest", "AppointmentAction",
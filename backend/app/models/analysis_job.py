@@ -0,0 +1,48 @@
+"""Analysis job – durable queue entry for media analysis and fusion runs.
+
+Workers lease a job by setting ``lease_owner`` / ``lease_expires_at``; a job
+whose lease expires (worker crashed or hung) becomes claimable again until
+``max_attempts`` is used up.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, CheckConstraint, Index, ForeignKey
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+def _uuid() -> str:
+    return uuid.uuid4().hex
+
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        CheckConstraint(
+            "job_type IN ('analyse_text','analyse_audio','analyse_video','analyse_frames','run_analysis')",
+            name="ck_aj_type",
+        ),
+        CheckConstraint("status IN ('queued','running','succeeded','failed')", name="ck_aj_status"),
+        Index("idx_analysis_jobs_claim", "status", "priority", "available_at"),
+        Index("idx_analysis_jobs_assessment_id", "assessment_id"),
+    )
+
+    id = Column(String(32), primary_key=True, default=_uuid)
+    job_type = Column(String(24), nullable=False)
+    assessment_id = Column(String(32), ForeignKey("assessments.id"), nullable=False)
+    user_id = Column(Integer, nullable=False)
+    payload_json = Column(Text, nullable=True)          # JSON string (storage keys, text, options)
+    status = Column(String(16), default="queued")
+    priority = Column(Integer, default=0)               # higher runs first
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    available_at = Column(String(32), default=lambda: datetime.utcnow().isoformat())
+    lease_owner = Column(String(64), nullable=True)
+    lease_expires_at = Column(String(32), nullable=True)
+    result_json = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(String(32), default=lambda: datetime.utcnow().isoformat())
+    started_at = Column(String(32), nullable=True)
+    finished_at = Column(String(32), nullable=True)
+
+    assessment = relationship("Assessment", back_populates="analysis_jobs")
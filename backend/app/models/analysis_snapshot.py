@@ -0,0 +1,24 @@
+"""Analysis snapshot – the serialized /analysis/result response, materialized at write time.
+
+Rebuilt by /analysis/run, dropped whenever the assessment's features or scores
+change, and lazily rebuilt by the next read.
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, Index, ForeignKey
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class AnalysisSnapshot(Base):
+    __tablename__ = "analysis_snapshots"
+    __table_args__ = (
+        Index("idx_analysis_snapshots_user_id", "user_id"),
+    )
+
+    assessment_id = Column(String(32), ForeignKey("assessments.id"), primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    payload_version = Column(Integer, nullable=False)
+    payload_json = Column(Text, nullable=False)        # AnalysisResultResponse JSON
+    created_at = Column(String(32), default=lambda: datetime.utcnow().isoformat())
+
+    assessment = relationship("Assessment", back_populates="analysis_snapshots")
@@ -47,6 +47,10 @@ class Assessment(Base):
     analysis_results = relationship("AnalysisResult", back_populates="assessment", cascade="all, delete-orphan")
     recommendations = relationship("Recommendation", back_populates="assessment", cascade="all, delete-orphan")
     safety_flags = relationship("SafetyFlag", back_populates="assessment", cascade="all, delete-orphan")
+    media_fingerprints = relationship("MediaFingerprint", back_populates="assessment", cascade="all, delete-orphan")
+    fusion_shadow_results = relationship("FusionShadowResult", back_populates="assessment", cascade="all, delete-orphan")
+    analysis_snapshots = relationship("AnalysisSnapshot", back_populates="assessment", cascade="all, delete-orphan")
+    analysis_jobs = relationship("AnalysisJob", back_populates="assessment", cascade="all, delete-orphan")
 
 
 class AssessmentModality(Base):
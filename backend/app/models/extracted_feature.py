@@ -15,6 +15,7 @@ class ExtractedFeature(Base):
     __table_args__ = (
         CheckConstraint("modality_type IN ('text','audio','video','questionnaire','passive_behavior')", name="ck_ef_type"),
         Index("idx_extracted_features_assessment_id", "assessment_id"),
+        Index("idx_extracted_features_latest", "assessment_id", "modality_type", "computed_at"),
     )
 
     id = Column(String(32), primary_key=True, default=_uuid)
@@ -0,0 +1,34 @@
+"""Fusion shadow result – one shadow-engine score compared with the serving engine."""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Float, Integer, CheckConstraint, Index, ForeignKey
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+def _uuid() -> str:
+    return uuid.uuid4().hex
+
+
+class FusionShadowResult(Base):
+    __tablename__ = "fusion_shadow_results"
+    __table_args__ = (
+        CheckConstraint("risk_level_agree IN (0,1)", name="ck_fsr_agree"),
+        Index("idx_fusion_shadow_results_engines", "primary_engine", "shadow_engine"),
+        Index("idx_fusion_shadow_results_assessment_id", "assessment_id"),
+    )
+
+    id = Column(String(32), primary_key=True, default=_uuid)
+    assessment_id = Column(String(32), ForeignKey("assessments.id"), nullable=False)
+    primary_engine = Column(String(32), nullable=False)
+    shadow_engine = Column(String(32), nullable=False)
+    primary_risk_level = Column(String(16))
+    shadow_risk_level = Column(String(16))
+    risk_level_agree = Column(Integer, default=0)
+    score_deltas_json = Column(Text, nullable=True)     # {score: shadow - primary}
+    max_abs_delta = Column(Float, nullable=True)
+    primary_latency_ms = Column(Float, nullable=True)
+    shadow_latency_ms = Column(Float, nullable=True)
+    created_at = Column(String(32), default=lambda: datetime.utcnow().isoformat())
+
+    assessment = relationship("Assessment", back_populates="fusion_shadow_results")
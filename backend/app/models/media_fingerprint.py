@@ -0,0 +1,40 @@
+"""Media fingerprint – perceptual hashes of uploaded photos, frames and audio.
+
+Each 64-bit hash is also split into four 16-bit chunks with their own index so
+near-duplicate lookups use multi-index hashing instead of a full table scan.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, BigInteger, CheckConstraint, Index, ForeignKey
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+def _uuid() -> str:
+    return uuid.uuid4().hex
+
+
+class MediaFingerprint(Base):
+    __tablename__ = "media_fingerprints"
+    __table_args__ = (
+        CheckConstraint("modality_type IN ('audio','video')", name="ck_mf_type"),
+        Index("idx_media_fingerprints_assessment_id", "assessment_id"),
+        Index("idx_media_fingerprints_chunk0", "modality_type", "chunk0"),
+        Index("idx_media_fingerprints_chunk1", "modality_type", "chunk1"),
+        Index("idx_media_fingerprints_chunk2", "modality_type", "chunk2"),
+        Index("idx_media_fingerprints_chunk3", "modality_type", "chunk3"),
+    )
+
+    id = Column(String(32), primary_key=True, default=_uuid)
+    assessment_id = Column(String(32), ForeignKey("assessments.id"), nullable=False)
+    user_id = Column(Integer, nullable=False)
+    modality_type = Column(String(24))
+    hash_kind = Column(String(16))          # phash / audio_fp
+    hash_value = Column(BigInteger, nullable=False)   # signed 64-bit view of the hash
+    chunk0 = Column(Integer, nullable=False)
+    chunk1 = Column(Integer, nullable=False)
+    chunk2 = Column(Integer, nullable=False)
+    chunk3 = Column(Integer, nullable=False)
+    created_at = Column(String(32), default=lambda: datetime.utcnow().isoformat())
+
+    assessment = relationship("Assessment", back_populates="media_fingerprints")
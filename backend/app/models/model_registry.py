@@ -1,7 +1,7 @@
 """Model registry – tracks ML models used for inference."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, CheckConstraint, Index
+from sqlalchemy import Column, String, Integer, CheckConstraint, Index, UniqueConstraint
 from app.core.database import Base
 
 
@@ -14,6 +14,7 @@ class ModelRegistry(Base):
     __table_args__ = (
         CheckConstraint("active IN (0,1)", name="ck_mr_active"),
         Index("idx_model_registry_active", "active"),
+        UniqueConstraint("model_name", "version", name="uq_model_registry_name_version"),
     )
 
     id = Column(String(32), primary_key=True, default=_uuid)
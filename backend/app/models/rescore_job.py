@@ -0,0 +1,31 @@
+"""Rescore job – checkpoint and running diff for a bulk historical re-scoring pass."""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, CheckConstraint, Index
+from app.core.database import Base
+
+
+def _uuid() -> str:
+    return uuid.uuid4().hex
+
+
+class RescoreJob(Base):
+    __tablename__ = "rescore_jobs"
+    __table_args__ = (
+        CheckConstraint("status IN ('running','completed','failed')", name="ck_rj_status"),
+        Index("idx_rescore_jobs_status", "status"),
+    )
+
+    id = Column(String(32), primary_key=True, default=_uuid)
+    status = Column(String(16), default="running")
+    fusion_engine = Column(String(32), nullable=True)
+    engine_version = Column(String(128), nullable=True)       # resume only under the same version
+    model_version = Column(String(32), nullable=True)
+    last_assessment_id = Column(String(32), nullable=True)   # keyset checkpoint
+    processed = Column(Integer, default=0)
+    changed = Column(Integer, default=0)
+    summary_json = Column(Text, nullable=True)               # running diff accumulators
+    error = Column(Text, nullable=True)
+    started_at = Column(String(32), default=lambda: datetime.utcnow().isoformat())
+    updated_at = Column(String(32), default=lambda: datetime.utcnow().isoformat())
+    finished_at = Column(String(32), nullable=True)
@@ -15,6 +15,7 @@ class TextEntry(Base):
     __table_args__ = (
         Index("idx_text_entries_assessment_id", "assessment_id"),
         Index("idx_text_entries_user_id", "user_id"),
+        Index("idx_text_entries_source_job_id", "source_job_id", unique=True),
     )
 
     id = Column(String(32), primary_key=True, default=_uuid)
@@ -25,6 +26,7 @@ class TextEntry(Base):
     word_count = Column(Integer, nullable=True)
     sentiment_summary = Column(String(32), nullable=True)
     embedding_vector_ref = Column(String(256), nullable=True)
+    source_job_id = Column(String(32), nullable=True)  # analysis job that created it; makes retries idempotent
     created_at = Column(String(32), default=lambda: datetime.utcnow().isoformat())
 
     assessment = relationship("Assessment", back_populates="text_entries")
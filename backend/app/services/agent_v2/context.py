@@ -9,6 +9,7 @@ from sqlmodel import Session, select
 from app.models.analysis_result import AnalysisResult
 from app.models.recommendation import Recommendation
 from app.models.risk_score import RiskScore
+from app.utils.wellness import compute_wellness_score
 
 
 def _score_to_percent(value: float | None) -> int | None:
@@ -20,9 +21,7 @@ def _score_to_percent(value: float | None) -> int | None:
 def _compute_wellness_score(result: AnalysisResult | None) -> int | None:
     if not result:
         return None
-    stress_score = float(result.stress_score or 0.0)
-    mood_score = float(result.mood_score or 0.0)
-    return max(0, min(100, int(round(((1.0 - stress_score) * 0.45 + mood_score * 0.55) * 100.0))))
+    return compute_wellness_score(result.stress_score, result.mood_score)
 
 
 def _serialize_analysis(row: AnalysisResult, latest_risk: RiskScore | None = None) -> Dict[str, Any]:
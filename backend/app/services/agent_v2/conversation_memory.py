@@ -3,6 +3,8 @@ from __future__ import annotations
 from collections import defaultdict, deque
 from typing import Any, Deque, Dict, List, Optional
 
+from app.services.safety.keyword_matcher import scan_keywords
+
 _MAX_MESSAGES = 10
 _MEMORY_STORE: Dict[str, Deque[Dict[str, Any]]] = defaultdict(lambda: deque(maxlen=_MAX_MESSAGES))
 
@@ -32,22 +34,19 @@ def add_assistant_message(memory_key: str, text: str, intent: Optional[str] = No
 
 
 def _detect_emotional_tone(text: str) -> str:
-    lowered = (text or "").lower()
-    distress_terms = {"sad", "bad mood", "anxious", "anxiety", "panic", "stressed", "overwhelmed", "same"}
-    positive_terms = {"better", "good", "improved", "fine", "great"}
-
-    if any(term in lowered for term in distress_terms):
+    hits = scan_keywords(text)
+    if "tone_distress" in hits:
         return "distressed"
-    if any(term in lowered for term in positive_terms):
+    if "tone_positive" in hits:
         return "positive"
     return "neutral"
 
 
 def _detect_topic(text: str) -> str:
-    lowered = (text or "").lower()
-    if any(token in lowered for token in ["score", "history", "metric", "trend"]):
+    hits = scan_keywords(text)
+    if "topic_scores" in hits:
         return "scores"
-    if any(token in lowered for token in ["mood", "anxiety", "panic", "stress", "sleep", "health"]):
+    if "topic_health" in hits:
         return "health"
     return "general"
 
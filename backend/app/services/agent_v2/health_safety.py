@@ -8,6 +8,8 @@ Prevents medical diagnosis claims and enforces supportive tone.
 import re
 from typing import Optional, Tuple
 
+from app.services.safety.keyword_matcher import scan_keywords
+
 
 # Severity indicators - used to adjust tone and attentiveness
 _SEVERE_INDICATORS = {
@@ -72,26 +74,22 @@ def detect_severity(query: str) -> Tuple[bool, str]:
         - is_severe: True if severe distress detected
         - severity_type: "emergency" | "high" | "moderate"
     """
-    query_lower = query.lower()
+    hits = scan_keywords(query)
     
     # Check for emergency-level severity
-    emergency_terms = {"panic", "anxiety attack", "heart attack", "breathe", "chest pain"}
-    if any(term in query_lower for term in emergency_terms):
+    if "severity_emergency" in hits:
         return True, "emergency"
     
     # Check for crisis-level
-    crisis_indicators = {"suicidal", "self-harm", "overdose", "dangerous"}
-    if any(term in query_lower for term in crisis_indicators):
+    if "severity_crisis" in hits:
         return True, "emergency"
     
     # Check for high severity
-    high_severity_terms = {"severe", "critical", "unbearable", "worst", "terrible"}
-    if any(term in query_lower for term in high_severity_terms):
+    if "severity_high" in hits:
         return True, "high"
     
     # Moderate (we care, but not emergency)
-    moderate_indicators = {"worried", "concerned", "struggling", "difficult", "overwhelmed"}
-    if any(term in query_lower for term in moderate_indicators):
+    if "severity_moderate" in hits:
         return False, "moderate"
     
     return False, "standard"
@@ -170,14 +168,8 @@ def should_include_score_context_in_health_response(query: str) -> bool:
     
     Returns False otherwise (safety: don't inject unrelated data)
     """
-    query_lower = query.lower()
-    
-    # Explicit score requests
-    if any(term in query_lower for term in ["score", "metric", "wellness data", "check-in", "history"]):
-        return True
-    
-    # Explicit analysis requests
-    if any(phrase in query_lower for phrase in ["compare to my scores", "relate to my wellness", "my data shows"]):
+    # Explicit score or analysis requests
+    if "score_context" in scan_keywords(query):
         return True
     
     # Default: don't mix data
@@ -0,0 +1,53 @@
+"""Materialized ``GET /analysis/result`` payloads.
+
+``/analysis/run`` stores the response exactly as it is serialized through
+``AnalysisResultResponse``, so a read is one primary-key lookup whose JSON is
+returned as-is. Bump ``PAYLOAD_VERSION`` when the payload shape changes; older
+snapshots are then ignored and rebuilt on read. Anything that writes features
+or scores for an assessment must call ``invalidate``.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.models.analysis_snapshot import AnalysisSnapshot
+from app.schemas.analysis import AnalysisResultResponse
+
+PAYLOAD_VERSION = 1
+
+
+def serialize(payload: dict) -> str:
+    return AnalysisResultResponse.model_validate(payload).model_dump_json()
+
+
+def store(session: Session, payload: dict) -> str:
+    """Upsert the snapshot for ``payload`` (added to the caller's transaction)."""
+    payload_json = serialize(payload)
+    session.merge(AnalysisSnapshot(
+        assessment_id=payload["assessment_id"],
+        user_id=payload["user_id"],
+        payload_version=PAYLOAD_VERSION,
+        payload_json=payload_json,
+    ))
+    return payload_json
+
+
+def cached_json(session: Session, assessment_id: str, user_id: int) -> Optional[str]:
+    return session.exec(
+        select(AnalysisSnapshot.payload_json)
+        .where(AnalysisSnapshot.assessment_id == assessment_id)
+        .where(AnalysisSnapshot.user_id == user_id)
+        .where(AnalysisSnapshot.payload_version == PAYLOAD_VERSION)
+    ).first()
+
+
+def invalidate(session: Session, assessment_ids: Iterable[str] | str) -> None:
+    ids = [assessment_ids] if isinstance(assessment_ids, str) else list(assessment_ids)
+    if ids:
+        session.execute(
+            delete(AnalysisSnapshot).where(AnalysisSnapshot.assessment_id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
@@ -13,9 +13,11 @@ from app.models.recommendation import Recommendation
 from app.models.risk_score import RiskScore
 from app.models.user_profile import UserProfile
 from app.services.safety.crisis_detector import get_crisis_detector
+from app.services.safety.keyword_matcher import scan_keywords
 from app.services.tools.appointment_tools import create_appointment_request
 from app.services.tools.clinic_tools import find_nearby_clinics
 from app.services.tools.reminder_tools import create_followup_reminder
+from app.utils.wellness import compute_wellness_score
 
 
 COORD_REGEX = re.compile(r"(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)")
@@ -43,27 +45,13 @@ logger = logging.getLogger(__name__)
 
 
 def detect_intent(query: str) -> str:
-    q = (query or "").strip().lower()
+    hits = scan_keywords(query)
 
-    if any(term in q for term in ("score", "check-in", "check in", "wellness score", "risk level", "snapshot")):
+    if "intent_score" in hits:
         return "SCORE_QUERY"
-    if any(
-        term in q
-        for term in (
-            "exercise",
-            "feel",
-            "health",
-            "pain",
-            "sick",
-            "fever",
-            "headache",
-            "diet",
-            "sleep",
-            "workout",
-        )
-    ):
+    if "intent_health" in hits:
         return "HEALTH_QUERY"
-    if any(term in q for term in ("hi", "hello", "hey", "namaste", "good morning", "good afternoon", "good evening")):
+    if "intent_greeting" in hits:
         return "GREETING"
 
     return "GENERAL"
@@ -88,9 +76,7 @@ def _score_to_percent(value: Optional[float]) -> Optional[int]:
 def _compute_wellness_score(result: Optional[AnalysisResult]) -> Optional[int]:
     if not result:
         return None
-    stress_score = float(result.stress_score or 0.0)
-    mood_score = float(result.mood_score or 0.0)
-    return max(0, min(100, int(round(((1.0 - stress_score) * 0.45 + mood_score * 0.55) * 100.0))))
+    return compute_wellness_score(result.stress_score, result.mood_score)
 
 
 def _trend_label(analyses: List[AnalysisResult]) -> str:
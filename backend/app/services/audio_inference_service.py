@@ -3,13 +3,17 @@ from __future__ import annotations
 
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Awaitable, Callable
+import asyncio
 import time
 import logging
 
 from app.utils.ffmpeg_path import *  # noqa: F401,F403
 from app.core.config import get_settings
+from app.services.cpu_budget_service import cpu_budget
 from app.services.hf_inference_service import HFInferenceError, get_hf_client
 from app.services.media_preprocessing_service import MediaPreprocessingError, preprocess_audio
+from app.services.replay_detection_service import audio_fingerprint
 from app.services.text_inference_service import analyse_text
 from app.services.text_inference_service import _map_label as map_text_label
 
@@ -27,10 +31,13 @@ _LOCAL_SER_PIPELINES: dict[str, object] = {}
 _LOCAL_SER_FAILURE_CACHE: dict[str, float] = {}   # TTL-based for local too
 _LOCAL_FAILURE_TTL_SECONDS = 600  # 10 minutes for local (less transient)
 _AUDIO_PRELOAD_COMPLETE = False
+_PREFLIGHT_SILENCE_RMS = 0.003  # ~ -50 dBFS; frames below this count as silent
 
 
 def _is_model_failed(model_name: str) -> bool:
     """Check if a hosted model is temporarily or permanently failed."""
+    if get_hf_client().circuit_open(model_name):
+        return True
     if model_name in _PERMANENT_FAILURE_MODELS:
         return True
     expiry = _AUDIO_MODEL_FAILURE_CACHE.get(model_name)
@@ -68,41 +75,38 @@ def _read_audio_bytes(file_path: str | Path) -> bytes:
     return Path(file_path).read_bytes()
 
 
-def _transcribe_audio_bytes(audio_bytes: bytes) -> dict:
-    settings = get_settings()
-    warnings: list[str] = []
-
+def _oversized_audio_result(audio_bytes: bytes) -> dict | None:
     # ── Hard size guard ────────────────────────────────────────────
     # HF Inference API rejects payloads > 25 MB.  Use 20 MB as a
     # conservative ceiling so we never flirt with the boundary.
     _MAX_AUDIO_BYTES = 20 * 1024 * 1024  # 20 MB
-    if len(audio_bytes) > _MAX_AUDIO_BYTES:
-        size_mb = round(len(audio_bytes) / (1024 * 1024), 2)
-        return {
-            "transcript": "",
-            "language": "unknown",
-            "warnings": [f"Audio payload too large ({size_mb} MB > 20 MB limit). Trim the clip."],
-            "model_name": settings.huggingface_asr_model,
-        }
+    if len(audio_bytes) <= _MAX_AUDIO_BYTES:
+        return None
+    size_mb = round(len(audio_bytes) / (1024 * 1024), 2)
+    return {
+        "transcript": "",
+        "language": "unknown",
+        "warnings": [f"Audio payload too large ({size_mb} MB > 20 MB limit). Trim the clip."],
+        "model_name": get_settings().huggingface_asr_model,
+    }
 
-    try:
-        payload = get_hf_client().automatic_speech_recognition(audio_bytes, content_type="audio/wav")
 
-        # ── Strict response validation ─────────────────────────────
-        # Whisper via HF always returns {"text": "..."}.  Anything
-        # else is an API regression — surface it as a warning instead
-        # of silently returning garbage.
-        if isinstance(payload, dict) and "text" in payload:
-            return {
-                "transcript": str(payload["text"]).strip(),
-                "language": str(payload.get("language", "unknown") or "unknown"),
-                "warnings": warnings,
-                "model_name": settings.huggingface_asr_model,
-            }
+def _transcript_result(payload: object | None, warnings: list[str]) -> dict:
+    settings = get_settings()
 
+    # ── Strict response validation ─────────────────────────────
+    # Whisper via HF always returns {"text": "..."}.  Anything
+    # else is an API regression — surface it as a warning instead
+    # of silently returning garbage.
+    if isinstance(payload, dict) and "text" in payload:
+        return {
+            "transcript": str(payload["text"]).strip(),
+            "language": str(payload.get("language", "unknown") or "unknown"),
+            "warnings": warnings,
+            "model_name": settings.huggingface_asr_model,
+        }
+    if payload is not None:
         warnings.append(f"Hosted ASR returned unexpected shape: {type(payload).__name__}")
-    except HFInferenceError as exc:
-        warnings.append(f"Hosted ASR unavailable: {exc}")
 
     return {
         "transcript": "",
@@ -112,6 +116,28 @@ def _transcribe_audio_bytes(audio_bytes: bytes) -> dict:
     }
 
 
+def _transcribe_audio_bytes(audio_bytes: bytes) -> dict:
+    oversized = _oversized_audio_result(audio_bytes)
+    if oversized:
+        return oversized
+    try:
+        payload = get_hf_client().automatic_speech_recognition(audio_bytes, content_type="audio/wav")
+    except HFInferenceError as exc:
+        return _transcript_result(None, [f"Hosted ASR unavailable: {exc}"])
+    return _transcript_result(payload, [])
+
+
+async def _atranscribe_audio_bytes(audio_bytes: bytes) -> dict:
+    oversized = _oversized_audio_result(audio_bytes)
+    if oversized:
+        return oversized
+    try:
+        payload = await get_hf_client().aautomatic_speech_recognition(audio_bytes, content_type="audio/wav")
+    except HFInferenceError as exc:
+        return _transcript_result(None, [f"Hosted ASR unavailable: {exc}"])
+    return _transcript_result(payload, [])
+
+
 def transcribe_from_wav(wav_path: str | Path) -> dict:
     fp = Path(wav_path)
     if not fp.exists():
@@ -131,18 +157,19 @@ def extract_audio_features(wav_path: str | Path) -> dict:
         import librosa
         import numpy as np
 
-        y, sr = librosa.load(str(wav_path), sr=16000, mono=True, duration=120)
-        duration = librosa.get_duration(y=y, sr=sr)
-        rms_frames = librosa.feature.rms(y=y)[0]
-        rms = float(rms_frames.mean()) if len(rms_frames) else 0.0
-        zcr = float(librosa.feature.zero_crossing_rate(y).mean()) if len(y) else 0.0
-        silence_ratio = float((rms_frames < max(rms * 0.1, 1e-6)).mean()) if len(rms_frames) else 1.0
-        spectral_centroid = float(librosa.feature.spectral_centroid(y=y, sr=sr).mean()) if len(y) else 0.0
-        pitch, voiced_flags, _ = librosa.pyin(
-            y,
-            fmin=librosa.note_to_hz("C2"),
-            fmax=librosa.note_to_hz("C7"),
-        )
+        with cpu_budget("audio_features"):
+            y, sr = librosa.load(str(wav_path), sr=16000, mono=True, duration=120)
+            duration = librosa.get_duration(y=y, sr=sr)
+            rms_frames = librosa.feature.rms(y=y)[0]
+            rms = float(rms_frames.mean()) if len(rms_frames) else 0.0
+            zcr = float(librosa.feature.zero_crossing_rate(y).mean()) if len(y) else 0.0
+            silence_ratio = float((rms_frames < max(rms * 0.1, 1e-6)).mean()) if len(rms_frames) else 1.0
+            spectral_centroid = float(librosa.feature.spectral_centroid(y=y, sr=sr).mean()) if len(y) else 0.0
+            pitch, voiced_flags, _ = librosa.pyin(
+                y,
+                fmin=librosa.note_to_hz("C2"),
+                fmax=librosa.note_to_hz("C7"),
+            )
         voiced_ratio = float(np.mean(voiced_flags)) if voiced_flags is not None else 0.0
         pitch_mean = float(np.nanmean(pitch)) if pitch is not None and np.any(~np.isnan(pitch)) else 0.0
         clipping_ratio = float(np.mean(np.abs(y) >= 0.98)) if len(y) else 0.0
@@ -167,7 +194,8 @@ def extract_audio_features(wav_path: str | Path) -> dict:
 def _audio_integrity(features: dict, transcript: str) -> dict:
     duration = float(features.get("duration_seconds", 0.0) or 0.0)
     silence = float(features.get("silence_ratio", 0.0) or 0.0)
-    voiced_ratio = float(features.get("voiced_ratio", 0.0) or 0.0)
+    # Early-rejected clips skip pitch tracking, so voiced_ratio may be missing
+    voiced_ratio = features.get("voiced_ratio")
     clipping = float(features.get("clipping_ratio", 0.0) or 0.0)
     token_count = len((transcript or "").split())
 
@@ -179,7 +207,7 @@ def _audio_integrity(features: dict, transcript: str) -> dict:
     if silence > 0.78:
         risk += 0.24
         flags.append("mostly_silent")
-    if voiced_ratio < 0.12 and duration >= 2.0:
+    if voiced_ratio is not None and float(voiced_ratio) < 0.12 and duration >= 2.0:
         risk += 0.2
         flags.append("low_voiced_content")
     if clipping > 0.02:
@@ -230,6 +258,14 @@ def _candidate_audio_models() -> list[str]:
     return candidates
 
 
+def _mark_hosted_audio_error(model_name: str, exc: HFInferenceError, warnings: list[str]) -> None:
+    exc_str = str(exc)
+    # Only permanently block auth errors, not transient 503s
+    is_permanent = "hf_auth_" in exc_str or "hf_http_404" in exc_str
+    _mark_model_failed(model_name, permanent=is_permanent)
+    warnings.append(f"Hosted audio emotion model {model_name} unavailable: {exc}")
+
+
 def _infer_audio_emotion_with_hosted_models(audio_bytes: bytes) -> tuple[str | None, float, str | None, list[str]]:
     warnings: list[str] = []
     best_label: str | None = None
@@ -256,11 +292,42 @@ def _infer_audio_emotion_with_hosted_models(audio_bytes: bytes) -> tuple[str | N
             warnings.append(f"Audio model {model_name} returned no supported emotion labels.")
             _mark_model_failed(model_name, permanent=False)
         except HFInferenceError as exc:
-            exc_str = str(exc)
-            # Only permanently block auth errors, not transient 503s
-            is_permanent = "hf_auth_" in exc_str or "hf_http_404" in exc_str
-            _mark_model_failed(model_name, permanent=is_permanent)
-            warnings.append(f"Hosted audio emotion model {model_name} unavailable: {exc}")
+            _mark_hosted_audio_error(model_name, exc, warnings)
+
+    if best_label:
+        if best_model:
+            _AUDIO_MODEL_SUCCESS_CACHE = best_model
+        return best_label, best_score, best_model, warnings
+    return None, 0.0, None, warnings
+
+
+async def _ainfer_audio_emotion_with_hosted_models(audio_bytes: bytes) -> tuple[str | None, float, str | None, list[str]]:
+    warnings: list[str] = []
+    best_label: str | None = None
+    best_score = 0.0
+    best_model: str | None = None
+    global _AUDIO_MODEL_SUCCESS_CACHE
+
+    for model_name in _candidate_audio_models():
+        try:
+            payload = await get_hf_client().aaudio_classification(
+                audio_bytes,
+                content_type="audio/wav",
+                model_id=model_name,
+            )
+            label, score = _parse_audio_emotion_payload(payload)
+            if label:
+                if score > best_score:
+                    best_label = label
+                    best_score = score
+                    best_model = model_name
+                if score >= 0.65:
+                    _AUDIO_MODEL_SUCCESS_CACHE = model_name
+                    return best_label, best_score, best_model, warnings
+            warnings.append(f"Audio model {model_name} returned no supported emotion labels.")
+            _mark_model_failed(model_name, permanent=False)
+        except HFInferenceError as exc:
+            _mark_hosted_audio_error(model_name, exc, warnings)
 
     if best_label:
         if best_model:
@@ -376,7 +443,8 @@ def _infer_audio_emotion_with_local_models(wav_path: str | Path) -> tuple[str |
     for model_name in _local_audio_model_candidates():
         try:
             classifier = _get_local_ser_pipeline(model_name)
-            payload = classifier(audio_input)
+            with cpu_budget("audio_ser"):
+                payload = classifier(audio_input)
             rows = payload if isinstance(payload, list) else [payload]
             if rows and isinstance(rows[0], list):
                 rows = rows[0]
@@ -432,10 +500,75 @@ def _fallback_audio_emotion(transcript: str, features: dict) -> tuple[str | None
     return "neutral", 0.45, "acoustic_fallback", warnings + ["fallback_low_confidence"]
 
 
-def analyse_audio(file_path: str | Path) -> dict:
+def _early_reject_audio_result(gate: str, features: dict, total_start: float, file_path) -> dict:
+    settings = get_settings()
+    audio_emotion, audio_confidence, audio_model_name, _ = _fallback_audio_emotion("", features)
+    logger.info("Audio early reject (%s) in %.2fs for %s", gate, time.perf_counter() - total_start, file_path)
+    return {
+        "transcript": "",
+        "language": "unknown",
+        "audio_emotion": audio_emotion,
+        "audio_emotion_confidence": round(float(audio_confidence or 0.0), 4),
+        "audio_confidence_tag": "low",
+        "transcription_model": settings.huggingface_asr_model,
+        "audio_model_name": audio_model_name,
+        "inference_source": "fallback",
+        "features": features,
+        "analysis_latency_ms": int((time.perf_counter() - total_start) * 1000),
+        "early_reject": {"gate": gate},
+        "fingerprints": [],
+        "warnings": ["fallback_low_confidence", f"Early reject: {gate}; ASR, pitch and SER were skipped."],
+        **_audio_integrity(features, ""),
+    }
+
+
+def _audio_preflight(wav_path: str | Path) -> tuple[str | None, dict]:
+    """Cheap duration/energy gate on the canonical WAV — no librosa, no models.
+
+    Returns (gate, features); gate is None when the clip should go through
+    full analysis.
+    """
+    import numpy as np
+
+    settings = get_settings()
+    audio_np, sr = _read_wav_as_numpy(wav_path)
+    duration = len(audio_np) / sr if sr else 0.0
+
+    frame_length, hop_length = 2048, 512
+    if len(audio_np) >= frame_length:
+        windows = np.lib.stride_tricks.sliding_window_view(audio_np, frame_length)[::hop_length]
+        rms_frames = np.sqrt(np.mean(np.square(windows), axis=1))
+    elif len(audio_np):
+        rms_frames = np.array([float(np.sqrt(np.mean(np.square(audio_np))))])
+    else:
+        rms_frames = np.zeros(0)
+
+    rms = float(rms_frames.mean()) if len(rms_frames) else 0.0
+    silence_threshold = max(rms * 0.1, _PREFLIGHT_SILENCE_RMS)
+    silence_ratio = float((rms_frames < silence_threshold).mean()) if len(rms_frames) else 1.0
+    features = {
+        "duration_seconds": round(duration, 2),
+        "sample_rate_hz": sr,
+        "rms_energy": round(rms, 6),
+        "silence_ratio": round(silence_ratio, 4),
+        "clipping_ratio": round(float(np.mean(np.abs(audio_np) >= 0.98)) if len(audio_np) else 0.0, 5),
+    }
+
+    if duration < float(settings.early_reject_min_audio_seconds):
+        return "too_short", features
+    if silence_ratio >= float(settings.early_reject_max_silence_ratio):
+        return "mostly_silent", features
+    return None, features
+
+
+def _prepare_audio(file_path: str | Path, total_start: float) -> tuple[dict | None, str | Path | None]:
+    """Transcode to the canonical WAV and run the pre-flight gate.
+
+    Returns (final_result, wav_path); final_result is set when preprocessing
+    failed or the clip was rejected early.
+    """
     settings = get_settings()
     fp = Path(file_path)
-    total_start = time.perf_counter()
 
     try:
         preprocess_start = time.perf_counter()
@@ -459,9 +592,86 @@ def analyse_audio(file_path: str | Path) -> dict:
             "audio_integrity_score": 0.0,
             "audio_spoof_risk": 1.0,
             "audio_integrity_flags": ["preprocessing_error"],
-        }
+        }, None
 
     wav_path = canonical["canonical_path"]
+
+    if settings.early_reject_enabled:
+        try:
+            gate, preflight_features = _audio_preflight(wav_path)
+        except Exception as exc:
+            gate, preflight_features = None, {}
+            logger.warning("Audio pre-flight skipped for %s: %s", file_path, exc)
+        if gate:
+            return _early_reject_audio_result(gate, preflight_features, total_start, file_path), None
+
+    return None, wav_path
+
+
+def _audio_fingerprint_for(wav_path: str | Path, file_path: str | Path) -> str | None:
+    if not get_settings().replay_detection_enabled:
+        return None
+    try:
+        return audio_fingerprint(*_read_wav_as_numpy(wav_path))
+    except Exception as exc:
+        logger.warning("Audio fingerprint skipped for %s: %s", file_path, exc)
+        return None
+
+
+def _audio_result(
+    *,
+    transcript_result: dict,
+    features: dict,
+    audio_emotion: str | None,
+    audio_confidence: float,
+    audio_model_name: str,
+    warnings: list[str],
+    fingerprint: str | None,
+    file_path: str | Path,
+    total_start: float,
+    transcript_elapsed: float,
+    features_elapsed: float,
+) -> dict:
+    settings = get_settings()
+    integrity = _audio_integrity(features, transcript_result.get("transcript", ""))
+
+    logger.info(
+        "Audio analysis completed in %.2fs for %s (transcript=%.2fs, features=%.2fs)",
+        time.perf_counter() - total_start,
+        file_path,
+        transcript_elapsed,
+        features_elapsed,
+    )
+
+    source = "fallback"
+    if "fallback" not in str(audio_model_name):
+        source = "local" if audio_model_name in _LOCAL_SER_PIPELINES or "local" in str(audio_model_name) else "huggingface"
+
+    return {
+        "transcript": transcript_result.get("transcript", ""),
+        "language": transcript_result.get("language", "unknown"),
+        "audio_emotion": audio_emotion,
+        "audio_emotion_confidence": round(float(audio_confidence or 0.0), 4),
+        "audio_confidence_tag": "low" if audio_model_name.endswith("fallback") or float(audio_confidence or 0.0) < 0.55 else "high",
+        "transcription_model": transcript_result.get("model_name", settings.huggingface_asr_model),
+        "audio_model_name": audio_model_name,
+        "inference_source": source,
+        "features": features,
+        "analysis_latency_ms": int((time.perf_counter() - total_start) * 1000),
+        "warnings": sorted(set(warnings)),
+        "fingerprints": [fingerprint] if fingerprint else [],
+        **integrity,
+    }
+
+
+def analyse_audio(file_path: str | Path) -> dict:
+    settings = get_settings()
+    total_start = time.perf_counter()
+
+    final, wav_path = _prepare_audio(file_path, total_start)
+    if final is not None:
+        return final
+
     payload_bytes = _read_audio_bytes(wav_path)
 
     transcript_result = None
@@ -541,31 +751,120 @@ def analyse_audio(file_path: str | Path) -> dict:
         )
         warnings.extend(fallback_warnings)
 
-    integrity = _audio_integrity(features, transcript_result.get("transcript", ""))
+    return _audio_result(
+        transcript_result=transcript_result,
+        features=features,
+        audio_emotion=audio_emotion,
+        audio_confidence=audio_confidence,
+        audio_model_name=audio_model_name,
+        warnings=warnings,
+        fingerprint=_audio_fingerprint_for(wav_path, file_path),
+        file_path=file_path,
+        total_start=total_start,
+        transcript_elapsed=transcript_elapsed,
+        features_elapsed=features_elapsed,
+    )
 
-    logger.info(
-        "Audio analysis completed in %.2fs for %s (transcript=%.2fs, features=%.2fs)",
-        time.perf_counter() - total_start,
-        file_path,
-        transcript_elapsed,
-        features_elapsed,
+
+async def analyse_audio_async(
+    file_path: str | Path,
+    on_transcript: Callable[[dict], Awaitable[None]] | None = None,
+) -> dict:
+    """Async twin of analyse_audio for the upload endpoint.
+
+    Hosted ASR/SER calls are awaited on the event loop; only CPU-bound work
+    (transcoding, librosa features, local SER, fingerprinting) goes to worker
+    threads, so in-flight uploads do not each pin a thread on network waits.
+
+    ``on_transcript`` is started as soon as ASR returns and runs alongside the
+    rest of the analysis (SER, pyin, fallbacks); it is awaited before return.
+    """
+    settings = get_settings()
+    total_start = time.perf_counter()
+
+    final, wav_path = await asyncio.to_thread(_prepare_audio, file_path, total_start)
+    if final is not None:
+        return final
+
+    payload_bytes = await asyncio.to_thread(_read_audio_bytes, wav_path)
+    audio_emotion = None
+    audio_confidence = 0.0
+    audio_model_name = settings.huggingface_audio_emotion_model
+
+    async def _timed(awaitable):
+        start = time.perf_counter()
+        return await awaitable, time.perf_counter() - start
+
+    transcript_task = None
+
+    async def _transcribe():
+        nonlocal transcript_task
+        timed = await _timed(_atranscribe_audio_bytes(payload_bytes))
+        if on_transcript is not None:
+            transcript_task = asyncio.ensure_future(on_transcript(timed[0]))
+        return timed
+
+    # ── Concurrent: hosted transcription + features + local SER (primary path) ──
+    local_task = None
+    if settings.huggingface_use_local_audio_cache:
+        local_task = asyncio.ensure_future(asyncio.to_thread(_infer_audio_emotion_with_local_models, wav_path))
+    (transcript_result, transcript_elapsed), (features, features_elapsed) = await asyncio.gather(
+        _transcribe(),
+        _timed(asyncio.to_thread(extract_audio_features, wav_path)),
     )
+    warnings = list(transcript_result.get("warnings", []))
 
-    source = "fallback"
-    if "fallback" not in str(audio_model_name):
-        source = "local" if audio_model_name in _LOCAL_SER_PIPELINES or "local" in str(audio_model_name) else "huggingface"
+    if local_task is not None:
+        try:
+            local_label, local_score, local_model, local_warnings = await local_task
+            warnings.extend(local_warnings)
+            if local_label:
+                audio_emotion = local_label
+                audio_confidence = local_score
+                audio_model_name = local_model or "local_audio_ser"
+        except Exception as exc:
+            warnings.append(f"Audio local SER preparation failed: {exc}")
 
-    return {
-        "transcript": transcript_result.get("transcript", ""),
-        "language": transcript_result.get("language", "unknown"),
-        "audio_emotion": audio_emotion,
-        "audio_emotion_confidence": round(float(audio_confidence or 0.0), 4),
-        "audio_confidence_tag": "low" if audio_model_name.endswith("fallback") or float(audio_confidence or 0.0) < 0.55 else "high",
-        "transcription_model": transcript_result.get("model_name", settings.huggingface_asr_model),
-        "audio_model_name": audio_model_name,
-        "inference_source": source,
-        "features": features,
-        "analysis_latency_ms": int((time.perf_counter() - total_start) * 1000),
-        "warnings": sorted(set(warnings)),
-        **integrity,
-    }
+    # ── Fallback to hosted SER if local failed ──
+    if not audio_emotion:
+        try:
+            hosted_label, hosted_score, hosted_model, hosted_warnings = await _ainfer_audio_emotion_with_hosted_models(payload_bytes)
+            warnings.extend(hosted_warnings)
+            if hosted_label:
+                audio_emotion = hosted_label
+                audio_confidence = hosted_score
+                if hosted_model:
+                    audio_model_name = hosted_model
+        except Exception as exc:
+            warnings.append(f"Audio hosted SER fallback failed: {exc}")
+
+    # ── Ultimate fallback: transcript + acoustic heuristic ──
+    if not audio_emotion:
+        audio_emotion, audio_confidence, audio_model_name, fallback_warnings = await asyncio.to_thread(
+            _fallback_audio_emotion,
+            transcript_result.get("transcript", ""),
+            features,
+        )
+        warnings.extend(fallback_warnings)
+
+    fingerprint = await asyncio.to_thread(_audio_fingerprint_for, wav_path, file_path)
+    if transcript_task is not None:
+        try:
+            await transcript_task
+        except Exception as exc:
+            logger.warning("Transcript callback failed: %s", exc)
+            warnings.append(f"Early transcript handling failed: {exc}")
+
+    return _audio_result(
+        transcript_result=transcript_result,
+        features=features,
+        audio_emotion=audio_emotion,
+        audio_confidence=audio_confidence,
+        audio_model_name=audio_model_name,
+        warnings=warnings,
+        fingerprint=fingerprint,
+        file_path=file_path,
+        total_start=total_start,
+        transcript_elapsed=transcript_elapsed,
+        features_elapsed=features_elapsed,
+    )
@@ -0,0 +1,190 @@
+"""Confidence-gated cascade inference for text and face emotion.
+
+A cheap first-stage scorer runs before the expensive emotion model. When its
+margin clears the modality threshold the heavy model is skipped; otherwise the
+request escalates. Thresholds come from settings and can be overridden by
+ml_models/cascade_thresholds.json, which tune_cascade.py writes from stored
+ExtractedFeature rows.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.services.text_service import _keyword_fallback, _keyword_hits
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIRST_STAGE_MODEL = "lexical_keyword_v1"
+FACE_FIRST_STAGE_MODEL = "opencv_haar_smile"
+
+_THRESHOLDS_PATH = Path(__file__).resolve().parents[2] / "ml_models" / "cascade_thresholds.json"
+_thresholds: dict | None = None
+
+_NEGATIONS = {"not", "no", "never", "don't", "dont", "isn't", "wasn't", "can't", "cannot", "hardly", "without"}
+_SMILE_NEIGHBOR_SATURATION = 40.0
+_STATS_LOG_EVERY = 50
+
+_smile_detector = None
+_stats_lock = threading.Lock()
+_STATS: dict[str, dict[str, int]] = {
+    "text": {"decisions": 0, "first_stage": 0, "escalated": 0, "audited": 0},
+    "face": {"decisions": 0, "first_stage": 0, "escalated": 0, "audited": 0},
+}
+
+
+@dataclass
+class FirstStageResult:
+    label: str | None
+    score: float
+    margin: float
+    model_name: str
+
+
+@dataclass
+class CascadeDecision:
+    modality: str
+    first_stage: FirstStageResult
+    threshold: float
+    escalate: bool
+    audited: bool = False
+
+    def as_metadata(self, heavy_label: str | None = None) -> dict:
+        return {
+            "stage": "heavy" if self.escalate else "first",
+            "first_stage_model": self.first_stage.model_name,
+            "first_stage_label": self.first_stage.label,
+            "first_stage_margin": round(self.first_stage.margin, 4),
+            "threshold": round(self.threshold, 4),
+            "audited": self.audited,
+            "heavy_label": heavy_label,
+        }
+
+
+def _load_thresholds() -> dict:
+    global _thresholds
+    if _thresholds is not None:
+        return _thresholds
+    _thresholds = {}
+    if _THRESHOLDS_PATH.exists():
+        try:
+            payload = json.loads(_THRESHOLDS_PATH.read_text(encoding="utf-8"))
+            _thresholds = payload if isinstance(payload, dict) else {}
+        except Exception as exc:
+            logger.warning("Ignoring unreadable cascade thresholds file %s: %s", _THRESHOLDS_PATH, exc)
+    return _thresholds
+
+
+def get_threshold(modality: str) -> float:
+    tuned = _load_thresholds().get(modality)
+    if tuned is not None:
+        return float(tuned)
+    settings = get_settings()
+    if modality == "face":
+        return float(settings.cascade_face_margin_threshold)
+    return float(settings.cascade_text_margin_threshold)
+
+
+def text_first_stage(text: str) -> FirstStageResult:
+    """Lexical scorer; margin is the hit lead over the runner-up, scaled by hit density."""
+    tokens = re.findall(r"[a-z']+", (text or "").lower())
+    if not tokens:
+        return FirstStageResult(None, 0.0, 0.0, TEXT_FIRST_STAGE_MODEL)
+
+    ranked = sorted(_keyword_hits(text).values(), reverse=True)
+    best, second = ranked[0], ranked[1]
+    if best == 0 or _NEGATIONS.intersection(tokens):
+        return FirstStageResult(None, 0.0, 0.0, TEXT_FIRST_STAGE_MODEL)
+
+    lead = (best - second) / (best + second + 1)
+    density = min(1.0, 10.0 * best / len(tokens))
+    fallback = _keyword_fallback(text)
+    return FirstStageResult(fallback["label"], float(fallback["score"]), lead * density, TEXT_FIRST_STAGE_MODEL)
+
+
+def _get_smile_detector():
+    global _smile_detector
+    if _smile_detector is None:
+        try:
+            import cv2
+
+            detector = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_smile.xml")
+            _smile_detector = detector if not detector.empty() else False
+        except Exception:
+            _smile_detector = False
+    return _smile_detector
+
+
+def face_first_stage(face) -> FirstStageResult:
+    """Haar smile detector on the lower half of the face crop; it can only vouch for joy."""
+    detector = _get_smile_detector()
+    if not detector or face is None:
+        return FirstStageResult(None, 0.0, 0.0, FACE_FIRST_STAGE_MODEL)
+
+    import cv2
+
+    gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape[:2]
+    mouth_region = gray[height // 2:, :]
+    min_side = max(12, width // 5)
+    objects, neighbors = detector.detectMultiScale2(
+        mouth_region,
+        scaleFactor=1.7,
+        minNeighbors=1,
+        minSize=(min_side, max(8, min_side // 2)),
+    )
+    if len(objects) == 0:
+        return FirstStageResult(None, 0.0, 0.0, FACE_FIRST_STAGE_MODEL)
+
+    margin = min(1.0, float(max(neighbors)) / _SMILE_NEIGHBOR_SATURATION)
+    return FirstStageResult("joy", round(0.5 + 0.4 * margin, 4), margin, FACE_FIRST_STAGE_MODEL)
+
+
+def decide(modality: str, first_stage: FirstStageResult) -> CascadeDecision:
+    """Decide whether the heavy model must run, and record the outcome."""
+    settings = get_settings()
+    threshold = get_threshold(modality)
+    escalate = first_stage.label is None or first_stage.margin < threshold
+    audited = False
+    if not escalate and random.random() < float(settings.cascade_audit_sample_rate):
+        escalate = True
+        audited = True
+
+    with _stats_lock:
+        stats = _STATS.setdefault(modality, {"decisions": 0, "first_stage": 0, "escalated": 0, "audited": 0})
+        stats["decisions"] += 1
+        stats["escalated" if escalate else "first_stage"] += 1
+        if audited:
+            stats["audited"] += 1
+        should_log = stats["decisions"] % _STATS_LOG_EVERY == 0
+        snapshot = dict(stats)
+
+    if should_log:
+        logger.info(
+            "Cascade %s: decisions=%d first_stage=%d escalated=%d audited=%d hit_rate=%.3f",
+            modality,
+            snapshot["decisions"],
+            snapshot["first_stage"],
+            snapshot["escalated"],
+            snapshot["audited"],
+            snapshot["first_stage"] / max(1, snapshot["decisions"]),
+        )
+    return CascadeDecision(modality, first_stage, threshold, escalate, audited)
+
+
+def get_cascade_stats() -> dict:
+    with _stats_lock:
+        return {
+            modality: {
+                **stats,
+                "threshold": round(get_threshold(modality), 4),
+                "first_stage_hit_rate": round(stats["first_stage"] / max(1, stats["decisions"]), 4),
+            }
+            for modality, stats in _STATS.items()
+        }
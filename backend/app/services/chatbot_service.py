@@ -36,6 +36,7 @@ from app.services.safety.crisis_detector import get_crisis_detector
 from app.services.tools.clinic_tools import find_nearby_clinics
 from app.services.tools.appointment_tools import create_appointment_request
 from app.services.tools.emergency_tools import get_emergency_info
+from app.utils.wellness import compute_wellness_score
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -52,9 +53,7 @@ def _score_to_percent(value: Optional[float]) -> Optional[int]:
 def _compute_wellness_score(result: Optional[AnalysisResult]) -> Optional[int]:
     if not result:
         return None
-    stress = float(result.stress_score or 0.0)
-    mood = float(result.mood_score or 0.0)
-    return max(0, min(100, int(round(((1.0 - stress) * 0.45 + mood * 0.55) * 100.0))))
+    return compute_wellness_score(result.stress_score, result.mood_score)
 
 
 def _uuid() -> str:
@@ -0,0 +1,138 @@
+"""Per-endpoint circuit breaker with latency-based adaptive timeouts.
+
+One breaker per hosted model. After ``failure_threshold`` consecutive failures
+the breaker opens and calls fail fast for ``open_seconds``; then a single
+half-open probe decides whether to close again. While closed, the request
+timeout tracks the endpoint's recent latency percentile instead of always
+waiting the full configured timeout; timed-out calls count as samples too, and
+the half-open probe always gets the full configured timeout so a slow cold
+start can still close the breaker.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_MIN_LATENCY_SAMPLES = 10
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 3,
+        open_seconds: float = 30.0,
+        latency_window: int = 50,
+        timeout_percentile: float = 95.0,
+        timeout_multiplier: float = 2.0,
+        min_timeout_seconds: float = 2.0,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.open_seconds = float(open_seconds)
+        self.timeout_percentile = float(timeout_percentile)
+        self.timeout_multiplier = float(timeout_multiplier)
+        self.min_timeout_seconds = float(min_timeout_seconds)
+        self._latencies: deque[float] = deque(maxlen=max(_MIN_LATENCY_SAMPLES, int(latency_window)))
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self._probe_in_flight = False
+        self.counters = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; moves open -> half-open once the cooldown passes."""
+        with self._lock:
+            if self.state == OPEN:
+                if self.opened_at is not None and time.monotonic() - self.opened_at >= self.open_seconds:
+                    self.state = HALF_OPEN
+                    self._probe_in_flight = False
+                else:
+                    self.counters["rejected"] += 1
+                    return False
+            if self.state == HALF_OPEN:
+                if self._probe_in_flight:
+                    self.counters["rejected"] += 1
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def is_open(self) -> bool:
+        with self._lock:
+            if self.state != OPEN:
+                return False
+            return self.opened_at is not None and time.monotonic() - self.opened_at < self.open_seconds
+
+    def record_success(self, latency_seconds: float | None = None) -> None:
+        """Upstream answered. Pass ``latency_seconds`` only for real results (not fast 4xx rejections)."""
+        with self._lock:
+            if latency_seconds is not None:
+                self._latencies.append(float(latency_seconds))
+            self.counters["successes"] += 1
+            self.consecutive_failures = 0
+            self.state = CLOSED
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self, latency_seconds: float | None = None) -> None:
+        """Upstream failed. Pass ``latency_seconds`` for timeouts so the adaptive timeout can grow."""
+        with self._lock:
+            if latency_seconds is not None:
+                self._latencies.append(float(latency_seconds))
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.counters["opened"] += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Settle a call that says nothing new about the endpoint; frees a half-open probe slot."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _latency_percentile(self) -> float | None:
+        if len(self._latencies) < _MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(round(self.timeout_percentile / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def timeout(self, configured_seconds: float) -> float:
+        """Adaptive read timeout: percentile latency x multiplier, within [min, configured].
+
+        The half-open probe gets ``configured_seconds`` unchanged.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                return configured_seconds
+            percentile = self._latency_percentile()
+        if percentile is None:
+            return configured_seconds
+        adaptive = max(self.min_timeout_seconds, percentile * self.timeout_multiplier)
+        return min(configured_seconds, adaptive)
+
+    def snapshot(self, configured_seconds: float | None = None) -> dict:
+        with self._lock:
+            percentile = self._latency_percentile()
+            data = {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "latency_samples": len(self._latencies),
+                "latency_percentile_seconds": round(percentile, 3) if percentile is not None else None,
+                **self.counters,
+            }
+            if self.state == OPEN and self.opened_at is not None:
+                data["retry_in_seconds"] = round(max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 1)
+        if configured_seconds is not None:
+            data["timeout_seconds"] = round(self.timeout(configured_seconds), 2)
+        return data
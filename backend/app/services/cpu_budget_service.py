@@ -0,0 +1,187 @@
+"""CPU thread budget for local inference.
+
+PyTorch, OpenCV and BLAS each size their thread pools to every core by default,
+and all three pools are process-wide. When an audio and a video analysis
+overlap, that oversubscribes the host several times over. Stages wrap their
+CPU-heavy section in ``cpu_budget(stage)``; the manager splits the host budget
+across the stages currently running and resizes each library's pool.
+
+``autotune_cpu_budget()`` runs once at startup: it reads the usable core count
+(affinity + cgroup quota) and times a small BLAS matmul to decide whether
+multi-threaded BLAS is worth it on this host.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Which thread pool each analysis stage actually spends its time in.
+_STAGE_BACKENDS = {
+    "audio_ser": "torch",
+    "face_model": "torch",
+    "text_model": "torch",
+    "audio_features": "blas",
+    "video_frames": "opencv",
+}
+# Relative share of the budget a stage asks for when several stages overlap.
+_STAGE_WEIGHTS = {
+    "audio_ser": 2.0,
+    "face_model": 2.0,
+    "text_model": 2.0,
+    "audio_features": 1.0,
+    "video_frames": 1.0,
+}
+
+_lock = threading.Lock()
+_active: dict[str, int] = {}
+_applied: dict[str, int] = {}
+_budget: dict = {"total_threads": None, "backend_caps": {}, "autotuned": False}
+_stats = {"leases": 0, "contended_leases": 0}
+
+
+def _usable_cores() -> int:
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cores = os.cpu_count() or 1
+    # cgroup v2 CPU quota (containers): "max 100000" or "<quota> <period>"
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="utf-8") as fh:
+            quota, period = fh.read().split()[:2]
+        if quota != "max":
+            cores = min(cores, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cores)
+
+
+def _blas_scales(threads: int) -> bool:
+    """True when a multi-threaded matmul is clearly faster than single-threaded."""
+    if threads <= 1:
+        return False
+    try:
+        import numpy as np
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return True
+
+    a = np.random.default_rng(0).random((384, 384))
+
+    def _time(n: int) -> float:
+        with threadpool_limits(limits=n, user_api="blas"):
+            a @ a  # warm the pool
+            start = time.perf_counter()
+            for _ in range(3):
+                a @ a
+            return time.perf_counter() - start
+
+    single, multi = _time(1), _time(min(threads, 4))
+    return multi * 1.3 < single
+
+
+def autotune_cpu_budget() -> dict:
+    """Pick the host thread budget and per-backend caps. Safe to call more than once."""
+    settings = get_settings()
+    cores = _usable_cores()
+    configured = int(settings.cpu_thread_budget or 0)
+    # Leave one core for the event loop and request handling on larger hosts.
+    total = configured if configured > 0 else (cores - 1 if cores > 2 else cores)
+
+    try:
+        blas_cap = total if _blas_scales(total) else 1
+    except Exception as exc:
+        logger.warning("BLAS autotune failed, keeping a single BLAS thread: %s", exc)
+        blas_cap = 1
+
+    caps = {"torch": total, "opencv": min(total, 4), "blas": blas_cap}
+    with _lock:
+        _budget.update({"total_threads": total, "backend_caps": caps, "autotuned": True, "host_cores": cores})
+        _applied.clear()
+        _rebalance()
+
+    try:
+        import torch
+        torch.set_num_interop_threads(1)
+    except Exception:
+        pass  # torch missing, or inter-op pool already started
+
+    logger.info("CPU budget autotuned: cores=%d total_threads=%d caps=%s", cores, total, caps)
+    return dict(_budget)
+
+
+def _set_backend_threads(backend: str, threads: int) -> None:
+    if _applied.get(backend) == threads:
+        return
+    try:
+        if backend == "torch":
+            import torch
+            torch.set_num_threads(threads)
+        elif backend == "opencv":
+            import cv2
+            cv2.setNumThreads(threads)
+        elif backend == "blas":
+            from threadpoolctl import threadpool_limits
+            threadpool_limits(limits=threads, user_api="blas")
+    except Exception:
+        return  # library not installed here; nothing to size
+    _applied[backend] = threads
+
+
+def _rebalance() -> None:
+    """Split the budget across active stages by weight. Caller holds ``_lock``."""
+    total = _budget["total_threads"] or _usable_cores()
+    caps = _budget["backend_caps"] or {}
+    weight_sum = sum(_STAGE_WEIGHTS[stage] * count for stage, count in _active.items())
+    if weight_sum <= 0:
+        return
+
+    backend_threads: dict[str, int] = {}
+    for stage, count in _active.items():
+        if count <= 0:
+            continue
+        share = int(total * _STAGE_WEIGHTS[stage] / weight_sum)
+        backend = _STAGE_BACKENDS[stage]
+        backend_threads[backend] = max(backend_threads.get(backend, 1), share, 1)
+
+    for backend, threads in backend_threads.items():
+        _set_backend_threads(backend, max(1, min(threads, caps.get(backend, total))))
+
+
+@contextmanager
+def cpu_budget(stage: str):
+    """Hold a share of the CPU budget while running ``stage`` (see ``_STAGE_BACKENDS``)."""
+    if not get_settings().cpu_budget_enabled or stage not in _STAGE_BACKENDS:
+        yield
+        return
+
+    with _lock:
+        _stats["leases"] += 1
+        if any(_active.values()):
+            _stats["contended_leases"] += 1
+        _active[stage] = _active.get(stage, 0) + 1
+        _rebalance()
+    try:
+        yield
+    finally:
+        with _lock:
+            _active[stage] -= 1
+            if _active[stage] <= 0:
+                del _active[stage]
+            _rebalance()
+
+
+def get_cpu_budget_stats() -> dict:
+    with _lock:
+        return {
+            **_budget,
+            "applied_threads": dict(_applied),
+            "active_stages": dict(_active),
+            **_stats,
+        }
@@ -0,0 +1,140 @@
+"""Latest-per-modality feature loading for one or many assessments.
+
+``ExtractedFeature`` keeps every extraction, so readers want the newest row per
+(assessment, modality). ``FeatureRepository`` fetches those rows for any number
+of assessments in a single ``ROW_NUMBER()`` window query, parses each JSON blob
+once and keeps the parsed dicts for the lifetime of the repository — create
+one per request (or per batch) and ask it as often as needed.
+"""
+from __future__ import annotations
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models.extracted_feature import ExtractedFeature
+from app.models.inference_run import InferenceRun
+from app.models.questionnaire import QuestionnaireResponse
+
+MODALITIES = ("text", "audio", "video", "questionnaire")
+
+
+def _parse(blob: Optional[str]) -> Optional[dict]:
+    if not blob:
+        return None
+    try:
+        return json.loads(blob)
+    except Exception:
+        return None
+
+
+class FeatureRepository:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self._features: Dict[str, Dict[str, Optional[dict]]] = {}
+        self._questionnaire_totals: Dict[str, Optional[float]] = {}
+        self._runs: Dict[str, Optional[InferenceRun]] = {}
+        self._tracking: Dict[str, Optional[dict]] = {}
+
+    def load(self, assessment_ids: Iterable[str]) -> Dict[str, Dict[str, Optional[dict]]]:
+        """Newest parsed feature dict per modality for every id (None where missing)."""
+        ids = list(dict.fromkeys(assessment_ids))
+        missing = [aid for aid in ids if aid not in self._features]
+        if missing:
+            ranked = (
+                select(
+                    ExtractedFeature.assessment_id,
+                    ExtractedFeature.modality_type,
+                    ExtractedFeature.feature_json,
+                    func.row_number().over(
+                        partition_by=(ExtractedFeature.assessment_id, ExtractedFeature.modality_type),
+                        order_by=ExtractedFeature.computed_at.desc(),
+                    ).label("rank"),
+                )
+                .where(ExtractedFeature.assessment_id.in_(missing))
+                .where(ExtractedFeature.modality_type.in_(MODALITIES))
+                .subquery()
+            )
+            for aid in missing:
+                self._features[aid] = {modality: None for modality in MODALITIES}
+            rows = self.session.exec(
+                select(ranked.c.assessment_id, ranked.c.modality_type, ranked.c.feature_json)
+                .where(ranked.c.rank == 1)
+            ).all()
+            for aid, modality, blob in rows:
+                self._features[aid][modality] = _parse(blob)
+        return {aid: self._features[aid] for aid in ids}
+
+    def features(self, assessment_id: str) -> Dict[str, Optional[dict]]:
+        return self.load([assessment_id])[assessment_id]
+
+    def feature(self, assessment_id: str, modality: str) -> Optional[dict]:
+        return self.features(assessment_id).get(modality)
+
+    def _load_questionnaire_totals(self, assessment_ids: List[str]) -> None:
+        missing = [aid for aid in assessment_ids if aid not in self._questionnaire_totals]
+        if not missing:
+            return
+        rows = self.session.exec(
+            select(QuestionnaireResponse.assessment_id, QuestionnaireResponse.total_score)
+            .where(QuestionnaireResponse.assessment_id.in_(missing))
+            .order_by(QuestionnaireResponse.assessment_id, QuestionnaireResponse.submitted_at.desc())
+        ).all()
+        for aid in missing:
+            self._questionnaire_totals[aid] = None
+        seen = set()
+        for aid, total_score in rows:
+            if aid not in seen:
+                seen.add(aid)
+                self._questionnaire_totals[aid] = total_score
+
+    def questionnaire_data_many(self, assessment_ids: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """Questionnaire features, falling back to the latest response's total score."""
+        ids = list(dict.fromkeys(assessment_ids))
+        features = self.load(ids)
+        self._load_questionnaire_totals([aid for aid in ids if not features[aid]["questionnaire"]])
+        data = {}
+        for aid in ids:
+            q_feat = features[aid]["questionnaire"]
+            if q_feat:
+                data[aid] = q_feat
+            else:
+                total = self._questionnaire_totals.get(aid)
+                data[aid] = {"total_score": total} if total is not None else None
+        return data
+
+    def questionnaire_data(self, assessment_id: str) -> Optional[dict]:
+        return self.questionnaire_data_many([assessment_id])[assessment_id]
+
+    def scoring_inputs(self, assessment_id: str) -> dict:
+        """Keyword arguments for the fusion engines' compute_scores."""
+        features = self.features(assessment_id)
+        return {
+            "text_features": features["text"],
+            "audio_features": features["audio"],
+            "video_features": features["video"],
+            "questionnaire_data": self.questionnaire_data(assessment_id),
+        }
+
+    def latest_run(self, assessment_id: str) -> Optional[InferenceRun]:
+        if assessment_id not in self._runs:
+            self._runs[assessment_id] = self.session.exec(
+                select(InferenceRun)
+                .where(InferenceRun.assessment_id == assessment_id)
+                .order_by(InferenceRun.created_at.desc())
+            ).first()
+        return self._runs[assessment_id]
+
+    def remember_run(self, run: InferenceRun, tracking: Optional[dict]) -> None:
+        """Record a run written in this request so later reads don't go back to the database."""
+        self._runs[run.assessment_id] = run
+        self._tracking[run.assessment_id] = tracking
+
+    def latest_tracking(self, assessment_id: str) -> Optional[dict]:
+        """Parsed ``output_json`` of the newest inference run."""
+        if assessment_id not in self._tracking:
+            run = self.latest_run(assessment_id)
+            self._tracking[assessment_id] = _parse(run.output_json) if run else None
+        return self._tracking[assessment_id]
@@ -0,0 +1,200 @@
+"""Fusion-engine registry with shadow comparison.
+
+One engine (``fusion_primary_engine``) produces the scores that are served and
+stored. On a ``fusion_shadow_sample_rate`` fraction of runs, every engine in
+``fusion_shadow_engines`` scores the same inputs on a single background worker,
+after the response is built, and the per-score deltas, ``final_risk_level``
+agreement and both latencies go to ``fusion_shadow_results``. Shadow failures
+are logged and never reach the request. ``python shadow_report.py`` summarises
+the table.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.database import engine
+from app.models.fusion_shadow_result import FusionShadowResult
+from app.services import fusion_nn, risk_calibration_service, scoring_service, scoring_service_v2
+
+logger = logging.getLogger(__name__)
+
+ENGINES: Dict[str, Callable[..., Dict]] = {
+    "nn_v1": scoring_service.compute_scores,
+    "weighted_v2": scoring_service_v2.compute_scores,
+}
+
+# Engines with a vectorised scorer; the rest are looped row by row.
+BATCH_ENGINES: Dict[str, Callable[[list], list]] = {
+    "nn_v1": scoring_service.compute_scores_batch,
+}
+
+COMPARED_SCORES = (
+    "stress_score",
+    "low_mood_score",
+    "burnout_score",
+    "social_withdrawal_score",
+    "crisis_score",
+    "emotional_distress_score",
+    "mood_score",
+    "confidence_score",
+)
+
+# Shadow work is best-effort: beyond this many queued comparisons new ones are dropped.
+_MAX_PENDING = 32
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fusion-shadow")
+_pending_lock = threading.Lock()
+_pending = 0
+
+
+def _engine_names(raw: str) -> list[str]:
+    return [name.strip() for name in (raw or "").split(",") if name.strip()]
+
+
+def primary_engine_name() -> str:
+    name = get_settings().fusion_primary_engine
+    if name not in ENGINES:
+        logger.warning("Unknown fusion engine %r; serving with nn_v1", name)
+        return "nn_v1"
+    return name
+
+
+def _shadow_engine_names(primary: str) -> list[str]:
+    names = []
+    for name in _engine_names(get_settings().fusion_shadow_engines):
+        if name == primary or name in names:
+            continue
+        if name not in ENGINES:
+            logger.warning("Unknown shadow fusion engine %r ignored", name)
+            continue
+        names.append(name)
+    return names
+
+
+def input_fingerprint(inputs: dict) -> str:
+    """Stable hash of the scoring inputs; stored as ``InferenceRun.input_snapshot_hash``."""
+    basis = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+
+def engine_version(name: Optional[str] = None) -> str:
+    """Everything besides the inputs that determines the scores: engine, fusion model and calibrator."""
+    name = name or primary_engine_name()
+    if name == "nn_v1":
+        model, info = fusion_nn.get_active_model()
+        nn_version = info.get("version") or ("heuristic" if model is None else "unregistered")
+        return f"{name}:{nn_version}:{risk_calibration_service.calibration_version() or 'identity'}"
+    return f"{name}:{scoring_service_v2.MODEL_NAME}"
+
+
+def _timed(name: str, inputs: dict) -> tuple[Dict, float]:
+    start = time.perf_counter()
+    scores = ENGINES[name](**inputs)
+    return scores, (time.perf_counter() - start) * 1000
+
+
+def _comparison(assessment_id: str, primary: str, primary_scores: Dict, primary_ms: float,
+                shadow: str, shadow_scores: Dict, shadow_ms: float) -> FusionShadowResult:
+    deltas = {}
+    for key in COMPARED_SCORES:
+        a, b = primary_scores.get(key), shadow_scores.get(key)
+        if a is None or b is None:
+            continue
+        deltas[key] = round(float(b) - float(a), 4)
+    primary_level = primary_scores.get("final_risk_level")
+    shadow_level = shadow_scores.get("final_risk_level")
+    return FusionShadowResult(
+        assessment_id=assessment_id,
+        primary_engine=primary,
+        shadow_engine=shadow,
+        primary_risk_level=primary_level,
+        shadow_risk_level=shadow_level,
+        risk_level_agree=1 if primary_level == shadow_level else 0,
+        score_deltas_json=json.dumps(deltas, separators=(",", ":")),
+        max_abs_delta=max((abs(v) for v in deltas.values()), default=None),
+        primary_latency_ms=round(primary_ms, 3),
+        shadow_latency_ms=round(shadow_ms, 3),
+    )
+
+
+def _run_shadows(assessment_id: str, inputs: dict, primary: str, primary_scores: Dict,
+                 primary_ms: float, shadows: list[str]) -> None:
+    global _pending
+    try:
+        rows = []
+        for name in shadows:
+            try:
+                shadow_scores, shadow_ms = _timed(name, inputs)
+            except Exception as exc:
+                logger.warning("Shadow fusion engine %s failed: %s", name, exc)
+                continue
+            rows.append(_comparison(assessment_id, primary, primary_scores, primary_ms, name, shadow_scores, shadow_ms))
+        if rows:
+            with Session(engine) as session:
+                with session.begin():
+                    session.add_all(rows)
+    except Exception as exc:
+        logger.warning("Recording shadow fusion results failed: %s", exc)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+def _schedule_shadows(assessment_id: str, inputs: dict, primary: str, primary_scores: Dict, primary_ms: float) -> None:
+    global _pending
+    settings = get_settings()
+    if settings.fusion_shadow_sample_rate <= 0 or random.random() >= settings.fusion_shadow_sample_rate:
+        return
+    shadows = _shadow_engine_names(primary)
+    if not shadows:
+        return
+    with _pending_lock:
+        if _pending >= _MAX_PENDING:
+            logger.debug("Shadow fusion queue full; skipping %s", assessment_id)
+            return
+        _pending += 1
+    _executor.submit(_run_shadows, assessment_id, inputs, primary, dict(primary_scores), primary_ms, shadows)
+
+
+def compute_scores(
+    assessment_id: str,
+    text_features: Optional[Dict] = None,
+    audio_features: Optional[Dict] = None,
+    video_features: Optional[Dict] = None,
+    questionnaire_data: Optional[Dict] = None,
+) -> Dict:
+    """Score with the primary engine; maybe queue the shadow engines on the same inputs."""
+    inputs = {
+        "text_features": text_features,
+        "audio_features": audio_features,
+        "video_features": video_features,
+        "questionnaire_data": questionnaire_data,
+    }
+    primary = primary_engine_name()
+    scores, primary_ms = _timed(primary, inputs)
+    scores["fusion_engine"] = primary
+    try:
+        _schedule_shadows(assessment_id, inputs, primary, scores, primary_ms)
+    except Exception as exc:
+        logger.warning("Scheduling shadow fusion engines failed: %s", exc)
+    return scores
+
+
+def compute_scores_batch(inputs: list[dict]) -> list[Dict]:
+    """Score many input dicts with the primary engine (no shadowing; used by bulk jobs)."""
+    primary = primary_engine_name()
+    batch = BATCH_ENGINES.get(primary)
+    results = batch(inputs) if batch else [ENGINES[primary](**row) for row in inputs]
+    for scores in results:
+        scores["fusion_engine"] = primary
+    return results
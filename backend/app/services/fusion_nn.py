@@ -7,19 +7,28 @@ Architecture:
   Output : 5 scores — stress, low_mood, burnout, social_withdrawal, crisis
 
 Model file: backend/ml_models/fusion_nn.pkl  (sklearn Pipeline)
+Serving  : backend/ml_models/fusion_nn.npz  (scaler + layer weights, exported
+           from the pipeline; evaluated by NumpyFusionMLP, no sklearn needed)
 Train with: python train_nn.py  (from backend/ directory)
 
 If the model file does not exist, predict() returns None and scoring_service
 falls back to the heuristic weighted-average method.
 """
 from __future__ import annotations
+import logging
 import pickle
+import threading
 import numpy as np
 from pathlib import Path
 from typing import Optional, Dict
 
+logger = logging.getLogger(__name__)
+
 _MODEL_PATH = Path(__file__).resolve().parents[2] / "ml_models" / "fusion_nn.pkl"
-_model = None   # loaded lazily on first predict call
+_ARRAYS_PATH = _MODEL_PATH.with_suffix(".npz")
+_active: Optional[tuple] = None   # (model, info); loaded lazily, swapped whole by activate()
+_PROBE_ROWS = 64
+_MAX_ABS_ERROR = 1e-6   # NumPy vs sklearn tolerance checked at load time
 
 # ── Feature names (must match train_nn.py order exactly) ──────
 FEATURE_NAMES = [
@@ -136,18 +145,177 @@ def explain_dominant_features(feature_vector: list[float], output_scores: Dict[s
     return explained
 
 
+class NumpyFusionMLP:
+    """MinMaxScaler + ReLU MLP forward pass on plain arrays.
+
+    Mirrors sklearn's arithmetic (float32 scaling, float64 layers), so outputs
+    match ``Pipeline.predict`` to ~1e-12. Single-row calls, the serving hot
+    path, reuse per-thread preallocated buffers.
+    """
+
+    def __init__(self, scale, offset, clip: bool, coefs: list, intercepts: list) -> None:
+        self.scale = np.asarray(scale)     # keep the fitted dtype; sklearn scales in the input dtype
+        self.offset = np.asarray(offset)
+        self.clip = bool(clip)
+        self.coefs = [np.ascontiguousarray(w, dtype=np.float64) for w in coefs]
+        self.intercepts = [np.asarray(b, dtype=np.float64) for b in intercepts]
+        self._local = threading.local()
+
+    @classmethod
+    def from_pipeline(cls, pipeline) -> "NumpyFusionMLP":
+        scaler, mlp = pipeline.steps[0][1], pipeline.steps[-1][1]
+        if mlp.activation != "relu" or mlp.out_activation_ != "identity":
+            raise ValueError(f"unsupported activations {mlp.activation}/{mlp.out_activation_}")
+        return cls(scaler.scale_, scaler.min_, getattr(scaler, "clip", False), mlp.coefs_, mlp.intercepts_)
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "NumpyFusionMLP":
+        n_layers = int(arrays["n_layers"])
+        return cls(
+            arrays["scale"], arrays["offset"], bool(arrays["clip"]),
+            [arrays[f"coef_{i}"] for i in range(n_layers)],
+            [arrays[f"intercept_{i}"] for i in range(n_layers)],
+        )
+
+    def _buffers(self) -> tuple:
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = (
+                np.empty((1, self.scale.shape[0]), dtype=np.float32),
+                np.empty((1, self.scale.shape[0]), dtype=np.float64),
+                [np.empty((1, w.shape[1]), dtype=np.float64) for w in self.coefs],
+            )
+            self._local.buffers = buffers
+        return buffers
+
+    def predict(self, x) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        if x.shape[0] == 1:
+            scaled32, scaled, layers = self._buffers()
+            scaled32[...] = x
+        else:
+            scaled32 = x.copy()
+            scaled = np.empty(x.shape, dtype=np.float64)
+            layers = [np.empty((x.shape[0], w.shape[1]), dtype=np.float64) for w in self.coefs]
+        scaled32 *= self.scale
+        scaled32 += self.offset
+        if self.clip:
+            np.clip(scaled32, 0.0, 1.0, out=scaled32)
+        scaled[...] = scaled32
+
+        activation = scaled
+        last = len(self.coefs) - 1
+        for i, (w, b, out) in enumerate(zip(self.coefs, self.intercepts, layers)):
+            np.dot(activation, w, out=out)
+            out += b
+            if i != last:
+                np.maximum(out, 0.0, out=out)
+            activation = out
+        return activation.copy()
+
+    def arrays(self) -> dict:
+        arrays = {"scale": self.scale, "offset": self.offset, "clip": np.array(self.clip), "n_layers": np.array(len(self.coefs))}
+        for i, (w, b) in enumerate(zip(self.coefs, self.intercepts)):
+            arrays[f"coef_{i}"] = w
+            arrays[f"intercept_{i}"] = b
+        return arrays
+
+
+def _probe_inputs() -> np.ndarray:
+    rng = np.random.default_rng(17)
+    probe = rng.random((_PROBE_ROWS, len(FEATURE_NAMES)))
+    probe[0] = 0.0
+    probe[1] = 1.0
+    return probe.astype(np.float32)
+
+
+def _check(net: NumpyFusionMLP, probe_x: np.ndarray, probe_y: np.ndarray) -> float:
+    batch_err = float(np.max(np.abs(net.predict(probe_x) - probe_y)))
+    row_err = float(np.max(np.abs(net.predict(probe_x[:1]) - probe_y[:1])))
+    return max(batch_err, row_err)
+
+
+def export_arrays(pipeline, path: Path = _ARRAYS_PATH) -> Path:
+    """Export the trained pipeline to the .npz serving format (plus sklearn probe outputs)."""
+    net = NumpyFusionMLP.from_pipeline(pipeline)
+    probe_x = _probe_inputs()
+    probe_y = np.asarray(pipeline.predict(probe_x), dtype=np.float64)
+    error = _check(net, probe_x, probe_y)
+    if error > _MAX_ABS_ERROR:
+        raise ValueError(f"NumPy forward pass deviates from sklearn by {error:.2e}")
+    np.savez(path, probe_x=probe_x, probe_y=probe_y, **net.arrays())
+    return path
+
+
+def _load_arrays(path: Path = _ARRAYS_PATH) -> Optional[NumpyFusionMLP]:
+    try:
+        with np.load(path, allow_pickle=False) as arrays:
+            net = NumpyFusionMLP.from_arrays(arrays)
+            error = _check(net, arrays["probe_x"], arrays["probe_y"])
+    except Exception as exc:
+        logger.warning("Could not load %s: %s", path.name, exc)
+        return None
+    if error > _MAX_ABS_ERROR:
+        logger.warning("%s deviates from the sklearn reference by %.2e; ignoring it", path.name, error)
+        return None
+    return net
+
+
+def ensure_exported() -> None:
+    """(Re)export the .npz when the pickle is newer, e.g. right after an older training script ran."""
+    if not _MODEL_PATH.exists():
+        return
+    if _ARRAYS_PATH.exists() and _ARRAYS_PATH.stat().st_mtime >= _MODEL_PATH.stat().st_mtime:
+        return
+    try:
+        with open(_MODEL_PATH, "rb") as f:
+            export_arrays(pickle.load(f))
+        logger.info("Exported fusion NN to %s; serving with the NumPy forward pass", _ARRAYS_PATH.name)
+    except Exception as exc:
+        logger.warning("Fusion NN export failed: %s", exc)
+
+
+def load_artifact(path: Path) -> Optional[object]:
+    """Load a fusion model from an .npz (or a pipeline .pkl) without touching the active one."""
+    path = Path(path)
+    if path.suffix == ".npz":
+        return _load_arrays(path)
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as exc:
+        logger.warning("Could not load fusion model %s: %s", path, exc)
+        return None
+
+
+def activate(model: object, info: dict) -> None:
+    """Swap in a new model; in-flight predictions keep the one they already read."""
+    global _active
+    _active = (model, dict(info))
+
+
+def get_active_model() -> tuple[Optional[object], dict]:
+    """(model, info) from one consistent snapshot; info carries version / registry_id."""
+    _load()
+    active = _active
+    return active if active is not None else (None, {})
+
+
 def _load() -> Optional[object]:
-    """Load model from disk (once). Returns None if file not found."""
-    global _model
-    if _model is not None:
-        return _model
-    if _MODEL_PATH.exists():
-        try:
-            with open(_MODEL_PATH, "rb") as f:
-                _model = pickle.load(f)
-        except Exception:
-            _model = None
-    return _model
+    """Load model from disk (once). Returns None if no model has been trained.
+
+    Prefers the exported .npz; a pickle without one is converted on first load.
+    """
+    if _active is not None:
+        return _active[0]
+    ensure_exported()
+    model = _load_arrays() if _ARRAYS_PATH.exists() else None
+    path = _ARRAYS_PATH
+    if model is None and _MODEL_PATH.exists():
+        model, path = load_artifact(_MODEL_PATH), _MODEL_PATH
+    if model is not None and _active is None:
+        activate(model, {"path": str(path), "version": None, "registry_id": None})
+    return _active[0] if _active is not None else None
 
 
 def _safe_float(value, default: float) -> float:
@@ -263,21 +431,32 @@ def build_feature_vector(
                       "has_video": has_video, "has_q": has_q}
 
 
-def predict(feature_vector: list[float]) -> Optional[Dict]:
+def predict_batch(feature_matrix, model: Optional[object] = None) -> Optional[np.ndarray]:
     """
-    Run the NN and return a dict of 5 clamped scores.
-    Returns None if the model file has not been trained yet.
+    Run the NN on an N x 17 matrix in one forward pass.
+    Returns an N x 5 array of clamped scores (OUTPUT_NAMES order), or None
+    if the model file has not been trained yet. ``model`` pins a snapshot
+    taken with get_active_model().
     """
-    model = _load()
+    if model is None:
+        model = _load()
     if model is None:
         return None
 
     try:
-        x = np.array([feature_vector], dtype=np.float32)
-        y = model.predict(x)[0]
-        return {
-            name: float(np.clip(val, 0.0, 1.0))
-            for name, val in zip(OUTPUT_NAMES, y)
-        }
+        x = np.asarray(feature_matrix, dtype=np.float32).reshape(-1, len(FEATURE_NAMES))
+        y = np.asarray(model.predict(x), dtype=np.float64).reshape(len(x), len(OUTPUT_NAMES))
+        return np.clip(y, 0.0, 1.0)
     except Exception:
         return None
+
+
+def predict(feature_vector: list[float]) -> Optional[Dict]:
+    """
+    Run the NN and return a dict of 5 clamped scores.
+    Returns None if the model file has not been trained yet.
+    """
+    y = predict_batch([feature_vector])
+    if y is None:
+        return None
+    return {name: float(val) for name, val in zip(OUTPUT_NAMES, y[0])}
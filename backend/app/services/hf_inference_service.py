@@ -2,39 +2,207 @@
 Shared Hugging Face hosted inference client for MindSentry model pipelines.
 
 This module intentionally uses hosted inference only and does not download
-model weights locally.
+model weights locally. The client keeps one pooled keep-alive connection set
+(sync and async) for all models so requests skip the TCP/TLS handshake.
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
 from typing import Any
 
 import httpx
 
 from app.core.config import get_settings
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.single_flight import AsyncSingleFlight, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+_MAX_RETRY_AFTER_SECONDS = 10.0
 
 
 class HFInferenceError(RuntimeError):
     """Raised when hosted Hugging Face inference cannot be completed."""
 
 
+_RETRY = object()
+
 DEFAULT_TEXT_MODEL = "j-hartmann/emotion-english-distilroberta-base"
 DEFAULT_ASR_MODEL = "openai/whisper-large-v3-turbo"
 DEFAULT_AUDIO_EMOTION_MODEL = "superb/wav2vec2-base-superb-er"
 DEFAULT_FACE_EMOTION_MODEL = "dima806/facial_emotions_image_detection"
 
 
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
 class HuggingFaceInferenceClient:
     def __init__(self) -> None:
         self.settings = get_settings()
         self.base_url = "https://router.huggingface.co/hf-inference/models"
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+        self._client_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "new_connections": 0, "retries": 0, "errors": 0}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._flights = SingleFlight()
+        self._async_flights = AsyncSingleFlight()
+
+    # ── Connection pool ────────────────────────────────────────
+    def _client_kwargs(self) -> dict[str, Any]:
+        settings = self.settings
+        return {
+            "base_url": self.base_url,
+            "headers": {"Authorization": f"Bearer {settings.huggingface_api_key}"},
+            "limits": httpx.Limits(
+                max_connections=settings.huggingface_pool_max_connections,
+                max_keepalive_connections=settings.huggingface_pool_max_keepalive,
+                keepalive_expiry=settings.huggingface_pool_keepalive_seconds,
+            ),
+            "http2": settings.huggingface_http2 and _http2_available(),
+        }
+
+    def _get_client(self) -> httpx.Client:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(**self._client_kwargs())
+        return self._client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            with self._client_lock:
+                if self._async_client is None:
+                    self._async_client = httpx.AsyncClient(**self._client_kwargs())
+        return self._async_client
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    # ── Circuit breakers ───────────────────────────────────────
+    def _breaker(self, model_id: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model_id)
+        if breaker is None:
+            with self._client_lock:
+                breaker = self._breakers.get(model_id)
+                if breaker is None:
+                    settings = self.settings
+                    breaker = CircuitBreaker(
+                        model_id,
+                        failure_threshold=settings.huggingface_breaker_failure_threshold,
+                        open_seconds=settings.huggingface_breaker_open_seconds,
+                        timeout_percentile=settings.huggingface_adaptive_timeout_percentile,
+                        timeout_multiplier=settings.huggingface_adaptive_timeout_multiplier,
+                        min_timeout_seconds=settings.huggingface_adaptive_timeout_min_seconds,
+                    )
+                    self._breakers[model_id] = breaker
+        return breaker
+
+    def circuit_open(self, model_id: str) -> bool:
+        breaker = self._breakers.get(model_id)
+        return breaker.is_open() if breaker is not None else False
+
+    def circuit_states(self) -> dict:
+        return {model_id: breaker.snapshot() for model_id, breaker in sorted(self._breakers.items())}
+
+    def _read_timeout(self, breaker: CircuitBreaker, timeout: float | None) -> float:
+        configured = float(timeout if timeout is not None else self.settings.huggingface_timeout_seconds)
+        if not self.settings.huggingface_adaptive_timeouts:
+            return configured
+        return breaker.timeout(configured)
+
+    # ── Single-flight coalescing ───────────────────────────────
+    def _coalesced_kinds(self) -> set[str]:
+        return {kind.strip() for kind in str(self.settings.huggingface_coalesce_scope or "").split(",") if kind.strip()}
+
+    @staticmethod
+    def _flight_key(kind: str, request: dict[str, Any]) -> str:
+        digest = hashlib.sha256(
+            f"{kind}\0{request['model_id']}\0{request.get('content_type') or ''}\0".encode("utf-8")
+        )
+        if request.get("content") is not None:
+            digest.update(request["content"])
+        if request.get("payload") is not None:
+            digest.update(json.dumps(request["payload"], sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _call(self, kind: str, **request: Any) -> Any:
+        """Run ``_request``, sharing one upstream call among identical concurrent requests."""
+        if kind not in self._coalesced_kinds():
+            return self._request(**request)
+        return self._flights.do(self._flight_key(kind, request), lambda: self._request(**request))
+
+    async def _acall(self, kind: str, **request: Any) -> Any:
+        if kind not in self._coalesced_kinds():
+            return await self._arequest(**request)
+        return await self._async_flights.do(self._flight_key(kind, request), lambda: self._arequest(**request))
+
+    def coalescing_stats(self) -> dict:
+        sync_stats, async_stats = self._flights.stats, self._async_flights.stats
+        return {
+            "scope": sorted(self._coalesced_kinds()),
+            "leaders": sync_stats["leaders"] + async_stats["leaders"],
+            "saved_calls": sync_stats["coalesced"] + async_stats["coalesced"],
+        }
+
+    def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._stats_lock:
+                self.stats["new_connections"] += 1
+
+    async def _atrace(self, event_name: str, info: dict) -> None:
+        self._trace(event_name, info)
+
+    def connection_stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        requests = stats["requests"]
+        stats["reused_connections"] = max(0, requests - stats["new_connections"])
+        stats["reuse_ratio"] = round(stats["reused_connections"] / requests, 4) if requests else None
+        stats["http2"] = bool(self.settings.huggingface_http2 and _http2_available())
+        stats["coalescing"] = self.coalescing_stats()
+        return stats
+
+    def _timeout(self, read: float) -> httpx.Timeout:
+        return httpx.Timeout(read, connect=min(read, self.settings.huggingface_connect_timeout_seconds))
+
+    def _backoff(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """Full-jitter exponential backoff, honouring a short Retry-After when the server sends one."""
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after", ""))
+                return min(_MAX_RETRY_AFTER_SECONDS, max(0.0, retry_after))
+            except ValueError:
+                pass
+        base = float(self.settings.huggingface_retry_backoff_seconds)
+        return random.uniform(0.0, min(_MAX_RETRY_AFTER_SECONDS, base * (2 ** attempt)))
 
     def _headers(self, *, content_type: str | None = None, accept: str | None = "application/json", wait_for_model: bool = False) -> dict[str, str]:
         if not self.settings.huggingface_api_key:
             raise HFInferenceError("HUGGINGFACE_API_KEY not set")
 
-        headers = {
-            "Authorization": f"Bearer {self.settings.huggingface_api_key}",
-        }
+        headers: dict[str, str] = {}
         if content_type:
             headers["Content-Type"] = content_type
         if accept:
@@ -54,44 +222,170 @@ class HuggingFaceInferenceClient:
         timeout: float | None = None,
         wait_for_model: bool = False,
     ) -> Any:
-        timeout = float(timeout if timeout is not None else self.settings.huggingface_timeout_seconds)
         retries = max(0, int(self.settings.huggingface_max_retries))
-        url = f"{self.base_url}/{model_id}"
+        headers = self._headers(content_type=content_type, accept=accept, wait_for_model=wait_for_model)
         last_error: Exception | None = None
 
-        for _ in range(retries + 1):
+        breaker = self._breaker(model_id)
+        retry_counted = False
+
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                last_error = HFInferenceError(f"hf_circuit_open:{model_id}")
+                break
+            response = None
+            settled = False
+            started = time.perf_counter()
             try:
-                response = httpx.post(
-                    url,
-                    headers=self._headers(content_type=content_type, accept=accept, wait_for_model=wait_for_model),
+                with self._stats_lock:
+                    self.stats["requests"] += 1
+                response = self._get_client().post(
+                    f"/{model_id}",
+                    headers=headers,
                     json=payload,
                     content=content,
-                    timeout=timeout,
+                    timeout=self._timeout(self._read_timeout(breaker, timeout)),
+                    extensions={"trace": self._trace},
                 )
-                if response.status_code == 200:
-                    try:
-                        return response.json()
-                    except Exception:
-                        return response.text
-
-                detail = response.text.strip()
-                if response.status_code in (401, 403):
-                    raise HFInferenceError(f"hf_auth_{response.status_code}")
-                if response.status_code == 503:
-                    last_error = HFInferenceError("hf_model_loading")
-                    continue
-                if 400 <= response.status_code < 500:
-                    raise HFInferenceError(f"hf_http_{response.status_code}:{detail[:160]}")
-                last_error = HFInferenceError(f"hf_http_{response.status_code}:{detail[:160]}")
-            except HFInferenceError as exc:
+                result = self._handle_response(response)
+                settled = True
+                if result is not _RETRY:
+                    breaker.record_success(time.perf_counter() - started)
+                    return result
+                # A loading or overloaded model answers 503/429 to every retry: one failure per request
+                if retry_counted:
+                    breaker.release()
+                else:
+                    breaker.record_failure()
+                    retry_counted = True
+                last_error = self._retry_error(response)
+            except HFInferenceError:
+                # Auth/4xx: the endpoint is up, the request is wrong — not a breaker failure.
+                settled = True
+                breaker.record_success()
+                raise
+            except httpx.TimeoutException as exc:
+                # Feed the timeout into the latency window so a slow endpoint can raise its own budget
+                settled = True
+                breaker.record_failure(time.perf_counter() - started)
                 last_error = exc
             except Exception as exc:
+                # Transport errors, undecodable responses, bad arguments: fail the attempt, never leak raw
+                settled = True
+                breaker.record_failure()
                 last_error = exc
+            finally:
+                if not settled:
+                    # Cancelled: settle anyway or a half-open probe blocks the model for good
+                    breaker.record_failure()
+            if attempt < retries:
+                with self._stats_lock:
+                    self.stats["retries"] += 1
+                time.sleep(self._backoff(attempt, response))
 
+        with self._stats_lock:
+            self.stats["errors"] += 1
         raise HFInferenceError(str(last_error or "hf_inference_failed"))
 
-    def text_classification(self, text: str, *, model_id: str | None = None) -> Any:
-        return self._request(
+    async def _arequest(
+        self,
+        *,
+        model_id: str,
+        payload: Any = None,
+        content: bytes | None = None,
+        content_type: str | None = None,
+        accept: str | None = "application/json",
+        timeout: float | None = None,
+        wait_for_model: bool = False,
+    ) -> Any:
+        """Async twin of ``_request`` sharing the same retry policy and stats."""
+        retries = max(0, int(self.settings.huggingface_max_retries))
+        headers = self._headers(content_type=content_type, accept=accept, wait_for_model=wait_for_model)
+        last_error: Exception | None = None
+
+        breaker = self._breaker(model_id)
+        retry_counted = False
+
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                last_error = HFInferenceError(f"hf_circuit_open:{model_id}")
+                break
+            response = None
+            settled = False
+            started = time.perf_counter()
+            try:
+                with self._stats_lock:
+                    self.stats["requests"] += 1
+                response = await self._get_async_client().post(
+                    f"/{model_id}",
+                    headers=headers,
+                    json=payload,
+                    content=content,
+                    timeout=self._timeout(self._read_timeout(breaker, timeout)),
+                    extensions={"trace": self._atrace},
+                )
+                result = self._handle_response(response)
+                settled = True
+                if result is not _RETRY:
+                    breaker.record_success(time.perf_counter() - started)
+                    return result
+                # A loading or overloaded model answers 503/429 to every retry: one failure per request
+                if retry_counted:
+                    breaker.release()
+                else:
+                    breaker.record_failure()
+                    retry_counted = True
+                last_error = self._retry_error(response)
+            except HFInferenceError:
+                # Auth/4xx: the endpoint is up, the request is wrong — not a breaker failure.
+                settled = True
+                breaker.record_success()
+                raise
+            except httpx.TimeoutException as exc:
+                # Feed the timeout into the latency window so a slow endpoint can raise its own budget
+                settled = True
+                breaker.record_failure(time.perf_counter() - started)
+                last_error = exc
+            except Exception as exc:
+                # Transport errors, undecodable responses, bad arguments: fail the attempt, never leak raw
+                settled = True
+                breaker.record_failure()
+                last_error = exc
+            finally:
+                if not settled:
+                    # Cancelled: settle anyway or a half-open probe blocks the model for good
+                    breaker.record_failure()
+            if attempt < retries:
+                with self._stats_lock:
+                    self.stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt, response))
+
+        with self._stats_lock:
+            self.stats["errors"] += 1
+        raise HFInferenceError(str(last_error or "hf_inference_failed"))
+
+    @staticmethod
+    def _handle_response(response: httpx.Response) -> Any:
+        if response.status_code == 200:
+            try:
+                return response.json()
+            except Exception:
+                return response.text
+        if response.status_code in (401, 403):
+            raise HFInferenceError(f"hf_auth_{response.status_code}")
+        if response.status_code in _RETRYABLE_STATUS:
+            return _RETRY
+        raise HFInferenceError(f"hf_http_{response.status_code}:{response.text.strip()[:160]}")
+
+    @staticmethod
+    def _retry_error(response: httpx.Response) -> HFInferenceError:
+        if response.status_code == 503:
+            return HFInferenceError("hf_model_loading")
+        return HFInferenceError(f"hf_http_{response.status_code}:{response.text.strip()[:160]}")
+
+    def text_classification(self, text: str | list[str], *, model_id: str | None = None) -> Any:
+        return self._call(
+            "text",
             model_id=model_id or self.settings.huggingface_text_model,
             payload={"inputs": text, "options": {"wait_for_model": True}},
             timeout=self.settings.huggingface_text_timeout_seconds,
@@ -104,7 +398,8 @@ class HuggingFaceInferenceClient:
         content_type: str,
         model_id: str | None = None,
     ) -> Any:
-        return self._request(
+        return self._call(
+            "asr",
             model_id=model_id or self.settings.huggingface_asr_model,
             content=audio_bytes,
             content_type=content_type,
@@ -118,7 +413,8 @@ class HuggingFaceInferenceClient:
         content_type: str,
         model_id: str | None = None,
     ) -> Any:
-        return self._request(
+        return self._call(
+            "audio_emotion",
             model_id=model_id or self.settings.huggingface_audio_emotion_model,
             content=audio_bytes,
             content_type=content_type,
@@ -132,7 +428,63 @@ class HuggingFaceInferenceClient:
         *,
         model_id: str | None = None,
     ) -> Any:
-        return self._request(
+        return self._call(
+            "face",
+            model_id=model_id or self.settings.huggingface_face_emotion_model,
+            content=image_bytes,
+            content_type="image/jpeg",
+            timeout=self.settings.huggingface_face_timeout_seconds,
+            wait_for_model=True,
+        )
+
+    # ── Async twins (used by the async upload endpoints) ───────
+    async def atext_classification(self, text: str | list[str], *, model_id: str | None = None) -> Any:
+        return await self._acall(
+            "text",
+            model_id=model_id or self.settings.huggingface_text_model,
+            payload={"inputs": text, "options": {"wait_for_model": True}},
+            timeout=self.settings.huggingface_text_timeout_seconds,
+        )
+
+    async def aautomatic_speech_recognition(
+        self,
+        audio_bytes: bytes,
+        *,
+        content_type: str,
+        model_id: str | None = None,
+    ) -> Any:
+        return await self._acall(
+            "asr",
+            model_id=model_id or self.settings.huggingface_asr_model,
+            content=audio_bytes,
+            content_type=content_type,
+            timeout=self.settings.huggingface_asr_timeout_seconds,
+        )
+
+    async def aaudio_classification(
+        self,
+        audio_bytes: bytes,
+        *,
+        content_type: str,
+        model_id: str | None = None,
+    ) -> Any:
+        return await self._acall(
+            "audio_emotion",
+            model_id=model_id or self.settings.huggingface_audio_emotion_model,
+            content=audio_bytes,
+            content_type=content_type,
+            timeout=self.settings.huggingface_audio_emotion_timeout_seconds,
+            wait_for_model=True,
+        )
+
+    async def aimage_classification(
+        self,
+        image_bytes: bytes,
+        *,
+        model_id: str | None = None,
+    ) -> Any:
+        return await self._acall(
+            "face",
             model_id=model_id or self.settings.huggingface_face_emotion_model,
             content=image_bytes,
             content_type="image/jpeg",
@@ -149,3 +501,16 @@ def get_hf_client() -> HuggingFaceInferenceClient:
     if _client is None:
         _client = HuggingFaceInferenceClient()
     return _client
+
+
+def get_hf_circuit_states() -> dict:
+    return _client.circuit_states() if _client is not None else {}
+
+
+def get_hf_connection_stats() -> dict:
+    return _client.connection_stats() if _client is not None else {"requests": 0}
+
+
+async def close_hf_client() -> None:
+    if _client is not None:
+        await _client.aclose()
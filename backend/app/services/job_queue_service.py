@@ -0,0 +1,247 @@
+"""Durable analysis job queue on the application database.
+
+API nodes ``enqueue`` work and return the job id; ``worker.py`` processes
+``claim`` jobs with a single conditional ``UPDATE ... RETURNING``, so two
+workers can never lease the same job. A lease lasts ``job_lease_seconds`` and
+is extended by heartbeats while the handler runs; if a worker dies the lease
+expires and the job becomes claimable again. Failures are retried with
+exponential backoff until ``max_attempts``, then the job is marked failed.
+Higher ``priority`` runs first.
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import and_, or_, update
+from sqlmodel import Session, select
+
+from app.core.config import get_settings
+from app.core.database import engine
+from app.models.analysis_job import AnalysisJob
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+JOB_TYPES = ("analyse_text", "analyse_audio", "analyse_video", "analyse_frames", "run_analysis")
+
+# Cheap jobs first so a queue of long videos doesn't hold up text and fusion
+DEFAULT_PRIORITIES = {
+    "run_analysis": 30,
+    "analyse_text": 20,
+    "analyse_audio": 10,
+    "analyse_frames": 10,
+    "analyse_video": 0,
+}
+
+
+def _now(offset_seconds: float = 0.0) -> str:
+    return (datetime.utcnow() + timedelta(seconds=offset_seconds)).isoformat()
+
+
+def enqueue(
+    job_type: str,
+    assessment_id: str,
+    user_id: int,
+    payload: Optional[dict] = None,
+    priority: Optional[int] = None,
+) -> AnalysisJob:
+    if job_type not in JOB_TYPES:
+        raise ValueError(f"unknown job type {job_type!r}")
+    job = AnalysisJob(
+        job_type=job_type,
+        assessment_id=assessment_id,
+        user_id=user_id,
+        payload_json=json.dumps(payload or {}),
+        priority=DEFAULT_PRIORITIES[job_type] if priority is None else priority,
+        max_attempts=get_settings().job_max_attempts,
+        available_at=_now(),
+    )
+    with Session(engine) as session:
+        with session.begin():
+            session.add(job)
+        session.refresh(job)
+        session.expunge(job)
+    return job
+
+
+def _claimable(now: str):
+    return or_(
+        and_(AnalysisJob.status == QUEUED, AnalysisJob.available_at <= now),
+        and_(
+            AnalysisJob.status == RUNNING,
+            AnalysisJob.lease_expires_at < now,
+            AnalysisJob.attempts < AnalysisJob.max_attempts,
+        ),
+    )
+
+
+def claim(worker_id: str, job_types: Optional[Iterable[str]] = None) -> Optional[dict]:
+    """Lease the next runnable job for ``worker_id``; None when the queue is empty."""
+    now = _now()
+    candidate = select(AnalysisJob.id).where(_claimable(now))
+    if job_types:
+        candidate = candidate.where(AnalysisJob.job_type.in_(list(job_types)))
+    candidate = (
+        candidate.order_by(AnalysisJob.priority.desc(), AnalysisJob.available_at)
+        .limit(1)
+        .scalar_subquery()
+    )
+    with Session(engine) as session:
+        with session.begin():
+            row = session.execute(
+                update(AnalysisJob)
+                .where(AnalysisJob.id == candidate)
+                .where(_claimable(now))
+                .values(
+                    status=RUNNING,
+                    lease_owner=worker_id,
+                    lease_expires_at=_now(get_settings().job_lease_seconds),
+                    attempts=AnalysisJob.attempts + 1,
+                    started_at=now,
+                )
+                .returning(
+                    AnalysisJob.id, AnalysisJob.job_type, AnalysisJob.assessment_id, AnalysisJob.user_id,
+                    AnalysisJob.payload_json, AnalysisJob.attempts, AnalysisJob.max_attempts,
+                )
+                .execution_options(synchronize_session=False)
+            ).first()
+    if row is None:
+        return None
+    return {
+        "id": row.id,
+        "job_type": row.job_type,
+        "assessment_id": row.assessment_id,
+        "user_id": row.user_id,
+        "payload": json.loads(row.payload_json) if row.payload_json else {},
+        "attempts": row.attempts,
+        "max_attempts": row.max_attempts,
+    }
+
+
+def _update_leased(job_id: str, worker_id: str, **values) -> bool:
+    """Apply ``values`` only while ``worker_id`` still holds the lease."""
+    with Session(engine) as session:
+        with session.begin():
+            result = session.execute(
+                update(AnalysisJob)
+                .where(AnalysisJob.id == job_id)
+                .where(AnalysisJob.lease_owner == worker_id)
+                .where(AnalysisJob.status == RUNNING)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+    return result.rowcount > 0
+
+
+def heartbeat(job_id: str, worker_id: str) -> bool:
+    """Extend the lease; False means it expired and another worker may own the job now."""
+    return _update_leased(job_id, worker_id, lease_expires_at=_now(get_settings().job_lease_seconds))
+
+
+def complete(job_id: str, worker_id: str, result: Optional[dict] = None) -> bool:
+    return _update_leased(
+        job_id, worker_id,
+        status=SUCCEEDED,
+        result_json=json.dumps(result or {}, default=str),
+        error=None,
+        lease_owner=None,
+        lease_expires_at=None,
+        finished_at=_now(),
+    )
+
+
+def fail(job: dict, worker_id: str, error: str) -> bool:
+    """Schedule a retry with exponential backoff, or mark the job failed when attempts are used up."""
+    if job["attempts"] < job["max_attempts"]:
+        delay = get_settings().job_retry_backoff_seconds * (2 ** (job["attempts"] - 1))
+        return _update_leased(
+            job["id"], worker_id,
+            status=QUEUED,
+            error=error[:2000],
+            available_at=_now(delay),
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+    return _update_leased(
+        job["id"], worker_id,
+        status=FAILED,
+        error=error[:2000],
+        lease_owner=None,
+        lease_expires_at=None,
+        finished_at=_now(),
+    )
+
+
+def reap_expired() -> int:
+    """Fail running jobs whose lease expired on their last allowed attempt."""
+    now = _now()
+    with Session(engine) as session:
+        with session.begin():
+            result = session.execute(
+                update(AnalysisJob)
+                .where(AnalysisJob.status == RUNNING)
+                .where(AnalysisJob.lease_expires_at < now)
+                .where(AnalysisJob.attempts >= AnalysisJob.max_attempts)
+                .values(
+                    status=FAILED,
+                    error="lease expired on the final attempt (worker lost)",
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    finished_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+    return result.rowcount
+
+
+def job_to_dict(job: AnalysisJob) -> dict[str, Any]:
+    result = None
+    if job.result_json:
+        try:
+            result = json.loads(job.result_json)
+        except Exception:
+            result = None
+    return {
+        "id": job.id,
+        "job_type": job.job_type,
+        "assessment_id": job.assessment_id,
+        "status": job.status,
+        "priority": job.priority,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error": job.error,
+        "result": result,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def get_job(session: Session, job_id: str, user_id: int) -> Optional[AnalysisJob]:
+    return session.exec(
+        select(AnalysisJob)
+        .where(AnalysisJob.id == job_id)
+        .where(AnalysisJob.user_id == user_id)
+    ).first()
+
+
+def assessment_jobs(session: Session, assessment_id: str, user_id: int) -> list[AnalysisJob]:
+    return list(session.exec(
+        select(AnalysisJob)
+        .where(AnalysisJob.assessment_id == assessment_id)
+        .where(AnalysisJob.user_id == user_id)
+        .order_by(AnalysisJob.created_at)
+    ).all())
+
+
+def queued_response(job: AnalysisJob) -> dict[str, Any]:
+    """Body returned by endpoints that accepted work onto the queue (HTTP 202)."""
+    return {
+        **job_to_dict(job),
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/assessment/{job.assessment_id}/events",
+    }
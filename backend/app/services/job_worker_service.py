@@ -0,0 +1,166 @@
+"""Analysis worker loop for the durable job queue.
+
+``run_worker`` runs ``concurrency`` slots in one process. Each slot claims a
+job, runs its handler while a heartbeat keeps the lease alive, then completes
+or fails it (failures are retried by the queue). Handlers reuse the same
+processing functions the upload endpoints call inline, so queued and inline
+results are identical. Start it with ``python worker.py``; API nodes only
+enqueue, so the two scale independently.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Callable, Iterable, Optional
+
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.database import engine
+from app.models.assessment import Assessment
+from app.services import job_queue_service
+
+logger = logging.getLogger(__name__)
+
+
+async def _analyse_text(job: dict) -> dict:
+    from app.api.text_analysis import process_text
+
+    payload = job["payload"]
+
+    def _run() -> dict:
+        with Session(engine) as session:
+            entry = process_text(
+                session, job["assessment_id"], job["user_id"], payload["raw_text"],
+                payload.get("language", "en"), scan_safety=not payload.get("safety_scanned"), job_id=job["id"],
+            )
+            return {"text_entry_id": entry.id}
+
+    return await asyncio.to_thread(_run)
+
+
+async def _analyse_audio(job: dict) -> dict:
+    from app.api.audio_analysis import process_audio
+
+    with Session(engine) as session:
+        recording = await process_audio(session, job["assessment_id"], job["user_id"], job["payload"]["storage_key"])
+        return {"audio_recording_id": recording.id}
+
+
+async def _analyse_video(job: dict) -> dict:
+    from app.api.video_analysis import process_video
+
+    with Session(engine) as session:
+        recording = await process_video(session, job["assessment_id"], job["user_id"], job["payload"]["storage_key"])
+        return {"video_recording_id": recording.id}
+
+
+async def _analyse_frames(job: dict) -> dict:
+    from app.api.video_analysis import process_frames
+
+    payload = job["payload"]
+    with Session(engine) as session:
+        recording = await process_frames(
+            session, job["assessment_id"], job["user_id"], payload["storage_key"], payload["timestamps"],
+        )
+        return {"video_recording_id": recording.id}
+
+
+async def _run_analysis(job: dict) -> dict:
+    from app.api.analysis import analyse_assessment
+
+    def _run() -> dict:
+        with Session(engine) as session:
+            assessment = session.get(Assessment, job["assessment_id"])
+            if not assessment or assessment.user_id != job["user_id"]:
+                raise LookupError(f"assessment {job['assessment_id']} not found")
+            result = analyse_assessment(session, assessment, job["user_id"])
+            return {
+                "cache": "hit" if isinstance(result, str) else "miss",
+                "result_url": f"/analysis/result/{job['assessment_id']}",
+            }
+
+    return await asyncio.to_thread(_run)
+
+
+HANDLERS: dict[str, Callable[[dict], Awaitable[dict]]] = {
+    "analyse_text": _analyse_text,
+    "analyse_audio": _analyse_audio,
+    "analyse_video": _analyse_video,
+    "analyse_frames": _analyse_frames,
+    "run_analysis": _run_analysis,
+}
+
+
+async def _heartbeat(job: dict, owner: str) -> None:
+    interval = max(1.0, get_settings().job_lease_seconds / 3)
+    while True:
+        await asyncio.sleep(interval)
+        if not await asyncio.to_thread(job_queue_service.heartbeat, job["id"], owner):
+            logger.warning("Lost the lease on job %s (%s); its result will be discarded", job["id"], job["job_type"])
+            return
+
+
+async def _process(job: dict, owner: str) -> None:
+    logger.info("Job %s (%s, attempt %d/%d) started", job["id"], job["job_type"], job["attempts"], job["max_attempts"])
+    heartbeat = asyncio.create_task(_heartbeat(job, owner))
+    try:
+        result = await HANDLERS[job["job_type"]](job)
+    except Exception as exc:
+        logger.warning("Job %s (%s) failed: %s", job["id"], job["job_type"], exc, exc_info=True)
+        await asyncio.to_thread(job_queue_service.fail, job, owner, f"{type(exc).__name__}: {exc}")
+        return
+    finally:
+        heartbeat.cancel()
+    await asyncio.to_thread(job_queue_service.complete, job["id"], owner, result)
+    logger.info("Job %s (%s) succeeded", job["id"], job["job_type"])
+
+
+async def _slot(owner: str, job_types: Optional[list[str]], stop: asyncio.Event) -> None:
+    poll = get_settings().job_poll_interval_seconds
+    while not stop.is_set():
+        try:
+            job = await asyncio.to_thread(job_queue_service.claim, owner, job_types)
+        except Exception as exc:
+            logger.error("Claiming a job failed: %s", exc, exc_info=True)
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await _process(job, owner)
+
+
+async def _reaper(stop: asyncio.Event) -> None:
+    interval = get_settings().job_lease_seconds
+    while not stop.is_set():
+        try:
+            reaped = await asyncio.to_thread(job_queue_service.reap_expired)
+            if reaped:
+                logger.warning("Marked %d abandoned job(s) as failed", reaped)
+        except Exception as exc:
+            logger.error("Reaping expired jobs failed: %s", exc, exc_info=True)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_worker(stop: asyncio.Event, concurrency: Optional[int] = None, job_types: Optional[Iterable[str]] = None) -> None:
+    """Process jobs until ``stop`` is set; in-flight jobs are finished before returning."""
+    concurrency = concurrency or get_settings().worker_concurrency
+    types = list(job_types) if job_types else None
+    unknown = set(types or ()) - set(HANDLERS)
+    if unknown:
+        raise ValueError(f"unknown job types: {', '.join(sorted(unknown))}")
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info("Worker %s started: %d slot(s), job types %s", worker_id, concurrency, types or "all")
+    await asyncio.gather(
+        _reaper(stop),
+        *(_slot(f"{worker_id}:{i}", types, stop) for i in range(concurrency)),
+    )
+    logger.info("Worker %s stopped", worker_id)
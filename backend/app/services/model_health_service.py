@@ -1,10 +1,17 @@
-"""Startup health checks for hosted Hugging Face model endpoints."""
+"""Health checks for hosted Hugging Face model endpoints.
+
+Probes run concurrently under one global deadline, first in the background
+after startup and then periodically, refreshing the cached report.
+"""
 from __future__ import annotations
 
 import io
 import logging
+import time
 import wave
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass, asdict
+from datetime import datetime
 
 from app.core.config import get_settings
 from app.services.audio_inference_service import set_preferred_audio_model
@@ -140,13 +147,39 @@ def _probe_face_model() -> ModelProbeResult:
 
 
 def run_startup_model_health_checks() -> dict:
-    """Probe hosted models once at startup and cache the result."""
+    """Probe all hosted models concurrently and cache the result.
+
+    Probes still running when ``model_health_deadline_seconds`` expires are
+    reported as "timeout"; their threads finish in the background.
+    """
     global _LAST_MODEL_HEALTH
+    settings = get_settings()
+    started = time.perf_counter()
+
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="model-health")
+    futures = {
+        "text": executor.submit(_probe_text_model),
+        "asr": executor.submit(_probe_asr_model),
+        "audio": executor.submit(_probe_audio_models),
+        "face": executor.submit(_probe_face_model),
+    }
+    wait(list(futures.values()), timeout=float(settings.model_health_deadline_seconds))
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    def _result(name: str, model_name: str):
+        future = futures[name]
+        if not future.done():
+            return ModelProbeResult(model_name, "timeout", f"exceeded {settings.model_health_deadline_seconds}s deadline")
+        try:
+            return future.result()
+        except Exception as exc:
+            return ModelProbeResult(model_name, "error", str(exc))
 
-    text = _probe_text_model()
-    asr = _probe_asr_model()
-    audio, preferred_audio_model = _probe_audio_models()
-    face = _probe_face_model()
+    text = _result("text", settings.huggingface_text_model)
+    asr = _result("asr", settings.huggingface_asr_model)
+    audio_outcome = _result("audio", settings.huggingface_audio_emotion_model)
+    audio, preferred_audio_model = audio_outcome if isinstance(audio_outcome, tuple) else (audio_outcome, None)
+    face = _result("face", settings.huggingface_face_emotion_model)
 
     report = ModelHealthReport(
         text=text,
@@ -156,12 +189,15 @@ def run_startup_model_health_checks() -> dict:
         preferred_audio_model=preferred_audio_model,
     )
     _LAST_MODEL_HEALTH = {
-        "text": asdict(text),
-        "asr": asdict(asr),
-        "audio": asdict(audio),
-        "face": asdict(face),
-        "preferred_audio_model": preferred_audio_model,
+        "text": asdict(report.text),
+        "asr": asdict(report.asr),
+        "audio": asdict(report.audio),
+        "face": asdict(report.face),
+        "preferred_audio_model": report.preferred_audio_model,
+        "checked_at": datetime.utcnow().isoformat(),
+        "duration_ms": int((time.perf_counter() - started) * 1000),
     }
+    logger.info("Model health checks finished in %dms", _LAST_MODEL_HEALTH["duration_ms"])
     return _LAST_MODEL_HEALTH
 
 
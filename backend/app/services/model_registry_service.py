@@ -0,0 +1,171 @@
+"""Versioned activation and hot reload of the fusion NN and risk calibrator.
+
+Each trained artifact is content-hashed, copied to ``ml_models/versions/`` and
+recorded in ``model_registry``; the row with ``active = 1`` is what serves.
+``sync_models`` (polled from the lifespan) registers and activates freshly
+trained files, loads whichever version is active in a worker thread and swaps
+it in atomically — no restart, so the HF pipelines stay loaded.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import shutil
+import threading
+from pathlib import Path
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models.model_registry import ModelRegistry
+from app.services import fusion_nn, risk_calibration_service
+
+logger = logging.getLogger(__name__)
+
+_VERSIONS_DIR = fusion_nn._MODEL_PATH.parent / "versions"
+
+_ARTIFACTS = {
+    "fusion_nn": {
+        "path": fusion_nn._ARRAYS_PATH,
+        "family": "fusion_mlp",
+        "framework": "numpy",
+        "prepare": fusion_nn.ensure_exported,
+        "load": fusion_nn.load_artifact,
+        "activate": fusion_nn.activate,
+        "info": lambda: fusion_nn.get_active_model()[1],
+    },
+    "risk_calibration": {
+        "path": risk_calibration_service._MODEL_PATH,
+        "family": "isotonic_calibration",
+        "framework": "sklearn",
+        "prepare": None,
+        "load": risk_calibration_service.load_artifact,
+        "activate": risk_calibration_service.activate,
+        "info": risk_calibration_service.active_calibrator_info,
+    },
+}
+
+_sync_lock = threading.Lock()
+_seen_signatures: dict[str, tuple[int, int]] = {}
+
+
+def artifact_version(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def _set_active(session: Session, model_name: str, row: ModelRegistry) -> None:
+    for other in session.exec(select(ModelRegistry).where(ModelRegistry.model_name == model_name)).all():
+        other.active = 1 if other.id == row.id else 0
+
+
+def _register(session: Session, model_name: str, spec: dict) -> None:
+    """Record the artifact currently on disk; a version seen for the first time becomes active."""
+    path: Path = spec["path"]
+    version = artifact_version(path)
+    exists = session.exec(
+        select(ModelRegistry)
+        .where(ModelRegistry.model_name == model_name)
+        .where(ModelRegistry.version == version)
+    ).first()
+    if exists:
+        return
+
+    _VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    stored = _VERSIONS_DIR / f"{path.stem}-{version}{path.suffix}"
+    shutil.copy2(path, stored)
+    row = ModelRegistry(
+        model_name=model_name,
+        model_family=spec["family"],
+        modality_scope="multimodal",
+        version=version,
+        framework=spec["framework"],
+        source=str(stored),
+        active=0,
+    )
+    try:
+        with session.begin_nested():
+            session.add(row)
+    except IntegrityError:
+        # The API and every worker sync on their own; another process registered it first
+        logger.info("%s version %s was registered concurrently", model_name, version)
+        return
+    _set_active(session, model_name, row)
+    logger.info("Registered %s version %s", model_name, version)
+
+
+def _active_row(model_name: str) -> ModelRegistry | None:
+    with Session(engine) as session:
+        return session.exec(
+            select(ModelRegistry)
+            .where(ModelRegistry.model_name == model_name)
+            .where(ModelRegistry.active == 1)
+            .order_by(ModelRegistry.created_at.desc())
+        ).first()
+
+
+def _sync_one(model_name: str, spec: dict) -> None:
+    if spec["prepare"] is not None:
+        spec["prepare"]()
+    path: Path = spec["path"]
+    if path.exists():
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if _seen_signatures.get(model_name) != signature:
+            with Session(engine) as session:
+                with session.begin():
+                    _register(session, model_name, spec)
+            _seen_signatures[model_name] = signature
+
+    row = _active_row(model_name)
+    if row is None:
+        return
+    info = spec["info"]()
+    if info.get("registry_id") == row.id:
+        return
+    loaded = spec["load"](Path(row.source or path))
+    if loaded is None:
+        logger.warning("Active %s version %s could not be loaded; keeping the current one", model_name, row.version)
+        return
+    spec["activate"](loaded, {"path": row.source, "version": row.version, "registry_id": row.id})
+    logger.info("Activated %s version %s", model_name, row.version)
+
+
+def sync_models() -> dict:
+    """Register new artifacts and hot-swap whatever version is active. Safe to call repeatedly."""
+    with _sync_lock:
+        for model_name, spec in _ARTIFACTS.items():
+            try:
+                _sync_one(model_name, spec)
+            except Exception as exc:
+                logger.warning("Model registry sync for %s failed: %s", model_name, exc)
+    return get_model_versions()
+
+
+def activate_model_version(model_name: str, version: str) -> dict:
+    """Make a registered version the active one (e.g. roll back) and load it now."""
+    if model_name not in _ARTIFACTS:
+        raise ValueError(f"unknown model {model_name!r}")
+    with Session(engine) as session:
+        with session.begin():
+            row = session.exec(
+                select(ModelRegistry)
+                .where(ModelRegistry.model_name == model_name)
+                .where(ModelRegistry.version == version)
+            ).first()
+            if row is None:
+                raise ValueError(f"{model_name} version {version!r} is not registered")
+            _set_active(session, model_name, row)
+    return sync_models()
+
+
+def get_model_versions() -> dict:
+    versions = {}
+    for model_name, spec in _ARTIFACTS.items():
+        info = spec["info"]()
+        versions[model_name] = {"version": info.get("version"), "registry_id": info.get("registry_id")}
+    return versions
@@ -0,0 +1,197 @@
+"""Replay detection – perceptual fingerprints for uploaded media.
+
+Photos and sampled video frames get a 64-bit DCT perceptual hash of the face
+crop; canonical WAVs get a 64-bit band-energy fingerprint. Hashes are stored
+in ``media_fingerprints`` with four indexed 16-bit chunks, so a near-duplicate
+lookup (Hamming distance <= 3) only touches rows sharing at least one exact
+chunk — by pigeonhole, any hash within 3 bits must match one of the 4 chunks.
+The distance check runs on every such row (only id, time and hash are read)
+before anything is capped, so a crowded chunk cannot hide a real replay.
+"""
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import or_
+from sqlmodel import Session, select
+
+from app.core.config import get_settings
+from app.models.media_fingerprint import MediaFingerprint
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_COUNT = 4
+_CHUNK_BITS = 16
+_MAX_PIGEONHOLE_DISTANCE = _CHUNK_COUNT - 1
+_MAX_MATCHES = 500
+_MIN_HASH_BITS = 8          # near-constant images hash to (almost) all zeros; never match on those
+_REPLAY_SPOOF_RISK = 0.35
+
+_AUDIO_SEGMENTS = 9
+_AUDIO_BANDS = 9
+_AUDIO_MIN_SECONDS = 1.0
+
+
+def image_phash(image_bgr) -> str | None:
+    """64-bit DCT perceptual hash of a BGR image, as 16 hex chars."""
+    import cv2
+    import numpy as np
+
+    if image_bgr is None or getattr(image_bgr, "size", 0) == 0:
+        return None
+    gray = image_bgr if image_bgr.ndim == 2 else cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].flatten()
+    bits = low > np.median(low[1:])
+    bits[0] = False  # DC term only tracks overall brightness
+    return _bits_to_hex(bits)
+
+
+def audio_fingerprint(audio_np, sr: int) -> str | None:
+    """64-bit fingerprint from band-energy differences across time and frequency.
+
+    The clip is cut into 9 segments and 9 log-spaced bands (80 Hz – 4 kHz);
+    each bit is the sign of the energy difference between neighbouring bands,
+    compared with the previous segment. Survives re-encoding and gain changes.
+    """
+    import numpy as np
+
+    if sr <= 0 or len(audio_np) < sr * _AUDIO_MIN_SECONDS:
+        return None
+
+    edges = np.geomspace(80.0, min(4000.0, sr / 2.0), _AUDIO_BANDS + 1)
+    energies = np.zeros((_AUDIO_SEGMENTS, _AUDIO_BANDS), dtype=np.float64)
+    for i, segment in enumerate(np.array_split(np.asarray(audio_np, dtype=np.float64), _AUDIO_SEGMENTS)):
+        spectrum = np.abs(np.fft.rfft(segment * np.hanning(len(segment)))) ** 2
+        freqs = np.fft.rfftfreq(len(segment), 1.0 / sr)
+        band_index = np.digitize(freqs, edges) - 1
+        valid = (band_index >= 0) & (band_index < _AUDIO_BANDS)
+        energies[i] = np.bincount(band_index[valid], weights=spectrum[valid], minlength=_AUDIO_BANDS)
+
+    log_energy = np.log(energies + 1e-10)
+    band_diff = log_energy[:, :-1] - log_energy[:, 1:]
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+    return _bits_to_hex(bits.flatten())
+
+
+def _bits_to_hex(bits) -> str | None:
+    if int(bits.sum()) < _MIN_HASH_BITS:
+        return None
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bool(bit))
+    return f"{value:016x}"
+
+
+def _to_signed(value: int) -> int:
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _chunks(value: int) -> list[int]:
+    mask = (1 << _CHUNK_BITS) - 1
+    return [(value >> (_CHUNK_BITS * i)) & mask for i in range(_CHUNK_COUNT)]
+
+
+def _max_distance() -> int:
+    # Larger distances would need more, smaller chunks to keep the exact-chunk guarantee.
+    return max(0, min(int(get_settings().replay_hash_max_distance), _MAX_PIGEONHOLE_DISTANCE))
+
+
+def find_near_duplicates(session: Session, modality: str, hash_hex: str, exclude_assessment_id: str) -> list[MediaFingerprint]:
+    """Stored fingerprints within the Hamming radius, ignoring the current assessment."""
+    value = int(hash_hex, 16)
+    c0, c1, c2, c3 = _chunks(value)
+    candidates = session.exec(
+        select(MediaFingerprint.id, MediaFingerprint.created_at, MediaFingerprint.hash_value)
+        .where(MediaFingerprint.modality_type == modality)
+        .where(MediaFingerprint.assessment_id != exclude_assessment_id)
+        .where(or_(
+            MediaFingerprint.chunk0 == c0,
+            MediaFingerprint.chunk1 == c1,
+            MediaFingerprint.chunk2 == c2,
+            MediaFingerprint.chunk3 == c3,
+        ))
+    ).all()
+    max_distance = _max_distance()
+    matched = sorted(
+        ((created_at or "", row_id) for row_id, created_at, stored in candidates
+         if bin(value ^ (stored & ((1 << 64) - 1))).count("1") <= max_distance),
+        reverse=True,
+    )
+    if not matched:
+        return []
+    if len(matched) > _MAX_MATCHES:
+        logger.info("%d stored %s fingerprints match; keeping the %d most recent", len(matched), modality, _MAX_MATCHES)
+    ids = [row_id for _, row_id in matched[:_MAX_MATCHES]]
+    return list(session.exec(
+        select(MediaFingerprint)
+        .where(MediaFingerprint.id.in_(ids))
+        .order_by(MediaFingerprint.created_at.desc())
+    ).all())
+
+
+def record_fingerprints(session: Session, modality: str, hash_kind: str, hashes: list[str], assessment_id: str, user_id: int) -> None:
+    for hash_hex in hashes:
+        value = int(hash_hex, 16)
+        c0, c1, c2, c3 = _chunks(value)
+        session.add(MediaFingerprint(
+            assessment_id=assessment_id,
+            user_id=user_id,
+            modality_type=modality,
+            hash_kind=hash_kind,
+            hash_value=_to_signed(value),
+            chunk0=c0,
+            chunk1=c1,
+            chunk2=c2,
+            chunk3=c3,
+        ))
+
+
+def apply_replay_check(session: Session, result: dict, modality: str, assessment_id: str, user_id: int) -> dict:
+    """Flag ``result`` when its fingerprints match earlier uploads, then store them.
+
+    Video needs at least half of its hashed frames to match; a photo or audio
+    clip has a single hash. Adds ``replayed_media`` to the modality integrity
+    flags and raises its spoof risk.
+    """
+    if not get_settings().replay_detection_enabled:
+        return result
+    hashes = [h for h in result.get("fingerprints") or [] if h]
+    if not hashes:
+        return result
+
+    prefix = "video" if modality == "video" else "audio"
+    hash_kind = "phash" if modality == "video" else "audio_fp"
+    try:
+        matched_hashes = 0
+        matched_users: set[int] = set()
+        for hash_hex in hashes:
+            matches = find_near_duplicates(session, modality, hash_hex, assessment_id)
+            if matches:
+                matched_hashes += 1
+                matched_users.update(row.user_id for row in matches)
+        record_fingerprints(session, modality, hash_kind, hashes, assessment_id, user_id)
+    except Exception as exc:
+        logger.warning("Replay check skipped for assessment %s: %s", assessment_id, exc)
+        return result
+
+    result["replay"] = {
+        "hashed": len(hashes),
+        "matched": matched_hashes,
+        "same_user": user_id in matched_users,
+        "other_users": len(matched_users - {user_id}),
+    }
+    if matched_hashes * 2 < len(hashes) or matched_hashes == 0:
+        return result
+
+    flags = list(result.get(f"{prefix}_integrity_flags") or [])
+    flags.append("replayed_media")
+    spoof_risk = min(1.0, float(result.get(f"{prefix}_spoof_risk") or 0.0) + _REPLAY_SPOOF_RISK)
+    result[f"{prefix}_integrity_flags"] = flags
+    result[f"{prefix}_spoof_risk"] = round(spoof_risk, 4)
+    result[f"{prefix}_integrity_score"] = round(1.0 - spoof_risk, 4)
+    logger.info(
+        "Replayed %s media for assessment %s (%d/%d hashes matched)",
+        modality, assessment_id, matched_hashes, len(hashes),
+    )
+    return result
@@ -0,0 +1,327 @@
+"""Bulk historical re-scoring after a fusion / calibration model change.
+
+``rescore_history`` walks every assessment that has an ``AnalysisResult`` in
+keyset-paginated chunks (``assessment_id > checkpoint``), loads the latest
+features for the whole chunk through ``FeatureRepository``, scores the chunk with the
+batch scorer and writes ``AnalysisResult`` / ``RiskScore`` with bulk
+statements in a single short transaction. The same transaction moves the
+checkpoint and running diff on the ``rescore_jobs`` row, so an interrupted run
+resumes exactly where it stopped (never re-scoring a committed chunk), and the
+loop sleeps ``rescore_throttle_seconds`` so the SQLite write lock is released
+for API requests. A job only resumes under the ``engine_version`` it started
+with; after a model change a fresh job starts instead of mixing versions.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import delete, insert, update
+from sqlmodel import Session, select
+
+from app.core.config import get_settings
+from app.core.database import engine
+from app.models.analysis_result import AnalysisResult
+from app.models.inference_run import InferenceRun
+from app.models.recommendation import Recommendation
+from app.models.rescore_job import RescoreJob
+from app.models.risk_score import RiskScore
+from app.services import analysis_snapshot_service, fusion_engine_service
+from app.services.feature_repository import FeatureRepository
+from app.services.recommendation_service import generate as generate_recommendations
+
+logger = logging.getLogger(__name__)
+
+_RESULT_FIELDS = ("stress_score", "mood_score", "emotional_distress_score", "wellness_flag",
+                  "support_level", "crisis_flag", "confidence_score")
+_RISK_FIELDS = ("stress_score", "low_mood_score", "burnout_score", "social_withdrawal_score", "crisis_score")
+_DIFF_SCORES = ("stress_score", "low_mood_score", "burnout_score", "social_withdrawal_score",
+                "crisis_score", "emotional_distress_score", "mood_score", "confidence_score")
+_CHANGE_EPSILON = 1e-4
+
+
+def _empty_summary() -> dict:
+    return {
+        "skipped": 0,
+        "abs_delta_sum": {key: 0.0 for key in _DIFF_SCORES},
+        "max_abs_delta": {key: 0.0 for key in _DIFF_SCORES},
+        "delta_count": {key: 0 for key in _DIFF_SCORES},
+        "risk_transitions": {},
+        "crisis_flag_changes": 0,
+    }
+
+
+def _next_chunk(session: Session, after: Optional[str], size: int) -> List[str]:
+    query = select(AnalysisResult.assessment_id).distinct().order_by(AnalysisResult.assessment_id).limit(size)
+    if after:
+        query = query.where(AnalysisResult.assessment_id > after)
+    return list(session.exec(query).all())
+
+
+def _accumulate(summary: dict, old_result: AnalysisResult, old_risk: Optional[RiskScore], scores: dict) -> bool:
+    changed = False
+    old_values = {key: getattr(old_result, key, None) for key in ("stress_score", "mood_score",
+                                                                 "emotional_distress_score", "confidence_score")}
+    if old_risk is not None:
+        old_values.update({key: getattr(old_risk, key) for key in _RISK_FIELDS})
+    for key in _DIFF_SCORES:
+        old, new = old_values.get(key), scores.get(key)
+        if old is None or new is None:
+            continue
+        delta = abs(float(new) - float(old))
+        summary["abs_delta_sum"][key] += delta
+        summary["max_abs_delta"][key] = max(summary["max_abs_delta"][key], delta)
+        summary["delta_count"][key] += 1
+        changed = changed or delta > _CHANGE_EPSILON
+
+    old_level = old_risk.final_risk_level if old_risk is not None else None
+    new_level = scores.get("final_risk_level")
+    transition = f"{old_level}->{new_level}"
+    summary["risk_transitions"][transition] = summary["risk_transitions"].get(transition, 0) + 1
+    if int(old_result.crisis_flag or 0) != int(scores.get("crisis_flag") or 0):
+        summary["crisis_flag_changes"] += 1
+        changed = True
+    return changed or old_level != new_level or old_result.support_level != scores.get("support_level")
+
+
+def _tracking(scores: dict, engine_version: str, job_id: Optional[str]) -> str:
+    return json.dumps({
+        "scoring_source": scores.get("scoring_source"),
+        "fusion_engine": scores.get("fusion_engine"),
+        "engine_version": engine_version,
+        "model_name": scores.get("model_name"),
+        "model_version": scores.get("model_version"),
+        "calibration_source": scores.get("calibration_source"),
+        "overall_integrity_score": scores.get("overall_integrity_score"),
+        "overall_spoof_risk": scores.get("overall_spoof_risk"),
+        "model_input_features": scores.get("model_input_features") or {},
+        "model_output_scores": scores.get("model_output_scores") or {},
+        "dominant_features": scores.get("dominant_features") or {},
+        "rescore_job_id": job_id,
+    })
+
+
+def _rescore_chunk(assessment_ids: List[str], summary: dict, job_id: Optional[str]) -> tuple[int, int, Optional[str], Optional[dict]]:
+    """Score one chunk; returns (processed, changed, model_version, writes for ``_write_chunk``)."""
+    with Session(engine) as session:
+        repository = FeatureRepository(session)
+        features = repository.load(assessment_ids)
+        questionnaires = repository.questionnaire_data_many(assessment_ids)
+        results = {
+            row.assessment_id: row
+            for row in session.exec(select(AnalysisResult).where(AnalysisResult.assessment_id.in_(assessment_ids))).all()
+        }
+        risks = {
+            row.assessment_id: row
+            for row in session.exec(select(RiskScore).where(RiskScore.assessment_id.in_(assessment_ids))).all()
+        }
+
+    ids, inputs = [], []
+    for aid in assessment_ids:
+        per = features[aid]
+        q_data = questionnaires[aid]
+        if not any((per["text"], per["audio"], per["video"], q_data)):
+            summary["skipped"] += 1
+            continue
+        ids.append(aid)
+        inputs.append({
+            "text_features": per["text"],
+            "audio_features": per["audio"],
+            "video_features": per["video"],
+            "questionnaire_data": q_data,
+        })
+    if not inputs:
+        return 0, 0, None, None
+
+    engine_version = fusion_engine_service.engine_version()
+    all_scores = fusion_engine_service.compute_scores_batch(inputs)
+    model_version = all_scores[0].get("model_version")
+
+    result_updates, risk_updates, risk_inserts, runs, changed_ids, new_recs = [], [], [], [], [], []
+    for aid, row_inputs, scores in zip(ids, inputs, all_scores):
+        result = results[aid]
+        risk = risks.get(aid)
+        if _accumulate(summary, result, risk, scores):
+            changed_ids.append(aid)
+            new_recs.extend(generate_recommendations(aid, result.user_id, scores))
+        values = {field: scores.get(field) for field in _RESULT_FIELDS}
+        values.update({
+            "text_emotion": scores.get("text_emotion"),
+            "audio_emotion": scores.get("audio_emotion"),
+            "video_emotion": scores.get("video_emotion"),
+        })
+        result_updates.append({"id": result.id, **values})
+        risk_values = {field: scores.get(field) for field in _RISK_FIELDS}
+        risk_values["final_risk_level"] = scores.get("final_risk_level", "low")
+        if risk is not None:
+            risk_updates.append({"id": risk.id, **risk_values})
+        else:
+            risk_inserts.append({"assessment_id": aid, "user_id": result.user_id, **risk_values})
+        runs.append({
+            "assessment_id": aid,
+            "model_id": scores.get("model_registry_id"),
+            "input_snapshot_hash": fusion_engine_service.input_fingerprint(row_inputs),
+            "output_json": _tracking(scores, engine_version, job_id),
+            "confidence_score": scores.get("confidence_score"),
+            "latency_ms": 0,
+            "run_status": "completed",
+        })
+
+    writes = {
+        "ids": ids,
+        "result_updates": result_updates,
+        "risk_updates": risk_updates,
+        "risk_inserts": risk_inserts,
+        "runs": runs,
+        "changed_ids": changed_ids,
+        "recommendations": new_recs,
+    }
+    return len(ids), len(changed_ids), model_version, writes
+
+
+def _write_chunk(session: Session, writes: dict) -> None:
+    session.execute(update(AnalysisResult), writes["result_updates"])
+    if writes["risk_updates"]:
+        session.execute(update(RiskScore), writes["risk_updates"])
+    if writes["risk_inserts"]:
+        session.execute(insert(RiskScore), writes["risk_inserts"])
+    session.execute(insert(InferenceRun), writes["runs"])
+    analysis_snapshot_service.invalidate(session, writes["ids"])
+    if writes["changed_ids"]:
+        session.execute(
+            delete(Recommendation).where(Recommendation.assessment_id.in_(writes["changed_ids"])),
+            execution_options={"synchronize_session": False},
+        )
+        if writes["recommendations"]:
+            session.execute(insert(Recommendation), writes["recommendations"])
+
+
+def _update_job(session: Session, job_id: str, **values) -> None:
+    values["updated_at"] = datetime.utcnow().isoformat()
+    session.execute(update(RescoreJob).where(RescoreJob.id == job_id).values(**values))
+
+
+def _save_job(job_id: str, **values) -> None:
+    with Session(engine) as session:
+        with session.begin():
+            _update_job(session, job_id, **values)
+
+
+def _start_job(resume: bool) -> RescoreJob:
+    current_version = fusion_engine_service.engine_version()
+    with Session(engine) as session:
+        with session.begin():
+            job = None
+            if resume:
+                job = session.exec(
+                    select(RescoreJob)
+                    .where(RescoreJob.status.in_(("running", "failed")))
+                    .order_by(RescoreJob.started_at.desc())
+                ).first()
+                if job is not None and job.engine_version != current_version:
+                    logger.info(
+                        "Not resuming rescore job %s (scored with %s, active is %s); starting a new job",
+                        job.id, job.engine_version, current_version,
+                    )
+                    job.status = "failed"
+                    job.error = f"superseded: engine version changed to {current_version}"
+                    job = None
+            if job is None:
+                job = RescoreJob(
+                    fusion_engine=fusion_engine_service.primary_engine_name(),
+                    engine_version=current_version,
+                    summary_json=json.dumps(_empty_summary()),
+                )
+                session.add(job)
+            else:
+                job.status = "running"
+                job.error = None
+            session.flush()
+            session.expunge(job)
+    return job
+
+
+def finalize_summary(summary: dict, processed: int, changed: int) -> dict:
+    """Turn the running accumulators into the printable diff summary."""
+    return {
+        "processed": processed,
+        "changed": changed,
+        "skipped_no_features": summary["skipped"],
+        "mean_abs_delta": {
+            key: round(summary["abs_delta_sum"][key] / summary["delta_count"][key], 4)
+            for key in _DIFF_SCORES if summary["delta_count"][key]
+        },
+        "max_abs_delta": {key: round(value, 4) for key, value in summary["max_abs_delta"].items() if summary["delta_count"][key]},
+        "risk_level_changes": {k: v for k, v in sorted(summary["risk_transitions"].items()) if k.split("->")[0] != k.split("->")[1]},
+        "risk_level_unchanged": sum(v for k, v in summary["risk_transitions"].items() if k.split("->")[0] == k.split("->")[1]),
+        "crisis_flag_changes": summary["crisis_flag_changes"],
+    }
+
+
+def rescore_history(
+    batch_size: Optional[int] = None,
+    throttle_seconds: Optional[float] = None,
+    resume: bool = True,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+) -> dict:
+    """Re-score stored assessments with the active fusion engine / model versions.
+
+    ``resume`` continues the newest unfinished job from its checkpoint when it
+    was started under the active engine version;
+    ``dry_run`` scores and reports the diff without writing anything.
+    """
+    settings = get_settings()
+    batch_size = batch_size or settings.rescore_batch_size
+    throttle_seconds = settings.rescore_throttle_seconds if throttle_seconds is None else throttle_seconds
+
+    if dry_run:
+        job_id, after, processed, changed, summary = None, None, 0, 0, _empty_summary()
+    else:
+        job = _start_job(resume)
+        job_id, after = job.id, job.last_assessment_id
+        processed, changed = job.processed or 0, job.changed or 0
+        summary = json.loads(job.summary_json) if job.summary_json else _empty_summary()
+        if after:
+            logger.info("Resuming rescore job %s after %s (%d done)", job_id, after, processed)
+
+    model_version = None
+    this_run = 0
+    exhausted = False
+    try:
+        while limit is None or this_run < limit:
+            size = batch_size if limit is None else min(batch_size, limit - this_run)
+            with Session(engine) as session:
+                chunk = _next_chunk(session, after, size)
+            if not chunk:
+                exhausted = True
+                break
+            done, chunk_changed, version, writes = _rescore_chunk(chunk, summary, job_id)
+            this_run += len(chunk)
+            processed += done
+            changed += chunk_changed
+            model_version = version or model_version
+            after = chunk[-1]
+            if job_id:
+                # Scores and checkpoint commit together: a crash re-runs the whole chunk or none of it
+                with Session(engine) as session:
+                    with session.begin():
+                        if writes:
+                            _write_chunk(session, writes)
+                        _update_job(session, job_id, last_assessment_id=after, processed=processed, changed=changed,
+                                    model_version=model_version, summary_json=json.dumps(summary))
+            logger.info("Rescored %d assessments (%d changed), checkpoint %s", processed, changed, after)
+            if throttle_seconds > 0:
+                time.sleep(throttle_seconds)
+    except BaseException as exc:
+        if job_id:
+            _save_job(job_id, status="failed", error=str(exc)[:500] or type(exc).__name__)
+        raise
+
+    if job_id and exhausted:
+        _save_job(job_id, status="completed", finished_at=datetime.utcnow().isoformat())
+    return {"job_id": job_id, "dry_run": dry_run, "finished": exhausted, "model_version": model_version,
+            **finalize_summary(summary, processed, changed)}
@@ -1,45 +1,148 @@
-"""Probability calibration helpers for final risk scoring."""
+"""Probability calibration helpers for final risk scoring.
+
+The isotonic calibrators fitted by ``calibrate_risk.py`` are compiled at load
+time into sorted breakpoint arrays and evaluated with ``np.interp`` — the same
+piecewise-linear function ``IsotonicRegression.predict`` computes, without an
+sklearn call per score. Each table is parity-checked against its isotonic
+model on load; ``calibration_source`` carries the table version.
+"""
 from __future__ import annotations
 
+import hashlib
+import logging
 import pickle
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
 _MODEL_PATH = Path(__file__).resolve().parents[2] / "ml_models" / "risk_calibration.pkl"
 _calibrator: dict[str, Any] | None = None
+_PARITY_GRID = np.linspace(0.0, 1.0, 2001)
+_PARITY_TOLERANCE = 1e-6
 
 
 def _clamp(value: float) -> float:
     return max(0.0, min(1.0, float(value)))
 
 
-def _load() -> dict[str, Any] | None:
+def _interp(raw: np.ndarray, table: tuple) -> np.ndarray:
+    xp, fp, dtype = table
+    # IsotonicRegression evaluates in its fitted dtype (float32 from calibrate_risk.py)
+    return np.interp(raw.astype(dtype), xp, fp).astype(dtype).astype(np.float64)
+
+
+def _compile(metric_name: str, isotonic) -> tuple[np.ndarray, np.ndarray, np.dtype] | None:
+    """Breakpoints (x, y, dtype) reproducing ``isotonic.predict``, or None if it cannot be compiled."""
+    if getattr(isotonic, "out_of_bounds", None) != "clip" or not hasattr(isotonic, "X_thresholds_"):
+        logger.warning("Calibrator %s is not a clipped isotonic model; serving it through predict()", metric_name)
+        return None
+    xp = np.asarray(isotonic.X_thresholds_)
+    fp = np.asarray(isotonic.y_thresholds_)
+    if xp.ndim != 1 or xp.shape != fp.shape or xp.size == 0 or np.any(np.diff(xp) < 0):
+        logger.warning("Calibrator %s has unusable thresholds; serving it through predict()", metric_name)
+        return None
+    expected = np.asarray(isotonic.predict(_PARITY_GRID), dtype=np.float64)
+    table = (xp, fp, xp.dtype)
+    error = float(np.max(np.abs(_interp(_PARITY_GRID, table) - expected)))
+    if error > _PARITY_TOLERANCE:
+        logger.warning("Calibrator %s lookup table deviates by %.2e; serving it through predict()", metric_name, error)
+        return None
+    return table
+
+
+def _compile_all(raw: dict[str, Any]) -> dict[str, Any]:
+    tables: dict[str, tuple] = {}
+    models: dict[str, Any] = {}
+    digest = hashlib.sha256()
+    for metric_name, value in sorted(raw.items()):
+        if not hasattr(value, "predict"):
+            continue  # metadata such as sample_count / target
+        table = _compile(metric_name, value)
+        if table is None:
+            models[metric_name] = value
+            digest.update(f"{metric_name}:model".encode())
+            continue
+        tables[metric_name] = table
+        digest.update(metric_name.encode())
+        digest.update(table[0].tobytes())
+        digest.update(table[1].tobytes())
+    return {
+        "tables": tables,
+        "models": models,
+        "version": digest.hexdigest()[:10],
+        "sample_count": raw.get("sample_count"),
+        "target": raw.get("target"),
+    }
+
+
+def load_artifact(path: Path) -> dict[str, Any] | None:
+    """Load and compile a calibrator pickle without touching the active one."""
+    try:
+        with open(path, "rb") as f:
+            obj = pickle.load(f)
+        return _compile_all(obj) if isinstance(obj, dict) else None
+    except Exception as exc:
+        logger.warning("Could not load risk calibrator %s: %s", path, exc)
+        return None
+
+
+def activate(compiled: dict[str, Any], info: dict) -> None:
+    """Swap in a compiled calibrator; calls already in progress keep the one they read."""
     global _calibrator
+    _calibrator = {**compiled, "info": dict(info)}
+
+
+def active_calibrator_info() -> dict:
+    model = _load()
+    return dict(model.get("info") or {}) if model else {}
+
+
+def calibration_version() -> str | None:
+    """Content version of the active calibrator; None means identity calibration."""
+    model = _load()
+    return model["version"] if model else None
+
+
+def _load() -> dict[str, Any] | None:
     if _calibrator is not None:
         return _calibrator
     if not _MODEL_PATH.exists():
         return None
-    try:
-        with open(_MODEL_PATH, "rb") as f:
-            obj = pickle.load(f)
-        _calibrator = obj if isinstance(obj, dict) else None
-    except Exception:
-        _calibrator = None
+    compiled = load_artifact(_MODEL_PATH)
+    if compiled is not None and _calibrator is None:
+        activate(compiled, {"path": str(_MODEL_PATH), "version": None, "registry_id": None})
     return _calibrator
 
 
-def calibrate_probability(metric_name: str, raw_score: float) -> tuple[float, str]:
+def calibration_metrics() -> list[str]:
+    model = _load()
+    return sorted([*model["tables"], *model["models"]]) if model else []
+
+
+def calibrate_probabilities(metric_name: str, raw_scores) -> tuple[np.ndarray, str]:
+    """Calibrate a whole batch of scores; returns (calibrated, calibration_source)."""
+    raw = np.clip(np.asarray(raw_scores, dtype=np.float64), 0.0, 1.0)
     model = _load()
-    raw = _clamp(raw_score)
     if not model:
         return raw, "identity"
 
-    calibrator = model.get(metric_name)
+    table = model["tables"].get(metric_name)
+    if table is not None:
+        return np.clip(_interp(raw, table), 0.0, 1.0), f"isotonic_lut:{model['version']}"
+
+    calibrator = model["models"].get(metric_name)
     if calibrator is None:
         return raw, "identity"
-
     try:
-        calibrated = float(calibrator.predict([raw])[0])
-        return _clamp(calibrated), "isotonic"
+        calibrated = np.asarray(calibrator.predict(raw.ravel()), dtype=np.float64).reshape(raw.shape)
+        return np.clip(calibrated, 0.0, 1.0), f"isotonic:{model['version']}"
     except Exception:
         return raw, "identity"
+
+
+def calibrate_probability(metric_name: str, raw_score: float) -> tuple[float, str]:
+    calibrated, source = calibrate_probabilities(metric_name, [_clamp(raw_score)])
+    return float(calibrated[0]), source
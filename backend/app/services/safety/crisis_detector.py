@@ -3,34 +3,17 @@ from __future__ import annotations
 
 from typing import Dict, Any
 
-
-CRISIS_PHRASES = {
-    "suicide",
-    "kill myself",
-    "end my life",
-    "self harm",
-    "hurt myself",
-    "no reason to live",
-    "want to die",
-}
-
-HIGH_RISK_PHRASES = {
-    "i am unsafe",
-    "i cannot go on",
-    "panic attack",
-    "hopeless",
-    "severe distress",
-}
+from app.services.safety.keyword_matcher import CRISIS_PHRASES, HIGH_RISK_PHRASES, scan_keywords  # noqa: F401
 
 
 class CrisisDetector:
     def detect(self, message: str, score_context: Dict[str, Any] | None = None) -> Dict[str, Any]:
-        text = (message or "").lower()
         score_context = score_context or {}
         score = float(score_context.get("wellness_score") or 50)
 
-        crisis_match = [p for p in CRISIS_PHRASES if p in text]
-        high_match = [p for p in HIGH_RISK_PHRASES if p in text]
+        hits = scan_keywords(message)
+        crisis_match = hits.get("detector_crisis", [])
+        high_match = hits.get("detector_high_risk", [])
 
         if crisis_match:
             return {
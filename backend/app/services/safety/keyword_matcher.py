@@ -0,0 +1,177 @@
+"""Compiled multi-pattern keyword matcher for crisis, distress and intent scans.
+
+Every keyword list the scanners use is registered in ``KEYWORD_SETS`` and
+compiled once at import into a single Aho-Corasick automaton, so a message is
+walked once no matter how many phrases or categories there are. Matches only
+start on a word boundary and, for the categories in ``STEM_CATEGORIES``, may
+run on into an inflection ("suicides", "overdosed", "panicked") like the
+substring scans they replaced. Only the greeting phrases must end on one too,
+so "hi" does not fire inside "this". Text and phrases are normalised the same way: lower-cased, curly
+apostrophes and hyphens folded, whitespace collapsed ("self-harm" == "self  harm").
+"""
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Collection, Dict, Iterable, List, Mapping
+
+from app.utils.constants import CRISIS_KEYWORDS, DISTRESS_KEYWORDS
+
+_WHITESPACE = re.compile(r"\s+")
+_FOLD = str.maketrans({"’": "'", "‘": "'", "-": " ", "–": " ", "—": " "})
+
+
+def normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", (text or "").lower().translate(_FOLD)).strip()
+
+
+def _is_word_char(norm: str, i: int) -> bool:
+    """Whether ``norm[i]`` is part of a word; an apostrophe only inside one ("don't", not "'quoted'")."""
+    if i < 0 or i >= len(norm):
+        return False
+    ch = norm[i]
+    if ch == "'":
+        return 0 < i < len(norm) - 1 and norm[i - 1].isalnum() and norm[i + 1].isalnum()
+    return ch.isalnum()
+
+
+class KeywordMatcher:
+    def __init__(self, keyword_sets: Mapping[str, Iterable[str]], stem_categories: Collection[str] = ()) -> None:
+        self._stem_categories = frozenset(stem_categories)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._phrases: List[str] = []
+        self._categories: List[List[str]] = []
+        index_by_norm: Dict[str, int] = {}
+
+        for category, phrases in keyword_sets.items():
+            for phrase in phrases:
+                norm = normalize(phrase)
+                if not norm:
+                    continue
+                idx = index_by_norm.get(norm)
+                if idx is None:
+                    idx = index_by_norm[norm] = len(self._phrases)
+                    self._phrases.append(phrase)
+                    self._categories.append([])
+                    self._insert(norm, idx)
+                if category not in self._categories[idx]:
+                    self._categories[idx].append(category)
+        self._lengths = [len(normalize(p)) for p in self._phrases]
+        self._build_failure_links()
+
+    def _insert(self, norm: str, idx: int) -> None:
+        state = 0
+        for ch in norm:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(idx)
+
+    def _build_failure_links(self) -> None:
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, nxt in self._goto[state].items():
+                pending.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def _matches(self, norm: str) -> Dict[int, bool]:
+        """Phrase indexes starting on a word boundary, in order of first occurrence.
+
+        The value is True when some occurrence also ends on a word boundary
+        (a whole-word hit) and False when the phrase only appeared as a stem.
+        """
+        found: Dict[int, bool] = {}
+        state = 0
+        for pos, ch in enumerate(norm):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for idx in self._out[state]:
+                if found.get(idx):
+                    continue
+                start = pos - self._lengths[idx] + 1
+                if _is_word_char(norm, start - 1):
+                    continue
+                found[idx] = not _is_word_char(norm, pos + 1)
+        return found
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Every category hit in one pass: ``{category: [matched phrases]}``."""
+        hits: Dict[str, List[str]] = {}
+        for idx, whole_word in self._matches(normalize(text)).items():
+            for category in self._categories[idx]:
+                if whole_word or category in self._stem_categories:
+                    hits.setdefault(category, []).append(self._phrases[idx])
+        return hits
+
+
+# ── Keyword registry (one automaton for every scanner) ─────────
+CRISIS_PHRASES = {
+    "suicide",
+    "kill myself",
+    "end my life",
+    "self harm",
+    "hurt myself",
+    "no reason to live",
+    "want to die",
+}
+
+HIGH_RISK_PHRASES = {
+    "i am unsafe",
+    "i cannot go on",
+    "panic attack",
+    "hopeless",
+    "severe distress",
+}
+
+KEYWORD_SETS: Dict[str, Iterable[str]] = {
+    # safety_service.scan_text
+    "crisis": CRISIS_KEYWORDS,
+    "distress": DISTRESS_KEYWORDS,
+    # CrisisDetector.detect
+    "detector_crisis": CRISIS_PHRASES,
+    "detector_high_risk": HIGH_RISK_PHRASES,
+    # agent_v2.health_safety
+    "severity_emergency": ("panic", "panicking", "anxiety attack", "heart attack", "breathe", "chest pain"),
+    "severity_crisis": ("suicidal", "self-harm", "overdose", "dangerous"),
+    "severity_high": ("severe", "critical", "unbearable", "worst", "terrible"),
+    "severity_moderate": ("worried", "concerned", "struggling", "difficult", "overwhelmed"),
+    "score_context": (
+        "score", "scores", "metric", "metrics", "wellness data", "check-in", "history",
+        "compare to my scores", "relate to my wellness", "my data shows",
+    ),
+    # agent_v2.conversation_memory
+    "tone_distress": ("sad", "bad mood", "anxious", "anxiety", "panic", "stressed", "overwhelmed", "same"),
+    "tone_positive": ("better", "good", "improved", "fine", "great"),
+    "topic_scores": ("score", "scores", "history", "metric", "metrics", "trend", "trends"),
+    "topic_health": ("mood", "anxiety", "panic", "stress", "stressed", "sleep", "health"),
+    # assistant.grounded_assistant_service.detect_intent
+    "intent_score": ("score", "scores", "check-in", "wellness score", "risk level", "snapshot"),
+    "intent_health": (
+        "exercise", "exercising", "feel", "feeling", "feels", "health", "pain", "sick", "fever",
+        "headache", "diet", "sleep", "sleeping", "workout",
+    ),
+    "intent_greeting": ("hi", "hello", "hey", "namaste", "good morning", "good afternoon", "good evening"),
+}
+
+# Recall beats precision: these also match inflections ("suicides", "overdosed", "panicked").
+# Greetings are the exception: short words like "hi" and "hey" are prefixes of too much.
+STEM_CATEGORIES = tuple(category for category in KEYWORD_SETS if category != "intent_greeting")
+
+SAFETY_MATCHER = KeywordMatcher(KEYWORD_SETS, stem_categories=STEM_CATEGORIES)
+
+
+def scan_keywords(text: str) -> Dict[str, List[str]]:
+    return SAFETY_MATCHER.scan(text)
@@ -5,7 +5,10 @@ This is NOT a clinical system. Flags are informational signals only.
 """
 from __future__ import annotations
 from typing import List, Dict
-from app.utils.constants import CRISIS_KEYWORDS, DISTRESS_KEYWORDS
+from sqlmodel import Session, select
+from app.core.database import engine
+from app.models.safety_flag import SafetyFlag
+from app.services.safety.keyword_matcher import scan_keywords
 
 
 def scan_text(text: str) -> Dict:
@@ -18,9 +21,9 @@ def scan_text(text: str) -> Dict:
         matched_keywords: list of matched phrases
         severity: 'low' | 'medium' | 'high' | 'critical'
     """
-    lower = text.lower()
-    crisis_matches = [kw for kw in CRISIS_KEYWORDS if kw in lower]
-    distress_matches = [kw for kw in DISTRESS_KEYWORDS if kw in lower]
+    hits = scan_keywords(text)
+    crisis_matches = hits.get("crisis", [])
+    distress_matches = hits.get("distress", [])
     all_matches = crisis_matches + distress_matches
 
     crisis_flag = len(crisis_matches) > 0
@@ -67,3 +70,31 @@ def build_safety_flags(
             "reason": "Distress keywords detected: " + ", ".join(scan_result["matched_keywords"][:5]),
         })
     return flags
+
+
+def persist_text_flags(assessment_id: str, user_id: int, text: str, skip_existing: bool = False) -> Dict:
+    """
+    Scan ``text`` and commit any resulting flags in their own short transaction.
+
+    Used for early flagging (e.g. as soon as an audio transcript exists), so the
+    flag does not wait for the caller's main transaction to finish.
+    ``skip_existing`` drops flags identical to one already on the assessment
+    (a retried queue job re-scanning the same transcript).
+    """
+    scan = scan_text(text)
+    flags = build_safety_flags(assessment_id, user_id, scan)
+    persisted = 0
+    if flags:
+        with Session(engine) as session:
+            with session.begin():
+                for flag_data in flags:
+                    if skip_existing and session.exec(
+                        select(SafetyFlag.id)
+                        .where(SafetyFlag.assessment_id == assessment_id)
+                        .where(SafetyFlag.flag_type == flag_data["flag_type"])
+                        .where(SafetyFlag.reason == flag_data["reason"])
+                    ).first():
+                        continue
+                    session.add(SafetyFlag(**flag_data))
+                    persisted += 1
+    return {**scan, "flags_persisted": persisted}
@@ -8,15 +8,19 @@ Train the NN:
     cd backend && python train_nn.py
 """
 from __future__ import annotations
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Sequence
+
+import numpy as np
+
 from app.services.fusion_nn import (
     build_feature_vector,
     explain_dominant_features,
     feature_vector_to_dict,
-    predict as nn_predict,
+    get_active_model,
+    predict_batch as nn_predict_batch,
     MODEL_NAME,
 )
-from app.services.risk_calibration_service import calibrate_probability
+from app.services.risk_calibration_service import calibrate_probabilities
 
 
 def _clamp(v: float, lo: float = 0.0, hi: float = 1.0) -> float:
@@ -24,6 +28,11 @@ def _clamp(v: float, lo: float = 0.0, hi: float = 1.0) -> float:
 
 # Modality weights for the heuristic fallback
 _W = {"text": 0.35, "audio": 0.25, "video": 0.15, "questionnaire": 0.25}
+_MODALITIES = ("text", "audio", "video", "questionnaire")
+
+# text / audio / video weights for overall integrity and model reliability
+_INTEGRITY_WEIGHTS = np.array([0.4, 0.35, 0.25])
+_RELIABILITY_WEIGHTS = np.array([0.35, 0.35, 0.30])
 
 
 def _heuristic(available: list, contributions: dict) -> dict:
@@ -55,6 +64,42 @@ def _heuristic(available: list, contributions: dict) -> dict:
     }
 
 
+def _heuristic_scores(
+    available: list,
+    text_features: Optional[Dict],
+    audio_features: Optional[Dict],
+    video_features: Optional[Dict],
+    questionnaire_data: Optional[Dict],
+) -> dict:
+    """Build the per-modality contributions and run the heuristic for one assessment."""
+    contributions: Dict[str, Dict] = {}
+    if text_features:
+        contributions["text"] = {
+            "stress": text_features.get("stress_score", 0.3),
+            "mood":   text_features.get("mood_score",   0.5),
+        }
+    if audio_features:
+        feat    = audio_features.get("features", {})
+        silence = feat.get("silence_ratio", 0.0)
+        rms     = feat.get("rms_energy", 0.03)
+        a_s     = _clamp(silence * 0.6 + (0.05 - min(rms, 0.05)) / 0.05 * 0.4)
+        contributions["audio"] = {"stress": a_s, "mood": _clamp(1.0 - silence)}
+    if video_features:
+        light = video_features.get("lighting_score") or 0.5
+        face  = video_features.get("face_detected", 0)
+        v_s   = _clamp((1.0 - light) * 0.5 + (0.5 if not face else 0.0))
+        contributions["video"] = {"stress": v_s, "mood": _clamp(light * 0.7 + (0.3 if face else 0.0))}
+    if questionnaire_data:
+        sleep_h   = float(questionnaire_data.get("sleep_hours", 7))
+        sleep_pen = _clamp((8.0 - min(sleep_h, 8.0)) / 8.0)
+        contributions["questionnaire"] = {
+            "stress":    _clamp(questionnaire_data.get("stress_level", 5) / 10.0),
+            "mood":      _clamp(questionnaire_data.get("mood_level",   5) / 10.0),
+            "sleep_pen": sleep_pen,
+        }
+    return _heuristic(available, contributions)
+
+
 def compute_scores(
     text_features: Optional[Dict] = None,
     audio_features: Optional[Dict] = None,
@@ -65,7 +110,7 @@ def compute_scores(
     Fuse available modality signals.
 
     Pipeline:
-      1. Build 15-dim feature vector
+      1. Build 17-dim feature vector
       2. Run NN (if trained)      → primary path
       3. Fallback to heuristic    → when NN not ready
 
@@ -73,173 +118,183 @@ def compute_scores(
     social_withdrawal_score, crisis_score, emotional_distress_score,
     mood_score, wellness_flag, crisis_flag, support_level,
     final_risk_level, confidence_score, text/audio/video_emotion.
+
+    This is a batch of one through compute_scores_batch, so single and bulk
+    scoring can never drift apart.
     """
-    available = (
-        (["text"]          if text_features       else []) +
-        (["audio"]         if audio_features      else []) +
-        (["video"]         if video_features      else []) +
-        (["questionnaire"] if questionnaire_data  else [])
-    )
-    if not available:
-        return _default_scores()
+    return compute_scores_batch([{
+        "text_features": text_features,
+        "audio_features": audio_features,
+        "video_features": video_features,
+        "questionnaire_data": questionnaire_data,
+    }])[0]
 
-    # ── Build feature vector for NN ───────────────────────────
-    feat_vec, flags = build_feature_vector(
-        text_features, audio_features, video_features, questionnaire_data
-    )
 
-    # ── Try NN ────────────────────────────────────────────────
-    nn_out = nn_predict(feat_vec)
-    source = "nn" if nn_out else "heuristic"
-
-    if nn_out:
-        stress   = nn_out["stress_score"]
-        low_mood = nn_out["low_mood_score"]
-        burnout  = nn_out["burnout_score"]
-        soc_w    = nn_out["social_withdrawal_score"]
-        crisis   = nn_out["crisis_score"]
-        mood     = _clamp(1.0 - low_mood)
-        confidence = _clamp(sum(flags.values()) / 4.0 + 0.2)
-    else:
-        # Build contributions dict for heuristic
-        contributions: Dict[str, Dict] = {}
-        if text_features:
-            contributions["text"] = {
-                "stress": text_features.get("stress_score", 0.3),
-                "mood":   text_features.get("mood_score",   0.5),
-            }
-        if audio_features:
-            feat    = audio_features.get("features", {})
-            silence = feat.get("silence_ratio", 0.0)
-            rms     = feat.get("rms_energy", 0.03)
-            a_s     = _clamp(silence * 0.6 + (0.05 - min(rms, 0.05)) / 0.05 * 0.4)
-            contributions["audio"] = {"stress": a_s, "mood": _clamp(1.0 - silence)}
-        if video_features:
-            light = video_features.get("lighting_score") or 0.5
-            face  = video_features.get("face_detected", 0)
-            v_s   = _clamp((1.0 - light) * 0.5 + (0.5 if not face else 0.0))
-            contributions["video"] = {"stress": v_s, "mood": _clamp(light * 0.7 + (0.3 if face else 0.0))}
-        if questionnaire_data:
-            sleep_h   = float(questionnaire_data.get("sleep_hours", 7))
-            sleep_pen = _clamp((8.0 - min(sleep_h, 8.0)) / 8.0)
-            contributions["questionnaire"] = {
-                "stress":    _clamp(questionnaire_data.get("stress_level", 5) / 10.0),
-                "mood":      _clamp(questionnaire_data.get("mood_level",   5) / 10.0),
-                "sleep_pen": sleep_pen,
-            }
-        h = _heuristic(available, contributions)
-        stress   = h["stress_score"]
-        low_mood = h["low_mood_score"]
-        burnout  = h["burnout_score"]
-        soc_w    = h["social_withdrawal_score"]
-        crisis   = h["crisis_score"]
-        mood     = h["mood_score"]
-        confidence = h["confidence_score"]
-
-    text_conf = None
-    if text_features:
-        text_conf = text_features.get("text_emotion_confidence", text_features.get("emotion_score"))
-    audio_conf = audio_features.get("audio_emotion_confidence") if audio_features else None
-    video_conf = video_features.get("video_emotion_confidence") if video_features else None
-
-    text_integrity = float((text_features or {}).get("text_integrity_score", 1.0) or 1.0)
-    audio_integrity = float((audio_features or {}).get("audio_integrity_score", 1.0) or 1.0)
-    video_integrity = float((video_features or {}).get("video_integrity_score", 1.0) or 1.0)
-    text_spoof = float((text_features or {}).get("text_spoof_risk", 0.0) or 0.0)
-    audio_spoof = float((audio_features or {}).get("audio_spoof_risk", 0.0) or 0.0)
-    video_spoof = float((video_features or {}).get("video_spoof_risk", 0.0) or 0.0)
-
-    integrity_parts = []
-    if text_features:
-        integrity_parts.append((text_integrity, 0.4))
-    if audio_features:
-        integrity_parts.append((audio_integrity, 0.35))
-    if video_features:
-        integrity_parts.append((video_integrity, 0.25))
-    if integrity_parts:
-        denom = sum(w for _, w in integrity_parts)
-        overall_integrity = sum(v * w for v, w in integrity_parts) / denom
+def _optional_float(values: list, idx: int) -> np.ndarray:
+    """Column of floats with NaN where the value is None."""
+    return np.array([np.nan if v[idx] is None else float(v[idx]) for v in values], dtype=np.float64)
+
+
+def _masked_weighted_mean(values: np.ndarray, mask: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise weighted mean over the present entries; also returns which rows had any."""
+    w = np.where(mask, weights, 0.0)
+    denom = w.sum(axis=1)
+    numer = np.where(mask, values, 0.0) * w
+    has_any = denom > 0
+    mean = np.divide(numer.sum(axis=1), denom, out=np.zeros_like(denom), where=has_any)
+    return mean, has_any
+
+
+def compute_scores_batch(assessments: Sequence[Dict]) -> List[Dict]:
+    """
+    Score N assessments at once.
+
+    Each item is a dict with optional ``text_features``, ``audio_features``,
+    ``video_features`` and ``questionnaire_data`` (the compute_scores
+    arguments). The N x 17 feature matrix goes through one NN forward pass and
+    one calibrator call per metric; integrity, confidence, flags and levels
+    are derived with array ops. Results match compute_scores row for row.
+    """
+    rows = [
+        (
+            item.get("text_features"),
+            item.get("audio_features"),
+            item.get("video_features"),
+            item.get("questionnaire_data"),
+        )
+        for item in assessments
+    ]
+    results: List[Optional[Dict]] = [None] * len(rows)
+    active = [i for i, row in enumerate(rows) if any(row)]
+    for i, row in enumerate(rows):
+        if not any(row):
+            results[i] = _default_scores()
+    if not active:
+        return results
+
+    batch = [rows[i] for i in active]
+    present = np.array([[bool(m) for m in row] for row in batch], dtype=bool)   # N x 4 (truthy dicts)
+
+    # ── Feature matrix + NN ───────────────────────────────────
+    feature_rows = [build_feature_vector(*row)[0] for row in batch]
+    X = np.array(feature_rows, dtype=np.float64)                            # N x 17
+    model, model_info = get_active_model()                                  # one snapshot for the batch
+    Y = nn_predict_batch(X, model) if model is not None else None           # N x 5 or None
+
+    if Y is not None:
+        source = "nn"
+        stress, low_mood, burnout, soc_w, crisis = (Y[:, k] for k in range(5))
+        mood = np.clip(1.0 - low_mood, 0.0, 1.0)
+        confidence = np.clip(X[:, 12:16].sum(axis=1) / 4.0 + 0.2, 0.0, 1.0)  # has_* flags
     else:
-        overall_integrity = 1.0
-
-    overall_spoof_risk = _clamp(1.0 - overall_integrity)
-    confidence = _clamp(confidence - overall_spoof_risk * 0.25)
-
-    reliability_parts = []
-    if text_conf is not None:
-        reliability_parts.append((float(text_conf), 0.35))
-    if audio_conf is not None:
-        reliability_parts.append((float(audio_conf), 0.35))
-    if video_conf is not None:
-        reliability_parts.append((float(video_conf), 0.30))
-    if reliability_parts:
-        reliability_weight = sum(v * w for v, w in reliability_parts) / sum(w for _, w in reliability_parts)
-        confidence = _clamp(confidence * (0.8 + 0.2 * reliability_weight))
-
-    crisis_probability, calibration_source = calibrate_probability("crisis_score", crisis)
-    distress_probability, distress_calibration_source = calibrate_probability(
-        "emotional_distress_score",
-        _clamp((stress + low_mood) / 2.0),
-    )
+        source = "heuristic"
+        heuristic = [
+            _heuristic_scores([m for m, p in zip(_MODALITIES, flags) if p], *row)
+            for row, flags in zip(batch, present)
+        ]
+        stress, low_mood, burnout, soc_w, crisis, mood, confidence = (
+            np.array([h[key] for h in heuristic], dtype=np.float64)
+            for key in (
+                "stress_score", "low_mood_score", "burnout_score", "social_withdrawal_score",
+                "crisis_score", "mood_score", "confidence_score",
+            )
+        )
 
-    distress     = distress_probability
-    crisis       = crisis_probability
-    risk         = "high" if crisis >= 0.7 else ("medium" if crisis >= 0.4 else "low")
-    wellness_f   = int(distress >= 0.5)
-    crisis_f     = int(crisis >= 0.65)
+    # ── Integrity / spoof risk ────────────────────────────────
+    per_modality = [
+        [
+            (text or {}).get("text_emotion_confidence", (text or {}).get("emotion_score")) if text else None,
+            audio.get("audio_emotion_confidence") if audio else None,
+            video.get("video_emotion_confidence") if video else None,
+            float((text or {}).get("text_integrity_score", 1.0) or 1.0),
+            float((audio or {}).get("audio_integrity_score", 1.0) or 1.0),
+            float((video or {}).get("video_integrity_score", 1.0) or 1.0),
+            float((text or {}).get("text_spoof_risk", 0.0) or 0.0),
+            float((audio or {}).get("audio_spoof_risk", 0.0) or 0.0),
+            float((video or {}).get("video_spoof_risk", 0.0) or 0.0),
+        ]
+        for text, audio, video, _ in batch
+    ]
+    integrity = np.array([v[3:6] for v in per_modality], dtype=np.float64)     # N x 3
+    spoof = np.array([v[6:9] for v in per_modality], dtype=np.float64)         # N x 3
+    overall_integrity, has_integrity = _masked_weighted_mean(integrity, present[:, :3], _INTEGRITY_WEIGHTS)
+    overall_integrity = np.where(has_integrity, overall_integrity, 1.0)
 
-    output_scores = {
-        "stress_score": round(stress, 4),
-        "low_mood_score": round(low_mood, 4),
-        "burnout_score": round(burnout, 4),
-        "social_withdrawal_score": round(soc_w, 4),
-        "crisis_score": round(crisis, 4),
-    }
-    model_inputs = {
-        k: round(float(v), 6)
-        for k, v in feature_vector_to_dict(feat_vec).items()
-    }
-    dominance = explain_dominant_features(feat_vec, output_scores)
+    overall_spoof_risk = np.clip(1.0 - overall_integrity, 0.0, 1.0)
+    confidence = np.clip(confidence - overall_spoof_risk * 0.25, 0.0, 1.0)
 
-    return {
-        "stress_score":               round(stress,   4),
-        "low_mood_score":             round(low_mood, 4),
-        "burnout_score":              round(burnout,  4),
-        "social_withdrawal_score":    round(soc_w,    4),
-        "crisis_score":               round(crisis,   4),
-        "emotional_distress_score":   round(distress, 4),
-        "final_risk_probability":     round(crisis, 4),
-        "mood_score":                 round(mood,     4),
-        "wellness_flag":              wellness_f,
-        "crisis_flag":                crisis_f,
-        "support_level":              risk,
-        "final_risk_level":           risk,
-        "confidence_score":           round(confidence, 4),
-        "overall_integrity_score":    round(overall_integrity, 4),
-        "overall_spoof_risk":         round(overall_spoof_risk, 4),
-        "text_integrity_score":       round(text_integrity, 4) if text_features else None,
-        "audio_integrity_score":      round(audio_integrity, 4) if audio_features else None,
-        "video_integrity_score":      round(video_integrity, 4) if video_features else None,
-        "text_spoof_risk":            round(text_spoof, 4) if text_features else None,
-        "audio_spoof_risk":           round(audio_spoof, 4) if audio_features else None,
-        "video_spoof_risk":           round(video_spoof, 4) if video_features else None,
-        "text_confidence":            round(float(text_conf), 4) if text_conf is not None else None,
-        "audio_confidence":           round(float(audio_conf), 4) if audio_conf is not None else None,
-        "video_confidence":           round(float(video_conf), 4) if video_conf is not None else None,
-        "scoring_source":             source,
-        "calibration_source":         calibration_source,
-        "distress_calibration_source": distress_calibration_source,
-        "model_name":                 MODEL_NAME,
-        "model_input_features":       model_inputs,
-        "model_output_scores":        output_scores,
-        "dominant_features":          dominance,
-        "text_features":              text_features if text_features else None,
-        "audio_features":             audio_features if audio_features else None,
-        "video_features":             video_features if video_features else None,
-        "text_emotion":  text_features.get("emotion")              if text_features  else None,
-        "audio_emotion": audio_features.get("audio_emotion")       if audio_features else None,
-        "video_emotion": video_features.get("video_emotion") if video_features else None,
-    }
+    # ── Reliability-weighted confidence ───────────────────────
+    conf = np.column_stack([_optional_float(per_modality, k) for k in range(3)])  # N x 3, NaN = missing
+    reliability_weight, has_reliability = _masked_weighted_mean(conf, ~np.isnan(conf), _RELIABILITY_WEIGHTS)
+    confidence = np.where(
+        has_reliability,
+        np.clip(confidence * (0.8 + 0.2 * reliability_weight), 0.0, 1.0),
+        confidence,
+    )
+
+    # ── Calibration, flags and levels ─────────────────────────
+    crisis, calibration_source = calibrate_probabilities("crisis_score", crisis)
+    distress, distress_calibration_source = calibrate_probabilities(
+        "emotional_distress_score",
+        np.clip((stress + low_mood) / 2.0, 0.0, 1.0),
+    )
+    risk = np.where(crisis >= 0.7, "high", np.where(crisis >= 0.4, "medium", "low"))
+    wellness_f = (distress >= 0.5).astype(int)
+    crisis_f = (crisis >= 0.65).astype(int)
+
+    for j, i in enumerate(active):
+        text_features, audio_features, video_features, _ = batch[j]
+        text_conf, audio_conf, video_conf = per_modality[j][:3]
+        feat_vec = feature_rows[j]
+        output_scores = {
+            "stress_score": round(float(stress[j]), 4),
+            "low_mood_score": round(float(low_mood[j]), 4),
+            "burnout_score": round(float(burnout[j]), 4),
+            "social_withdrawal_score": round(float(soc_w[j]), 4),
+            "crisis_score": round(float(crisis[j]), 4),
+        }
+        model_inputs = {
+            k: round(float(v), 6)
+            for k, v in feature_vector_to_dict(feat_vec).items()
+        }
+        results[i] = {
+            **output_scores,
+            "emotional_distress_score":   round(float(distress[j]), 4),
+            "final_risk_probability":     round(float(crisis[j]), 4),
+            "mood_score":                 round(float(mood[j]), 4),
+            "wellness_flag":              int(wellness_f[j]),
+            "crisis_flag":                int(crisis_f[j]),
+            "support_level":              str(risk[j]),
+            "final_risk_level":           str(risk[j]),
+            "confidence_score":           round(float(confidence[j]), 4),
+            "overall_integrity_score":    round(float(overall_integrity[j]), 4),
+            "overall_spoof_risk":         round(float(overall_spoof_risk[j]), 4),
+            "text_integrity_score":       round(float(integrity[j, 0]), 4) if text_features else None,
+            "audio_integrity_score":      round(float(integrity[j, 1]), 4) if audio_features else None,
+            "video_integrity_score":      round(float(integrity[j, 2]), 4) if video_features else None,
+            "text_spoof_risk":            round(float(spoof[j, 0]), 4) if text_features else None,
+            "audio_spoof_risk":           round(float(spoof[j, 1]), 4) if audio_features else None,
+            "video_spoof_risk":           round(float(spoof[j, 2]), 4) if video_features else None,
+            "text_confidence":            round(float(text_conf), 4) if text_conf is not None else None,
+            "audio_confidence":           round(float(audio_conf), 4) if audio_conf is not None else None,
+            "video_confidence":           round(float(video_conf), 4) if video_conf is not None else None,
+            "scoring_source":             source,
+            "calibration_source":         calibration_source,
+            "distress_calibration_source": distress_calibration_source,
+            "model_name":                 MODEL_NAME,
+            "model_version":              model_info.get("version") if source == "nn" else None,
+            "model_registry_id":          model_info.get("registry_id") if source == "nn" else None,
+            "model_input_features":       model_inputs,
+            "model_output_scores":        output_scores,
+            "dominant_features":          explain_dominant_features(feat_vec, output_scores),
+            "text_features":              text_features if text_features else None,
+            "audio_features":             audio_features if audio_features else None,
+            "video_features":             video_features if video_features else None,
+            "text_emotion":  text_features.get("emotion")        if text_features  else None,
+            "audio_emotion": audio_features.get("audio_emotion") if audio_features else None,
+            "video_emotion": video_features.get("video_emotion") if video_features else None,
+        }
+    return results
 
 
 def _default_scores() -> Dict:
@@ -255,6 +310,8 @@ def _default_scores() -> Dict:
         "text_spoof_risk": None, "audio_spoof_risk": None, "video_spoof_risk": None,
         "text_confidence": None, "audio_confidence": None, "video_confidence": None,
         "model_name": MODEL_NAME,
+        "model_version": None,
+        "model_registry_id": None,
         "model_input_features": {},
         "model_output_scores": {},
         "dominant_features": {},
@@ -0,0 +1,95 @@
+"""Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one execution: the first
+caller (the leader) runs the function, everyone else waits for its result or
+exception. Nothing is kept once the flight lands, so this is not a cache.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.stats["leaders"] += 1
+            else:
+                flight.waiters += 1
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+
+class AsyncSingleFlight:
+    """Event-loop twin of SingleFlight; followers await the leader's future."""
+
+    def __init__(self) -> None:
+        self._flights: dict[str, asyncio.Future] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        existing = self._flights.get(key)
+        if existing is not None:
+            self.stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(existing)
+            except asyncio.CancelledError:
+                if not existing.cancelled():
+                    raise  # this caller was cancelled, not the leader
+                self.stats["coalesced"] -= 1
+                return await self.do(key, fn)  # leader went away; run (or join) a fresh flight
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        self.stats["leaders"] += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception retrieved when nobody else was waiting on it.
+            future.exception()
+            raise
+        finally:
+            self._flights.pop(key, None)
@@ -0,0 +1,92 @@
+"""Micro-batching engine for local text inference.
+
+Concurrent ``/text/submit`` requests and the chunks of one long journal entry
+are queued here and run through the local pipeline together, so a batch of N
+chunks costs one forward pass instead of N.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class TextBatchEngine:
+    def __init__(self, run_batch: Callable[[list[str]], list[Any]], *, max_batch_size: int = 16, max_wait_ms: float = 10.0) -> None:
+        self._run_batch = run_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_seconds = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue: queue.Queue[tuple[str, Future]] = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.stats = {"batches": 0, "items": 0, "max_batch": 0}
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._loop, name="text-batch-engine", daemon=True)
+                self._worker.start()
+
+    def submit(self, texts: list[str], timeout: float | None = None) -> list[Any]:
+        """Queue ``texts`` and block until every one of them has a result.
+
+        ``timeout`` bounds the wait for the whole submission, not each text;
+        on expiry the texts still queued are cancelled so the batch loop skips them.
+        """
+        if not texts:
+            return []
+        self._ensure_worker()
+        futures = []
+        for text in texts:
+            future: Future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            return [
+                future.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+                for future in futures
+            ]
+        except TimeoutError:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def _collect(self) -> list[tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            # Drop texts whose submitter gave up; the rest can no longer be cancelled
+            batch = [(text, future) for text, future in self._collect() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            texts = [text for text, _ in batch]
+            try:
+                outputs = self._run_batch(texts)
+                if len(outputs) != len(batch):
+                    raise RuntimeError(f"batch returned {len(outputs)} results for {len(batch)} inputs")
+            except Exception as exc:
+                logger.warning("Text batch of %d failed: %s", len(batch), exc)
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            self.stats["batches"] += 1
+            self.stats["items"] += len(batch)
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            for (_, future), output in zip(batch, outputs):
+                future.set_result(output)
@@ -0,0 +1,142 @@
+"""Bounded LRU + TTL cache for text emotion results.
+
+Keyed by model name + SHA-256 of the normalized text, so identical check-ins,
+repeated transcripts and re-submissions skip inference. Only model-backed
+results are stored; fallback results are never cached. The cache can be
+snapshotted to a JSON file on shutdown and reloaded on startup.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_CACHEABLE_SOURCES = {"local", "huggingface"}
+
+
+class TextEmotionCache:
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+    @staticmethod
+    def key(model_name: str, clean_text: str) -> str:
+        digest = hashlib.sha256(clean_text.encode("utf-8")).hexdigest()
+        return f"{model_name}:{digest}"
+
+    def get(self, model_name: str, clean_text: str) -> dict | None:
+        key = self.key(model_name, clean_text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            stored_at, result = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return dict(result)
+
+    def put(self, model_name: str, clean_text: str, result: dict) -> None:
+        if result.get("inference_source") not in _CACHEABLE_SOURCES:
+            return
+        key = self.key(model_name, clean_text)
+        with self._lock:
+            self._entries[key] = (time.time(), dict(result))
+            self._entries.move_to_end(key)
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {key: [stored_at, result] for key, (stored_at, result) in self._entries.items()}
+
+    def restore(self, entries: dict) -> int:
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            for key, (stored_at, result) in entries.items():
+                if now - float(stored_at) > self.ttl_seconds:
+                    continue
+                if result.get("inference_source") not in _CACHEABLE_SOURCES:
+                    continue
+                self._entries[key] = (float(stored_at), result)
+                loaded += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return loaded
+
+    def info(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else None,
+            }
+
+
+_cache: TextEmotionCache | None = None
+
+
+def get_text_emotion_cache() -> TextEmotionCache | None:
+    global _cache
+    settings = get_settings()
+    if not settings.text_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = TextEmotionCache(settings.text_cache_max_entries, settings.text_cache_ttl_seconds)
+    return _cache
+
+
+def load_text_emotion_cache() -> None:
+    """Reload a persisted snapshot, if persistence is configured."""
+    cache = get_text_emotion_cache()
+    path_value = get_settings().text_cache_persist_path
+    if cache is None or not path_value:
+        return
+    path = Path(path_value)
+    if not path.exists():
+        return
+    try:
+        loaded = cache.restore(json.loads(path.read_text(encoding="utf-8")))
+        logger.info("Text emotion cache restored %d entries from %s", loaded, path)
+    except Exception as exc:
+        logger.warning("Could not restore text emotion cache from %s: %s", path, exc)
+
+
+def save_text_emotion_cache() -> None:
+    cache = get_text_emotion_cache()
+    path_value = get_settings().text_cache_persist_path
+    if cache is None or not path_value:
+        return
+    path = Path(path_value)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(cache.snapshot()), encoding="utf-8")
+        logger.info("Text emotion cache saved to %s", path)
+    except Exception as exc:
+        logger.warning("Could not save text emotion cache to %s: %s", path, exc)
+
+
+def get_text_cache_stats() -> dict:
+    cache = get_text_emotion_cache()
+    return cache.info() if cache else {"enabled": False}
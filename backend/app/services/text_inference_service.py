@@ -1,10 +1,31 @@
-"""Hosted Hugging Face text-emotion analysis for MindSentry."""
+"""Text-emotion analysis for MindSentry: local cached model first, hosted Hugging Face as fallback."""
 from __future__ import annotations
 
+import logging
+import math
 import re
+import time
+from pathlib import Path
 
 from app.core.config import get_settings
+from app.services.cascade_inference_service import decide as decide_cascade, text_first_stage
+from app.services.cpu_budget_service import cpu_budget
 from app.services.hf_inference_service import HFInferenceError, get_hf_client
+from app.services.text_batch_engine import TextBatchEngine
+from app.services.text_emotion_cache import get_text_emotion_cache
+
+logger = logging.getLogger(__name__)
+
+
+class LocalTextModelUnavailable(RuntimeError):
+    """The local text model could not be loaded (as opposed to one batch failing)."""
+
+
+_LOCAL_TEXT_PIPELINES: dict[str, object] = {}
+_LOCAL_TEXT_FAILED_UNTIL: dict[str, float] = {}
+_LOCAL_FAILURE_TTL_SECONDS = 600
+_TEXT_BATCH_ENGINE: TextBatchEngine | None = None
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
 
 _STRESS_MAP = {
     "anger": 0.78,
@@ -57,7 +78,33 @@ _LABEL_MAP = {
 
 
 def _normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", (text or "").strip())[:512]
+    return re.sub(r"\s+", " ", (text or "").strip())[: get_settings().text_max_characters]
+
+
+def _chunk_text(text: str, max_chars: int) -> list[str]:
+    """Pack whole sentences into chunks of at most ``max_chars``; hard-split overlong sentences on spaces."""
+    chunks: list[str] = []
+    current = ""
+    for sentence in _SENTENCE_SPLIT.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if not sentence:
+            continue
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 def _map_label(raw_label: str) -> str:
@@ -73,6 +120,124 @@ def _top_classification_label(payload: object) -> tuple[str, float]:
     return _map_label(str(top.get("label", "neutral"))), float(top.get("score", 0.0) or 0.0)
 
 
+def _label_distribution(rows: object) -> dict[str, float]:
+    rows = rows[0] if isinstance(rows, list) and rows and isinstance(rows[0], list) else rows
+    if isinstance(rows, dict):
+        rows = [rows]
+    distribution: dict[str, float] = {}
+    for item in rows if isinstance(rows, list) else []:
+        label = _map_label(str(item.get("label", "neutral")))
+        distribution[label] = distribution.get(label, 0.0) + float(item.get("score", 0.0) or 0.0)
+    return distribution
+
+
+def _aggregate_chunk_scores(chunks: list[str], chunk_rows: list[object]) -> tuple[str, float]:
+    """Length-weighted mean of per-chunk label distributions; returns the top label and its score."""
+    totals: dict[str, float] = {}
+    total_weight = 0.0
+    for chunk, rows in zip(chunks, chunk_rows):
+        distribution = _label_distribution(rows)
+        if not distribution:
+            continue
+        weight = float(len(chunk))
+        total_weight += weight
+        for label, score in distribution.items():
+            totals[label] = totals.get(label, 0.0) + weight * score
+    if not totals or total_weight <= 0:
+        return "neutral", 0.0
+    label, weighted = max(totals.items(), key=lambda item: item[1])
+    return label, weighted / total_weight
+
+
+def _get_local_text_pipeline(model_name: str):
+    if model_name in _LOCAL_TEXT_PIPELINES:
+        return _LOCAL_TEXT_PIPELINES[model_name]
+
+    settings = get_settings()
+    cache_dir = str(Path(settings.huggingface_local_model_cache_dir).resolve())
+
+    try:
+        from transformers import pipeline
+    except Exception as exc:
+        raise RuntimeError(f"transformers_unavailable:{exc}")
+
+    logger.info("Loading local text emotion pipeline '%s' (cache_dir=%s)...", model_name, cache_dir)
+    classifier = pipeline(
+        task="text-classification",
+        model=model_name,
+        top_k=None,
+        model_kwargs={"cache_dir": cache_dir},
+    )
+    _LOCAL_TEXT_PIPELINES[model_name] = classifier
+    logger.info("Local text emotion pipeline '%s' loaded successfully.", model_name)
+    return classifier
+
+
+def preload_local_text_pipeline() -> None:
+    """Warm the configured local text model so analysis does not load it on first request."""
+    settings = get_settings()
+    if not settings.huggingface_use_local_text_cache:
+        return
+    model_name = settings.huggingface_text_model
+    try:
+        _get_local_text_pipeline(model_name)
+    except Exception as exc:
+        _LOCAL_TEXT_FAILED_UNTIL[model_name] = time.time() + _LOCAL_FAILURE_TTL_SECONDS
+        logger.warning("Failed to preload local text model '%s': %s (hosted inference will be used)", model_name, exc)
+
+
+def _run_local_text_batch(texts: list[str]) -> list[object]:
+    settings = get_settings()
+    try:
+        classifier = _get_local_text_pipeline(settings.huggingface_text_model)
+    except Exception as exc:
+        raise LocalTextModelUnavailable(str(exc)) from exc
+    with cpu_budget("text_model"):
+        outputs = classifier(texts, batch_size=len(texts), truncation=True, max_length=512)
+    return list(outputs)
+
+
+def _get_text_batch_engine() -> TextBatchEngine:
+    global _TEXT_BATCH_ENGINE
+    if _TEXT_BATCH_ENGINE is None:
+        settings = get_settings()
+        _TEXT_BATCH_ENGINE = TextBatchEngine(
+            _run_local_text_batch,
+            max_batch_size=settings.text_batch_max_size,
+            max_wait_ms=settings.text_batch_max_wait_ms,
+        )
+    return _TEXT_BATCH_ENGINE
+
+
+def _classify_chunks_locally(chunks: list[str]) -> tuple[str | None, float, list[str]]:
+    model_name = get_settings().huggingface_text_model
+    if _LOCAL_TEXT_FAILED_UNTIL.get(model_name, 0.0) > time.time():
+        return None, 0.0, []
+    engine = _get_text_batch_engine()
+    # One timeout per batch the chunks need, so a long entry isn't cut off mid-way
+    timeout = get_settings().huggingface_text_timeout_seconds * math.ceil(len(chunks) / engine.max_batch_size)
+    try:
+        rows = engine.submit(chunks, timeout=timeout)
+    except LocalTextModelUnavailable as exc:
+        # Only a model that cannot load is skipped for everyone; slow or failed batches are per-request
+        _LOCAL_TEXT_FAILED_UNTIL[model_name] = time.time() + _LOCAL_FAILURE_TTL_SECONDS
+        return None, 0.0, [f"Local text emotion model {model_name} unavailable: {exc}"]
+    except Exception as exc:
+        logger.warning("Local text inference failed for %d chunk(s): %r", len(chunks), exc)
+        return None, 0.0, [f"Local text emotion model {model_name} failed for this entry: {exc!r}"]
+    label, score = _aggregate_chunk_scores(chunks, rows)
+    return label, score, []
+
+
+def _classify_chunks_hosted(chunks: list[str]) -> tuple[str, float]:
+    client = get_hf_client()
+    if len(chunks) == 1:
+        return _top_classification_label(client.text_classification(chunks[0]))
+    payload = client.text_classification(chunks)
+    rows = payload if isinstance(payload, list) and len(payload) == len(chunks) else [payload]
+    return _aggregate_chunk_scores(chunks if len(rows) == len(chunks) else chunks[:1], rows)
+
+
 def _text_integrity(text: str, emotion_score: float) -> dict:
     tokens = re.findall(r"\w+", text.lower())
     token_count = len(tokens)
@@ -107,6 +272,14 @@ def _text_integrity(text: str, emotion_score: float) -> dict:
     }
 
 
+def _cached(result: dict, clean_text: str) -> dict:
+    """Store a model-backed result (minus per-request cascade metadata) and return it unchanged."""
+    cache = get_text_emotion_cache()
+    if cache is not None:
+        cache.put(result["model_name"], clean_text, {**result, "cascade": None})
+    return result
+
+
 def classify_emotion(text: str) -> dict:
     clean_text = _normalize_text(text)
     settings = get_settings()
@@ -119,23 +292,61 @@ def classify_emotion(text: str) -> dict:
             "warnings": ["No text provided for inference."],
         }
 
+    cache = get_text_emotion_cache()
+    if cache is not None:
+        cached = cache.get(settings.huggingface_text_model, clean_text)
+        if cached is not None:
+            return {**cached, "cache_hit": True}
+
+    cascade = None
+    if settings.cascade_inference_enabled:
+        first_stage = text_first_stage(clean_text)
+        cascade = decide_cascade("text", first_stage)
+        if not cascade.escalate:
+            return {
+                "label": first_stage.label,
+                "score": round(first_stage.score, 4),
+                "model_name": first_stage.model_name,
+                "inference_source": "cascade_first_stage",
+                "warnings": [],
+                "cascade": cascade.as_metadata(),
+            }
+
+    chunks = _chunk_text(clean_text, settings.text_chunk_max_chars)
+    warnings: list[str] = []
+    if settings.huggingface_use_local_text_cache:
+        label, score, warnings = _classify_chunks_locally(chunks)
+        if label:
+            return _cached({
+                "label": label,
+                "score": round(score, 4),
+                "model_name": settings.huggingface_text_model,
+                "inference_source": "local",
+                "warnings": warnings,
+                "chunk_count": len(chunks),
+                "cascade": cascade.as_metadata(heavy_label=label) if cascade else None,
+            }, clean_text)
+
     try:
-        payload = get_hf_client().text_classification(clean_text)
-        label, score = _top_classification_label(payload)
-        return {
+        label, score = _classify_chunks_hosted(chunks)
+        return _cached({
             "label": label,
             "score": round(score, 4),
             "model_name": settings.huggingface_text_model,
             "inference_source": "huggingface",
-            "warnings": [],
-        }
+            "warnings": warnings,
+            "chunk_count": len(chunks),
+            "cascade": cascade.as_metadata(heavy_label=label) if cascade else None,
+        }, clean_text)
     except HFInferenceError as exc:
         return {
             "label": "neutral",
             "score": 0.36,
             "model_name": settings.huggingface_text_model,
             "inference_source": "fallback",
-            "warnings": [f"Hosted text inference unavailable: {exc}"],
+            "warnings": warnings + [f"Hosted text inference unavailable: {exc}"],
+            "chunk_count": len(chunks),
+            "cascade": cascade.as_metadata() if cascade else None,
         }
 
 
@@ -152,6 +363,8 @@ def count_words(text: str) -> int:
 
 
 def analyse_text(text: str) -> dict:
+    settings = get_settings()
+    raw_length = len(re.sub(r"\s+", " ", (text or "").strip()))
     clean_text = _normalize_text(text)
     result = classify_emotion(clean_text)
     emotion = result["label"]
@@ -172,9 +385,14 @@ def analyse_text(text: str) -> dict:
         "inference_source": result["inference_source"],
         "preprocessing": {
             "normalized_whitespace": True,
-            "max_characters": 512,
+            "max_characters": settings.text_max_characters,
+            "truncated": raw_length > len(clean_text),
+            "chunk_count": int(result.get("chunk_count", 1) or 1),
+            "chunk_max_characters": settings.text_chunk_max_chars,
             "language_assumption": "en",
         },
         "warnings": result.get("warnings", []),
+        "cascade": result.get("cascade"),
+        "cache_hit": bool(result.get("cache_hit")),
         **integrity,
     }
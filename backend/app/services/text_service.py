@@ -55,18 +55,22 @@ _KEYWORD_EMOTION = {
 }
 
 
-def _keyword_fallback(text: str) -> dict:
-    """Simple lexical emotion inference used when remote model is unavailable."""
-    tokens = re.findall(r"[a-z']+", text.lower())
-    if not tokens:
-        return {"label": "neutral", "score": 0.5}
-
+def _keyword_hits(text: str) -> dict[str, int]:
+    """Count lexicon hits per emotion label."""
     hits = {k: 0 for k in _KEYWORD_EMOTION.keys()}
-    for token in tokens:
+    for token in re.findall(r"[a-z']+", text.lower()):
         for label, vocab in _KEYWORD_EMOTION.items():
             if token in vocab:
                 hits[label] += 1
+    return hits
+
+
+def _keyword_fallback(text: str) -> dict:
+    """Simple lexical emotion inference used when remote model is unavailable."""
+    if not re.findall(r"[a-z']+", text.lower()):
+        return {"label": "neutral", "score": 0.5}
 
+    hits = _keyword_hits(text)
     best_label, best_hits = max(hits.items(), key=lambda kv: kv[1])
     if best_hits == 0:
         return {"label": "neutral", "score": 0.52}
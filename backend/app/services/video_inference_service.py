@@ -1,20 +1,27 @@
 """Hosted Hugging Face visual-emotion analysis with canonical video preprocessing."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from pathlib import Path
 
 from app.utils.ffmpeg_path import *  # noqa: F401,F403
 from app.core.config import get_settings
+from app.services.cpu_budget_service import cpu_budget
+from app.services.cascade_inference_service import decide as decide_cascade, face_first_stage
 from app.services.hf_inference_service import HFInferenceError, get_hf_client
 from app.services.media_preprocessing_service import MediaPreprocessingError, preprocess_video
+from app.services.replay_detection_service import image_phash
 from app.services.text_inference_service import _map_label as map_text_label
 
 logger = logging.getLogger(__name__)
 
 _IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp", ".gif"}
 _MAX_FACE_INFERENCE_FRAMES = 3
+# Must match the fps/duration contract in media_preprocessing_service.preprocess_video.
+_CANONICAL_FPS = 15.0
+_CANONICAL_MAX_SECONDS = 15.0
 _face_detector = None
 _haar_detector = None
 _LOCAL_FACE_PIPELINES: dict[str, object] = {}
@@ -156,11 +163,16 @@ def _get_local_face_pipeline(model_name: str):
     return classifier
 
 
-def _clean_incomplete_blobs(cache_dir: str) -> None:
-    """Remove .incomplete blob files left over from interrupted downloads."""
-    import glob
-    pattern = str(Path(cache_dir) / "**" / "*.incomplete")
-    for incomplete_file in glob.glob(pattern, recursive=True):
+def _clean_incomplete_blobs(cache_dir: str, model_name: str) -> None:
+    """Remove .incomplete blobs of ``model_name`` left over from interrupted downloads.
+
+    Only the model's own ``blobs`` directory is listed; walking the whole HF
+    cache on every boot got slow once several models were cached.
+    """
+    blobs_dir = Path(cache_dir) / f"models--{model_name.replace('/', '--')}" / "blobs"
+    if not blobs_dir.is_dir():
+        return
+    for incomplete_file in blobs_dir.glob("*.incomplete"):
         try:
             Path(incomplete_file).unlink()
             logger.info("Cleaned incomplete blob: %s", incomplete_file)
@@ -179,7 +191,7 @@ def preload_local_face_pipeline() -> None:
     cache_dir = str(Path(settings.huggingface_local_model_cache_dir).resolve())
 
     # Clean up any interrupted downloads before attempting fresh load
-    _clean_incomplete_blobs(cache_dir)
+    _clean_incomplete_blobs(cache_dir, settings.huggingface_face_emotion_model)
 
     _get_local_face_pipeline(settings.huggingface_face_emotion_model)
     _PRELOAD_COMPLETE = True
@@ -201,7 +213,8 @@ def _score_face_with_local_cache(face_bytes: bytes) -> tuple[str | None, float,
         image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
         classifier = _get_local_face_pipeline(model_name)
-        payload = classifier(image)
+        with cpu_budget("face_model"):
+            payload = classifier(image)
         label, score = _parse_face_payload(payload)
         return label, max(0.0, min(1.0, score)), []
     except Exception as exc:
@@ -220,7 +233,7 @@ def _visual_integrity(input_type: str, face_ratio: float, lighting_score: float
     if lighting_score is not None and lighting_score < 0.28:
         risk += 0.15
         flags.append("poor_lighting")
-    if input_type == "video" and face_ratio < 0.25:
+    if input_type in ("video", "frames") and face_ratio < 0.25:
         risk += 0.1
         flags.append("inconsistent_face_presence")
     if confidence < 0.45:
@@ -236,7 +249,20 @@ def _visual_integrity(input_type: str, face_ratio: float, lighting_score: float
     }
 
 
-def _score_face(face_bytes: bytes) -> tuple[str | None, float, list[str], str]:
+def _score_face(face_bytes: bytes, face=None) -> tuple[str | None, float, list[str], str, dict | None]:
+    """Score one face crop through the cascade: smile first stage, then the emotion model."""
+    cascade = None
+    if get_settings().cascade_inference_enabled:
+        first_stage = face_first_stage(face)
+        cascade = decide_cascade("face", first_stage)
+        if not cascade.escalate:
+            return first_stage.label, first_stage.score, [], "cascade_first_stage", cascade.as_metadata()
+
+    label, score, warnings, source = _score_face_with_models(face_bytes)
+    return label, score, warnings, source, cascade.as_metadata(heavy_label=label) if cascade else None
+
+
+def _score_face_with_models(face_bytes: bytes) -> tuple[str | None, float, list[str], str]:
     settings = get_settings()
 
     # ── Try local model first (fast, reliable, no cold-start) ──
@@ -258,7 +284,47 @@ def _score_face(face_bytes: bytes) -> tuple[str | None, float, list[str], str]:
         return None, 0.0, [f"Hosted visual emotion inference unavailable: {exc}"], "huggingface"
 
 
-def _analyse_image(file_path) -> dict:
+async def _score_face_async(face_bytes: bytes, face=None) -> tuple[str | None, float, list[str], str, dict | None]:
+    """Async twin of _score_face: CPU stages in worker threads, hosted call awaited natively."""
+    cascade = None
+    if get_settings().cascade_inference_enabled:
+        first_stage = await asyncio.to_thread(face_first_stage, face)
+        cascade = decide_cascade("face", first_stage)
+        if not cascade.escalate:
+            return first_stage.label, first_stage.score, [], "cascade_first_stage", cascade.as_metadata()
+
+    label, score, warnings, source = await _score_face_with_models_async(face_bytes)
+    return label, score, warnings, source, cascade.as_metadata(heavy_label=label) if cascade else None
+
+
+async def _score_face_with_models_async(face_bytes: bytes) -> tuple[str | None, float, list[str], str]:
+    settings = get_settings()
+
+    if settings.huggingface_use_local_video_cache:
+        local_label, local_score, local_warnings = await asyncio.to_thread(_score_face_with_local_cache, face_bytes)
+        if local_label:
+            return local_label, local_score, local_warnings, "local_cached"
+
+    try:
+        payload = await get_hf_client().aimage_classification(
+            face_bytes,
+            model_id=settings.huggingface_face_emotion_model,
+        )
+        label, score = _parse_face_payload(payload)
+        return label, max(0.0, min(1.0, score)), [], "huggingface"
+    except HFInferenceError as exc:
+        return None, 0.0, [f"Hosted visual emotion inference unavailable: {exc}"], "huggingface"
+
+
+def _video_inference_source(used_local_face_model: bool, cascade_steps: list[dict]) -> str:
+    if used_local_face_model:
+        return "local_cached"
+    if cascade_steps and all(step.get("stage") == "first" for step in cascade_steps):
+        return "cascade_first_stage"
+    return "huggingface"
+
+
+def _scan_image(file_path) -> dict:
     import cv2
 
     img = cv2.imread(str(file_path))
@@ -267,47 +333,362 @@ def _analyse_image(file_path) -> dict:
 
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     height, width = gray.shape
-    lighting_score = round(min(1.0, (float(gray.mean()) / 255.0) / 0.67), 3)
-
     face_crop = _extract_best_face(img)
+    return {
+        "width": width,
+        "height": height,
+        "lighting_score": round(min(1.0, (float(gray.mean()) / 255.0) / 0.67), 3),
+        "face_crop": face_crop,
+        "face_bytes": _encode_face(face_crop) if face_crop is not None else None,
+        "fingerprint": image_phash(face_crop if face_crop is not None else img),
+    }
+
+
+def _image_result(scan: dict, scored: tuple | None) -> dict:
     warnings: list[str] = []
     video_emotion = None
     confidence = 0.0
     inference_source = "huggingface"
-    if face_crop is not None:
-        face_bytes = _encode_face(face_crop)
-        if face_bytes:
-            video_emotion, confidence, warnings, inference_source = _score_face(face_bytes)
-    else:
+    cascade = None
+    face_found = scan["face_crop"] is not None
+    if scored is not None:
+        video_emotion, confidence, warnings, inference_source, cascade = scored
+    elif not face_found:
         warnings.append("No usable face crop found.")
 
-    integrity = _visual_integrity("photo", 1.0 if face_crop is not None else 0.0, lighting_score, confidence, 1.0)
+    integrity = _visual_integrity("photo", 1.0 if face_found else 0.0, scan["lighting_score"], confidence, 1.0)
     return {
         "duration_seconds": 0.0,
         "fps": 0.0,
-        "resolution_width": width,
-        "resolution_height": height,
-        "face_detected": 1 if face_crop is not None else 0,
-        "face_ratio": 1.0 if face_crop is not None else 0.0,
-        "lighting_score": lighting_score,
+        "resolution_width": scan["width"],
+        "resolution_height": scan["height"],
+        "face_detected": 1 if face_found else 0,
+        "face_ratio": 1.0 if face_found else 0.0,
+        "lighting_score": scan["lighting_score"],
         "video_emotion": video_emotion,
         "video_emotion_confidence": round(float(confidence or 0.0), 4),
         "video_model_name": get_settings().huggingface_face_emotion_model,
         "inference_source": inference_source,
         "warnings": warnings,
+        "cascade": [cascade] if cascade else [],
+        "fingerprints": [scan["fingerprint"]] if scan["fingerprint"] else [],
         **integrity,
     }
 
 
-def analyse_video(file_path) -> dict:
+def _analyse_image(file_path) -> dict:
+    scan = _scan_image(file_path)
+    scored = _score_face(scan["face_bytes"], scan["face_crop"]) if scan["face_bytes"] else None
+    return _image_result(scan, scored)
+
+
+async def _analyse_image_async(file_path) -> dict:
+    scan = await asyncio.to_thread(_scan_image, file_path)
+    scored = await _score_face_async(scan["face_bytes"], scan["face_crop"]) if scan["face_bytes"] else None
+    return _image_result(scan, scored)
+
+
+def _video_error_result(warning: str, flag: str, input_type: str = "video") -> dict:
+    return {
+        "duration_seconds": 0.0,
+        "fps": 0.0,
+        "resolution_width": 0,
+        "resolution_height": 0,
+        "face_detected": 0,
+        "face_ratio": 0.0,
+        "lighting_score": 0.0,
+        "video_emotion": None,
+        "video_emotion_confidence": 0.0,
+        "video_model_name": get_settings().huggingface_face_emotion_model,
+        "inference_source": "huggingface",
+        "warnings": [warning],
+        "video_input_type": input_type,
+        "video_integrity_score": 0.0,
+        "video_spoof_risk": 1.0,
+        "video_integrity_flags": [flag],
+    }
+
+
+def plan_frame_sample_indices(total_frames: int) -> list[int]:
+    """Frame indices sampled from a clip: 3-6 evenly spaced frames between 10% and 90%."""
+    if total_frames <= 0:
+        return [0, 5, 10, 15]
+    sample_count = min(6, max(3, total_frames))
+    start_frame = int(total_frames * 0.1)
+    end_frame = max(start_frame + 1, int(total_frames * 0.9))
+    span = max(1, end_frame - start_frame)
+    step = max(1, span // sample_count)
+    sample_indices = list(range(start_frame, end_frame, step))[:sample_count]
+    return sample_indices or [max(0, total_frames // 2)]
+
+
+def plan_frame_sample_timestamps(duration_seconds: float) -> list[float]:
+    """Timestamps (seconds) a client should capture to match analyse_video sampling."""
+    duration = max(0.0, min(float(duration_seconds or 0.0), _CANONICAL_MAX_SECONDS))
+    total_frames = int(duration * _CANONICAL_FPS)
+    return [round(idx / _CANONICAL_FPS, 3) for idx in plan_frame_sample_indices(total_frames)]
+
+
+def _scan_sampled_frames(frames) -> dict:
+    """CPU pass over already-sampled BGR frames (None = decode failure): lighting, faces, fingerprints.
+
+    Returns the face crops to score (capped at _MAX_FACE_INFERENCE_FRAMES) so the
+    model calls can run either inline or concurrently.
+    """
     import cv2
 
-    total_start = time.perf_counter()
-    path = Path(str(file_path))
-    if path.suffix.lower() in _IMAGE_EXTENSIONS:
-        return _analyse_image(file_path)
+    brightness_values = []
+    fingerprints: list[str] = []
+    candidates: list[tuple[bytes, object]] = []
+    face_hits = 0
+    decode_hits = 0
+
+    for frame in frames:
+        if frame is None:
+            continue
+        decode_hits += 1
+
+        with cpu_budget("video_frames"):
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            brightness_values.append(float(gray.mean()) / 255.0)
+            face_crop = _extract_best_face(frame)
+        if face_crop is None:
+            continue
+
+        face_hits += 1
+        fingerprint = image_phash(face_crop)
+        if fingerprint:
+            fingerprints.append(fingerprint)
+        face_bytes = _encode_face(face_crop)
+        if not face_bytes:
+            continue
+
+        if len(candidates) < _MAX_FACE_INFERENCE_FRAMES:
+            candidates.append((face_bytes, face_crop))
+
+    return {
+        "brightness_values": brightness_values,
+        "fingerprints": fingerprints,
+        "candidates": candidates,
+        "face_hits": face_hits,
+        "decode_hits": decode_hits,
+    }
+
+
+def _summarize_sampled_frames(scan: dict, scored: list[tuple], sampled: int, model_inference_seconds: float) -> dict:
+    """Combine the frame scan with per-face ``_score_face`` results into the frame summary."""
+    emotions: list[str] = []
+    confidences: list[float] = []
+    warning_set: set[str] = set()
+    used_local_face_model = False
+    cascade_steps: list[dict] = []
+
+    for label, score, score_warnings, score_source, cascade in scored:
+        warning_set.update(score_warnings)
+        if cascade:
+            cascade_steps.append(cascade)
+        if score_source == "local_cached":
+            used_local_face_model = True
+        if label:
+            emotions.append(label)
+            confidences.append(score)
+
+    face_hits = scan["face_hits"]
+    if face_hits > _MAX_FACE_INFERENCE_FRAMES:
+        warning_set.add(
+            f"Capped hosted visual emotion inference to {_MAX_FACE_INFERENCE_FRAMES} face frames to bound latency."
+        )
+
+    sampled = max(1, sampled)
+    face_ratio = face_hits / sampled
+    frame_success_ratio = scan["decode_hits"] / sampled
+
+    brightness_values = scan["brightness_values"]
+    lighting_score = (
+        round(min(1.0, ((sum(brightness_values) / max(1, len(brightness_values))) / 0.67)), 3)
+        if brightness_values
+        else 0.0
+    )
+
+    video_emotion = None
+    confidence = 0.0
+    if emotions:
+        candidates: dict[str, float] = {}
+        for label, score in zip(emotions, confidences):
+            candidates[label] = candidates.get(label, 0.0) + score
+        video_emotion = max(candidates.items(), key=lambda item: item[1])[0]
+        count = max(1, emotions.count(video_emotion))
+        confidence = candidates[video_emotion] / count
+    else:
+        warning_set.add("No valid face crop produced a supported visual emotion result.")
+
+    return {
+        "face_ratio": face_ratio,
+        "frame_success_ratio": frame_success_ratio,
+        "lighting_score": lighting_score,
+        "video_emotion": video_emotion,
+        "confidence": confidence,
+        "inference_source": _video_inference_source(used_local_face_model, cascade_steps),
+        "warnings": warning_set,
+        "cascade": cascade_steps,
+        "fingerprints": scan["fingerprints"],
+        "model_calls": len(scored),
+        "model_inference_seconds": model_inference_seconds,
+    }
+
+
+def _analyse_sampled_frames(frames, sampled: int) -> dict:
+    """Run face detection + classification over already-sampled BGR frames (None = decode failure)."""
+    scan = _scan_sampled_frames(frames)
+    infer_start = time.perf_counter()
+    scored = [_score_face(face_bytes, face_crop) for face_bytes, face_crop in scan["candidates"]]
+    return _summarize_sampled_frames(scan, scored, sampled, time.perf_counter() - infer_start)
+
+
+async def _analyse_sampled_frames_async(frames, sampled: int) -> dict:
+    """Async twin of _analyse_sampled_frames: scan in a worker thread, score face crops concurrently."""
+    scan = await asyncio.to_thread(_scan_sampled_frames, frames)
+    infer_start = time.perf_counter()
+    scored = await asyncio.gather(*[
+        _score_face_async(face_bytes, face_crop) for face_bytes, face_crop in scan["candidates"]
+    ])
+    return _summarize_sampled_frames(scan, list(scored), sampled, time.perf_counter() - infer_start)
+
+
+def _frame_result(
+    summary: dict,
+    *,
+    input_type: str,
+    duration: float,
+    fps: float,
+    width: int,
+    height: int,
+    total_start: float,
+    extra_flags: list[str] | None = None,
+) -> dict:
+    integrity = _visual_integrity(
+        input_type,
+        summary["face_ratio"],
+        summary["lighting_score"],
+        summary["confidence"],
+        summary["frame_success_ratio"],
+    )
+    for flag in extra_flags or []:
+        integrity["video_integrity_flags"].append(flag)
+        spoof_risk = min(1.0, integrity["video_spoof_risk"] + 0.1)
+        integrity["video_spoof_risk"] = round(spoof_risk, 4)
+        integrity["video_integrity_score"] = round(1.0 - spoof_risk, 4)
+
+    return {
+        "duration_seconds": round(duration, 2),
+        "fps": round(fps, 1),
+        "resolution_width": width,
+        "resolution_height": height,
+        "face_detected": int(summary["face_ratio"] > 0.0),
+        "face_ratio": round(summary["face_ratio"], 3),
+        "lighting_score": summary["lighting_score"],
+        "video_emotion": summary["video_emotion"],
+        "video_emotion_confidence": round(float(summary["confidence"] or 0.0), 4),
+        "video_model_name": get_settings().huggingface_face_emotion_model,
+        "inference_source": summary["inference_source"],
+        "analysis_latency_ms": int((time.perf_counter() - total_start) * 1000),
+        "warnings": sorted(summary["warnings"]),
+        "frame_success_ratio": round(summary["frame_success_ratio"], 3),
+        "cascade": summary["cascade"],
+        "fingerprints": summary["fingerprints"],
+        **integrity,
+    }
+
+
+def _video_preflight(file_path) -> tuple[str | None, dict]:
+    """Cheap duration + face gate on the raw upload, before transcoding or any model.
+
+    Returns (gate, info); gate is None when the upload should go through full
+    analysis, including when OpenCV cannot decode the raw container.
+    """
+    import cv2
+
+    settings = get_settings()
+    cap = cv2.VideoCapture(str(file_path))
+    if not cap.isOpened():
+        return None, {}
+    try:
+        fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        info = {
+            "fps": fps,
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0),
+            "duration_seconds": (total_frames / fps) if fps > 0 and total_frames > 0 else 0.0,
+            "lighting_score": None,
+        }
+        if fps > 0 and total_frames > 0 and info["duration_seconds"] < float(settings.early_reject_min_video_seconds):
+            return "too_short", info
+
+        planned = plan_frame_sample_indices(total_frames)
+        probe_indices = sorted({planned[0], planned[len(planned) // 2]})
+        brightness_values = []
+        for idx in probe_indices:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, float(idx))
+            ok, frame = cap.read()
+            if not ok or frame is None:
+                continue
+            brightness_values.append(float(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY).mean()) / 255.0)
+            # Raw phone uploads may not be rotation-normalised yet, so also try portrait turns.
+            for candidate in (frame, cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE), cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)):
+                if _extract_best_face(candidate) is not None:
+                    return None, info
+
+        if not brightness_values:
+            return None, info
+        info["lighting_score"] = round(min(1.0, (sum(brightness_values) / len(brightness_values)) / 0.67), 3)
+        return "no_face", info
+    finally:
+        cap.release()
+
+
+def _early_reject_video_result(gate: str, info: dict, total_start: float) -> dict:
+    lighting_score = info.get("lighting_score")
+    integrity = _visual_integrity("video", 0.0, lighting_score, 0.0, 1.0)
+    return {
+        "duration_seconds": round(float(info.get("duration_seconds") or 0.0), 2),
+        "fps": round(float(info.get("fps") or 0.0), 1),
+        "resolution_width": int(info.get("width") or 0),
+        "resolution_height": int(info.get("height") or 0),
+        "face_detected": 0,
+        "face_ratio": 0.0,
+        "lighting_score": lighting_score if lighting_score is not None else 0.0,
+        "video_emotion": None,
+        "video_emotion_confidence": 0.0,
+        "video_model_name": get_settings().huggingface_face_emotion_model,
+        "inference_source": "fallback",
+        "analysis_latency_ms": int((time.perf_counter() - total_start) * 1000),
+        "warnings": [f"Early reject: {gate}; transcoding and face inference were skipped."],
+        "early_reject": {"gate": gate},
+        "cascade": [],
+        **integrity,
+    }
+
+
+def _prepare_video(file_path, total_start: float) -> tuple[dict | None, dict | None]:
+    """Pre-flight, transcode and read the sampled frames of an uploaded clip.
+
+    Returns (final_result, sampled): final_result is set when the clip was
+    rejected or could not be decoded, otherwise sampled holds the frames and
+    stream metadata for face analysis.
+    """
+    import cv2
+
+    if get_settings().early_reject_enabled:
+        try:
+            gate, info = _video_preflight(file_path)
+        except Exception as exc:
+            gate, info = None, {}
+            logger.warning("Video pre-flight skipped for %s: %s", file_path, exc)
+        if gate:
+            logger.info("Video early reject (%s) in %.2fs for %s", gate, time.perf_counter() - total_start, file_path)
+            return _early_reject_video_result(gate, info, total_start), None
 
-    warnings: list[str] = []
     try:
         preprocess_start = time.perf_counter()
         canonical = preprocess_video(file_path)
@@ -319,45 +700,11 @@ def analyse_video(file_path) -> dict:
         canonical_path = canonical["canonical_path"]
     except MediaPreprocessingError as exc:
         logger.error("Video preprocessing failed for %s: %s", file_path, exc)
-        return {
-            "duration_seconds": 0.0,
-            "fps": 0.0,
-            "resolution_width": 0,
-            "resolution_height": 0,
-            "face_detected": 0,
-            "face_ratio": 0.0,
-            "lighting_score": 0.0,
-            "video_emotion": None,
-            "video_emotion_confidence": 0.0,
-            "video_model_name": get_settings().huggingface_face_emotion_model,
-            "inference_source": "huggingface",
-            "warnings": [f"Video preprocessing error: {str(exc)}"],
-            "video_input_type": "video",
-            "video_integrity_score": 0.0,
-            "video_spoof_risk": 1.0,
-            "video_integrity_flags": ["preprocessing_error"],
-        }
+        return _video_error_result(f"Video preprocessing error: {str(exc)}", "preprocessing_error"), None
 
     cap = cv2.VideoCapture(str(canonical_path))
     if not cap.isOpened():
-        return {
-            "duration_seconds": 0.0,
-            "fps": 0.0,
-            "resolution_width": 0,
-            "resolution_height": 0,
-            "face_detected": 0,
-            "face_ratio": 0.0,
-            "lighting_score": 0.0,
-            "video_emotion": None,
-            "video_emotion_confidence": 0.0,
-            "video_model_name": get_settings().huggingface_face_emotion_model,
-            "inference_source": "huggingface",
-            "warnings": ["Could not open canonical video stream."],
-            "video_input_type": "video",
-            "video_integrity_score": 0.0,
-            "video_spoof_risk": 1.0,
-            "video_integrity_flags": ["decoding_error"],
-        }
+        return _video_error_result("Could not open canonical video stream.", "decoding_error"), None
 
     try:
         fps = float(cap.get(cv2.CAP_PROP_FPS) or canonical.get("fps") or 0.0)
@@ -366,134 +713,154 @@ def analyse_video(file_path) -> dict:
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or canonical.get("height") or 0)
         duration = float((total_frames / fps) if fps > 0 and total_frames > 0 else canonical.get("duration_seconds") or 0.0)
 
-        if total_frames <= 0:
-            sample_indices = [0, 5, 10, 15]
-        else:
-            sample_count = min(6, max(3, total_frames))
-            start_frame = int(total_frames * 0.1)
-            end_frame = max(start_frame + 1, int(total_frames * 0.9))
-            span = max(1, end_frame - start_frame)
-            step = max(1, span // sample_count)
-            sample_indices = list(range(start_frame, end_frame, step))[:sample_count]
-            if not sample_indices:
-                sample_indices = [max(0, total_frames // 2)]
-
-        brightness_values = []
-        emotions: list[str] = []
-        confidences: list[float] = []
-        warning_set: set[str] = set(warnings)
-        used_local_face_model = False
-        face_hits = 0
-        decode_hits = 0
-        model_calls = 0
-        model_inference_seconds = 0.0
-
-        for idx in sample_indices:
+        frames = []
+        for idx in plan_frame_sample_indices(total_frames):
             cap.set(cv2.CAP_PROP_POS_FRAMES, float(idx))
             ok, frame = cap.read()
-            if not ok or frame is None:
-                continue
-            decode_hits += 1
+            frames.append(frame if ok else None)
+        return None, {"frames": frames, "fps": fps, "width": width, "height": height, "duration": duration}
+    except Exception as exc:
+        logger.error("Unexpected error processing video %s: %s", file_path, exc, exc_info=True)
+        return _video_error_result(f"Video processing error: {str(exc)}", "decoding_error"), None
+    finally:
+        cap.release()
 
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            brightness_values.append(float(gray.mean()) / 255.0)
 
-            face_crop = _extract_best_face(frame)
-            if face_crop is None:
-                continue
+def _video_summary_result(summary: dict, sampled: dict, file_path, total_start: float) -> dict:
+    logger.info(
+        "Video analysis completed in %.2fs for %s (model_calls=%d, model_inference=%.2fs)",
+        time.perf_counter() - total_start,
+        file_path,
+        summary["model_calls"],
+        summary["model_inference_seconds"],
+    )
+    return _frame_result(
+        summary,
+        input_type="video",
+        duration=sampled["duration"],
+        fps=sampled["fps"],
+        width=sampled["width"],
+        height=sampled["height"],
+        total_start=total_start,
+    )
 
-            face_hits += 1
-            face_bytes = _encode_face(face_crop)
-            if not face_bytes:
-                continue
 
-            if model_calls >= _MAX_FACE_INFERENCE_FRAMES:
-                continue
+def analyse_video(file_path) -> dict:
+    total_start = time.perf_counter()
+    path = Path(str(file_path))
+    if path.suffix.lower() in _IMAGE_EXTENSIONS:
+        return _analyse_image(file_path)
 
-            frame_infer_start = time.perf_counter()
-            label, score, score_warnings, score_source = _score_face(face_bytes)
-            model_inference_seconds += time.perf_counter() - frame_infer_start
-            model_calls += 1
-            warning_set.update(score_warnings)
-            if score_source == "local_cached":
-                used_local_face_model = True
-            if label:
-                emotions.append(label)
-                confidences.append(score)
-
-        if face_hits > _MAX_FACE_INFERENCE_FRAMES:
-            warning_set.add(
-                f"Capped hosted visual emotion inference to {_MAX_FACE_INFERENCE_FRAMES} face frames to bound latency."
-            )
+    final, sampled = _prepare_video(file_path, total_start)
+    if final is not None:
+        return final
+    try:
+        summary = _analyse_sampled_frames(sampled["frames"], len(sampled["frames"]))
+        return _video_summary_result(summary, sampled, file_path, total_start)
+    except Exception as exc:
+        logger.error("Unexpected error processing video %s: %s", file_path, exc, exc_info=True)
+        return _video_error_result(f"Video processing error: {str(exc)}", "decoding_error")
 
-        sampled = max(1, len(sample_indices))
-        face_ratio = face_hits / sampled
-        frame_success_ratio = decode_hits / sampled
 
-        lighting_score = (
-            round(min(1.0, ((sum(brightness_values) / max(1, len(brightness_values))) / 0.67)), 3)
-            if brightness_values
-            else 0.0
-        )
+async def analyse_video_async(file_path) -> dict:
+    """Async twin of analyse_video for the upload endpoint.
 
-        video_emotion = None
-        confidence = 0.0
-        if emotions:
-            candidates: dict[str, float] = {}
-            for label, score in zip(emotions, confidences):
-                candidates[label] = candidates.get(label, 0.0) + score
-            video_emotion = max(candidates.items(), key=lambda item: item[1])[0]
-            count = max(1, emotions.count(video_emotion))
-            confidence = candidates[video_emotion] / count
-        else:
-            warning_set.add("No valid face crop produced a supported visual emotion result.")
+    Decoding, transcoding and face detection run in worker threads; hosted face
+    calls are awaited on the event loop, so a slow upstream does not pin threads.
+    """
+    total_start = time.perf_counter()
+    path = Path(str(file_path))
+    if path.suffix.lower() in _IMAGE_EXTENSIONS:
+        return await _analyse_image_async(file_path)
 
-        integrity = _visual_integrity("video", face_ratio, lighting_score, confidence, frame_success_ratio)
+    final, sampled = await asyncio.to_thread(_prepare_video, file_path, total_start)
+    if final is not None:
+        return final
+    try:
+        summary = await _analyse_sampled_frames_async(sampled["frames"], len(sampled["frames"]))
+        return _video_summary_result(summary, sampled, file_path, total_start)
+    except Exception as exc:
+        logger.error("Unexpected error processing video %s: %s", file_path, exc, exc_info=True)
+        return _video_error_result(f"Video processing error: {str(exc)}", "decoding_error")
 
-        logger.info(
-            "Video analysis completed in %.2fs for %s (model_calls=%d, model_inference=%.2fs)",
-            time.perf_counter() - total_start,
-            file_path,
-            model_calls,
-            model_inference_seconds,
-        )
 
-        return {
-            "duration_seconds": round(duration, 2),
-            "fps": round(fps, 1),
-            "resolution_width": width,
-            "resolution_height": height,
-            "face_detected": int(face_ratio > 0.0),
-            "face_ratio": round(face_ratio, 3),
-            "lighting_score": lighting_score,
-            "video_emotion": video_emotion,
-            "video_emotion_confidence": round(float(confidence or 0.0), 4),
-            "video_model_name": get_settings().huggingface_face_emotion_model,
-            "inference_source": "local_cached" if used_local_face_model else "huggingface",
-            "analysis_latency_ms": int((time.perf_counter() - total_start) * 1000),
-            "warnings": sorted(warning_set),
-            "frame_success_ratio": round(frame_success_ratio, 3),
-            **integrity,
-        }
+def _decode_frame_batch(frame_payloads: list[bytes], timestamps: list[float]) -> dict:
+    import cv2
+    import numpy as np
+
+    frames = [
+        cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR) if payload else None
+        for payload in frame_payloads
+    ]
+    decoded = [frame for frame in frames if frame is not None]
+    height, width = decoded[0].shape[:2] if decoded else (0, 0)
+
+    extra_flags: list[str] = []
+    ordered = sorted(timestamps)
+    if len(ordered) > 1 and (ordered != list(timestamps) or len(set(ordered)) != len(ordered)):
+        extra_flags.append("frame_timestamp_irregular")
+    # Sampled frames span the 10%..90% window of the clip, so scale back up.
+    duration = (ordered[-1] - ordered[0]) / 0.8 if len(ordered) > 1 else 0.0
+    fps = ((len(ordered) - 1) / (ordered[-1] - ordered[0])) if len(ordered) > 1 and ordered[-1] > ordered[0] else 0.0
+    return {
+        "frames": frames,
+        "width": int(width),
+        "height": int(height),
+        "duration": duration,
+        "fps": fps,
+        "extra_flags": extra_flags,
+    }
+
+
+def _frame_batch_result(summary: dict, batch: dict, total_start: float) -> dict:
+    logger.info(
+        "Frame batch analysis completed in %.2fs (frames=%d, model_calls=%d, model_inference=%.2fs)",
+        time.perf_counter() - total_start,
+        len(batch["frames"]),
+        summary["model_calls"],
+        summary["model_inference_seconds"],
+    )
+    return _frame_result(
+        summary,
+        input_type="frames",
+        duration=batch["duration"],
+        fps=batch["fps"],
+        width=batch["width"],
+        height=batch["height"],
+        total_start=total_start,
+        extra_flags=batch["extra_flags"],
+    )
+
+
+def analyse_frames(frame_payloads: list[bytes], timestamps: list[float]) -> dict:
+    """Analyse a client-sampled batch of JPEG/WebP/PNG frames without video transcoding.
+
+    Frames are expected in the pattern returned by plan_frame_sample_timestamps,
+    and the result uses the same schema as analyse_video.
+    """
+    total_start = time.perf_counter()
+    if not frame_payloads:
+        return _video_error_result("No frames received.", "decoding_error", input_type="frames")
+
+    try:
+        batch = _decode_frame_batch(frame_payloads, timestamps)
+        summary = _analyse_sampled_frames(batch["frames"], len(batch["frames"]))
+        return _frame_batch_result(summary, batch, total_start)
     except Exception as exc:
-        logger.error("Unexpected error processing video %s: %s", file_path, exc, exc_info=True)
-        return {
-            "duration_seconds": 0.0,
-            "fps": 0.0,
-            "resolution_width": 0,
-            "resolution_height": 0,
-            "face_detected": 0,
-            "face_ratio": 0.0,
-            "lighting_score": 0.0,
-            "video_emotion": None,
-            "video_emotion_confidence": 0.0,
-            "video_model_name": get_settings().huggingface_face_emotion_model,
-            "inference_source": "huggingface",
-            "warnings": [f"Video processing error: {str(exc)}"],
-            "video_input_type": "video",
-            "video_integrity_score": 0.0,
-            "video_spoof_risk": 1.0,
-            "video_integrity_flags": ["decoding_error"],
-        }
-    finally:
-        cap.release()
+        logger.error("Unexpected error processing frame batch: %s", exc, exc_info=True)
+        return _video_error_result(f"Frame processing error: {str(exc)}", "decoding_error", input_type="frames")
+
+
+async def analyse_frames_async(frame_payloads: list[bytes], timestamps: list[float]) -> dict:
+    """Async twin of analyse_frames used by the frame-batch endpoint."""
+    total_start = time.perf_counter()
+    if not frame_payloads:
+        return _video_error_result("No frames received.", "decoding_error", input_type="frames")
+
+    try:
+        batch = await asyncio.to_thread(_decode_frame_batch, frame_payloads, timestamps)
+        summary = await _analyse_sampled_frames_async(batch["frames"], len(batch["frames"]))
+        return _frame_batch_result(summary, batch, total_start)
+    except Exception as exc:
+        logger.error("Unexpected error processing frame batch: %s", exc, exc_info=True)
+        return _video_error_result(f"Frame processing error: {str(exc)}", "decoding_error", input_type="frames")
@@ -0,0 +1,185 @@
+"""Background warm-up for local models and lazy code paths.
+
+Startup no longer blocks on model loads. ``run_warmup`` (run in a worker
+thread from the lifespan) loads each local model from the cache and pushes one
+dummy input through it, pre-compiles the librosa/numba paths used by
+``extract_audio_features``, and loads the fusion and calibration pickles.
+``get_readiness`` reports per-component state for the ``/ready`` endpoint.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import wave
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+WARMING = "warming"
+WARM = "warm"
+FAILED = "failed"
+DISABLED = "disabled"
+
+_COMPONENTS = ("opencv", "face_model", "audio_ser", "audio_features", "text_model", "fusion_nn", "risk_calibration")
+
+_lock = threading.Lock()
+_state: dict[str, dict] = {name: {"status": PENDING} for name in _COMPONENTS}
+_finished = False
+
+
+def _set(name: str, status: str, **extra) -> None:
+    with _lock:
+        _state[name] = {"status": status, **extra}
+
+
+def _warm_opencv() -> None:
+    import numpy as np
+
+    from app.services.cascade_inference_service import _get_smile_detector
+    from app.services.video_inference_service import _extract_best_face, _get_face_detector, _get_haar_detector
+
+    _get_face_detector()
+    _get_haar_detector()
+    _get_smile_detector()
+    _extract_best_face(np.full((240, 320, 3), 128, dtype=np.uint8))
+
+
+def _warm_face_model() -> str | None:
+    import cv2
+    import numpy as np
+
+    from app.services.video_inference_service import _score_face_with_local_cache, preload_local_face_pipeline
+
+    if not get_settings().huggingface_use_local_video_cache:
+        return DISABLED
+    preload_local_face_pipeline()
+    ok, encoded = cv2.imencode(".jpg", np.full((96, 96, 3), 180, dtype=np.uint8))
+    if not ok:
+        raise RuntimeError("could not encode warm-up image")
+    label, _, warnings = _score_face_with_local_cache(encoded.tobytes())
+    if label is None:
+        raise RuntimeError("; ".join(warnings) or "no prediction")
+    return None
+
+
+def _warm_audio_ser() -> str | None:
+    import numpy as np
+
+    from app.services.audio_inference_service import _LOCAL_SER_PIPELINES, preload_local_audio_pipelines
+
+    if not get_settings().huggingface_use_local_audio_cache:
+        return DISABLED
+    preload_local_audio_pipelines()
+    if not _LOCAL_SER_PIPELINES:
+        raise RuntimeError("no local SER model could be loaded")
+    dummy = {"array": np.zeros(16000, dtype=np.float32), "sampling_rate": 16000}
+    for classifier in list(_LOCAL_SER_PIPELINES.values()):
+        classifier(dummy)
+    return None
+
+
+def _warm_audio_features() -> str | None:
+    """Run extract_audio_features once on a synthetic clip so numba JIT-compiles pyin & co."""
+    import numpy as np
+
+    from app.services.audio_inference_service import extract_audio_features
+
+    sr = 16000
+    t = np.arange(sr) / sr
+    tone = 0.3 * np.sin(2 * np.pi * 220.0 * t) + 0.01 * np.random.default_rng(0).standard_normal(sr)
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        with wave.open(path, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sr)
+            wav_file.writeframes((tone * 32767).astype(np.int16).tobytes())
+        features = extract_audio_features(path)
+    finally:
+        os.unlink(path)
+    if "error" in features:
+        raise RuntimeError(features["error"])
+    return None
+
+
+def _warm_text_model() -> str | None:
+    from app.services.text_inference_service import _LOCAL_TEXT_PIPELINES, _run_local_text_batch, preload_local_text_pipeline
+
+    settings = get_settings()
+    if not settings.huggingface_use_local_text_cache:
+        return DISABLED
+    preload_local_text_pipeline()
+    if settings.huggingface_text_model not in _LOCAL_TEXT_PIPELINES:
+        raise RuntimeError("local text model could not be loaded")
+    _run_local_text_batch(["Warm-up sentence for the text emotion model."])
+    return None
+
+
+def _warm_fusion_nn() -> str | None:
+    from app.services import fusion_nn
+
+    if fusion_nn._load() is None:
+        return DISABLED  # not trained yet; scoring uses the heuristic
+    fusion_nn.predict([0.0] * len(fusion_nn.FEATURE_NAMES))
+    return None
+
+
+def _warm_risk_calibration() -> str | None:
+    from app.services import risk_calibration_service
+
+    metrics = risk_calibration_service.calibration_metrics()
+    if not metrics:
+        return DISABLED  # no calibrator fitted; identity calibration
+    for metric_name in metrics:
+        risk_calibration_service.calibrate_probability(metric_name, 0.5)
+    return None
+
+
+_STEPS = {
+    "opencv": _warm_opencv,
+    "face_model": _warm_face_model,
+    "audio_ser": _warm_audio_ser,
+    "audio_features": _warm_audio_features,
+    "text_model": _warm_text_model,
+    "fusion_nn": _warm_fusion_nn,
+    "risk_calibration": _warm_risk_calibration,
+}
+
+
+def run_warmup() -> dict:
+    """Warm every component once; failures are recorded, never raised."""
+    global _finished
+    logger.info("=== MODEL WARM-UP START (background, offline cache only) ===")
+    for name in _COMPONENTS:
+        _set(name, WARMING)
+        started = time.perf_counter()
+        try:
+            outcome = _STEPS[name]()
+            seconds = round(time.perf_counter() - started, 2)
+            _set(name, outcome or WARM, seconds=seconds)
+            logger.info("[Warm-up] %s: %s in %.2fs", name, outcome or WARM, seconds)
+        except Exception as exc:
+            _set(name, FAILED, seconds=round(time.perf_counter() - started, 2), detail=str(exc)[:200])
+            logger.warning("[Warm-up] %s failed: %s", name, exc)
+    with _lock:
+        _finished = True
+    logger.info("=== MODEL WARM-UP COMPLETE ===")
+    return get_readiness()
+
+
+def get_readiness() -> dict:
+    """Ready once every component finished warming; failed ones fall back and are reported as degraded."""
+    with _lock:
+        components = {name: dict(info) for name, info in _state.items()}
+        finished = _finished
+    return {
+        "ready": finished,
+        "degraded": [name for name, info in components.items() if info["status"] == FAILED],
+        "components": components,
+    }
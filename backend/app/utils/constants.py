@@ -49,6 +49,9 @@ WELLNESS_FLAG_THRESHOLD = 0.5   # distress_score above this raises wellness_flag
 MAX_AUDIO_SIZE_MB = 50
 MAX_VIDEO_SIZE_MB = 200
 ALLOWED_AUDIO_TYPES = {"audio/wav", "audio/mpeg", "audio/ogg", "audio/webm", "audio/mp4"}
+MAX_FRAME_SIZE_MB = 2
+MAX_STREAM_FRAMES = 6
+ALLOWED_FRAME_TYPES = {"image/jpeg", "image/jpg", "image/webp", "image/png"}
 ALLOWED_VIDEO_TYPES = {
     "video/mp4", "video/webm", "video/quicktime",
     "image/jpeg", "image/jpg", "image/png", "image/webp", "image/bmp",
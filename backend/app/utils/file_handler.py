@@ -10,8 +10,8 @@ import os
 from pathlib import Path
 from fastapi import UploadFile, HTTPException, status
 from app.utils.constants import (
-    MAX_AUDIO_SIZE_MB, MAX_VIDEO_SIZE_MB,
-    ALLOWED_AUDIO_TYPES, ALLOWED_VIDEO_TYPES,
+    MAX_AUDIO_SIZE_MB, MAX_VIDEO_SIZE_MB, MAX_FRAME_SIZE_MB, MAX_STREAM_FRAMES,
+    ALLOWED_AUDIO_TYPES, ALLOWED_VIDEO_TYPES, ALLOWED_FRAME_TYPES,
 )
 
 BASE_UPLOAD_DIR = Path(__file__).resolve().parents[3] / "uploads"
@@ -68,6 +68,41 @@ async def save_video(file: UploadFile) -> str:
     return key
 
 
+async def save_frames(files: list[UploadFile]) -> tuple[str, list[bytes]]:
+    """Validate and save a batch of sampled video frames.
+
+    Returns the storage_key of the frame directory and the raw frame bytes
+    in upload order.
+    """
+    if not files:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="At least one frame is required")
+    if len(files) > MAX_STREAM_FRAMES:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST,
+                            detail=f"At most {MAX_STREAM_FRAMES} frames are accepted per batch")
+
+    payloads: list[tuple[bytes, str]] = []
+    for file in files:
+        if file.content_type not in ALLOWED_FRAME_TYPES:
+            raise HTTPException(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                                detail=f"Unsupported frame type: {file.content_type}")
+        data = await file.read()
+        if len(data) > MAX_FRAME_SIZE_MB * 1024 * 1024:
+            raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail=f"Frame exceeds {MAX_FRAME_SIZE_MB} MB limit")
+        payloads.append((data, _ext(file.content_type)))
+
+    key = f"video/frames_{uuid.uuid4().hex}"
+    dest_dir = _ensure_dir(BASE_UPLOAD_DIR / key)
+    for idx, (data, extension) in enumerate(payloads):
+        (dest_dir / f"{idx:03d}{extension}").write_bytes(data)
+    return key, [data for data, _ in payloads]
+
+
+def load_frames(storage_key: str) -> list[bytes]:
+    """Read back a frame batch saved by save_frames, in upload order."""
+    return [path.read_bytes() for path in sorted(full_path(storage_key).iterdir()) if path.is_file()]
+
+
 def full_path(storage_key: str) -> Path:
     """Resolve a storage_key to an absolute filesystem path."""
     return BASE_UPLOAD_DIR / storage_key
@@ -0,0 +1,9 @@
+"""Wellness score shared by the analysis API, history and assistant contexts."""
+from typing import Optional
+
+
+def compute_wellness_score(stress_score: Optional[float], mood_score: Optional[float]) -> int:
+    """0–100 composite: 45% inverse stress, 55% mood (missing scores count as 0)."""
+    stress = float(stress_score or 0.0)
+    mood = float(mood_score or 0.0)
+    return max(0, min(100, int(round(((1.0 - stress) * 0.45 + mood * 0.55) * 100.0))))
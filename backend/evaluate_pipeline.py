@@ -11,15 +11,13 @@ Usage:
 """
 from __future__ import annotations
 
-import json
-
 import numpy as np
 from sqlmodel import Session, select
 
 from app.core.database import engine
 from app.models.analysis_result import AnalysisResult
-from app.models.extracted_feature import ExtractedFeature
 from app.models.inference_run import InferenceRun
+from app.services.feature_repository import FeatureRepository
 
 
 def _percentiles(values: list[float]) -> dict:
@@ -34,21 +32,6 @@ def _percentiles(values: list[float]) -> dict:
     }
 
 
-def _load_latest_feature(session: Session, assessment_id: str, modality: str) -> dict | None:
-    row = session.exec(
-        select(ExtractedFeature)
-        .where(ExtractedFeature.assessment_id == assessment_id)
-        .where(ExtractedFeature.modality_type == modality)
-        .order_by(ExtractedFeature.computed_at.desc())
-    ).first()
-    if not row or not row.feature_json:
-        return None
-    try:
-        return json.loads(row.feature_json)
-    except Exception:
-        return None
-
-
 def evaluate() -> None:
     with Session(engine) as session:
         runs = session.exec(select(InferenceRun).where(InferenceRun.run_status == "completed")).all()
@@ -65,10 +48,12 @@ def evaluate() -> None:
         agreement_video_text = []
         agreement_audio_video = []
 
+        latest = FeatureRepository(session).load(ar.assessment_id for ar in analyses)
+
         for ar in analyses:
             aid = ar.assessment_id
-            audio = _load_latest_feature(session, aid, "audio") or {}
-            video = _load_latest_feature(session, aid, "video") or {}
+            audio = latest[aid]["audio"] or {}
+            video = latest[aid]["video"] or {}
 
             if audio:
                 total_audio += 1
@@ -0,0 +1,2 @@
+CREATE INDEX IF NOT EXISTS idx_extracted_features_latest
+ON extracted_features (assessment_id, modality_type, computed_at);
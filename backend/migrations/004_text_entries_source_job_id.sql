@@ -0,0 +1,4 @@
+ALTER TABLE text_entries ADD COLUMN source_job_id VARCHAR(32);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_text_entries_source_job_id
+ON text_entries (source_job_id);
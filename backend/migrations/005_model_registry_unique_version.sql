@@ -0,0 +1,15 @@
+DELETE FROM model_registry
+WHERE version IS NOT NULL
+  AND id NOT IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY model_name, version ORDER BY active DESC, created_at
+        ) AS rank
+        FROM model_registry
+        WHERE version IS NOT NULL
+    )
+    WHERE rank = 1
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_model_registry_name_version
+ON model_registry (model_name, version);
@@ -27,9 +27,10 @@ def _candidate_models(settings) -> list[str]:
     # Primary local models (fast, reliable, no cold-start)
     audio_local = str(settings.huggingface_audio_emotion_local_candidates or "").split(",")
     face_local = [settings.huggingface_face_emotion_model]  # Single local face model
+    text_local = [settings.huggingface_text_model] if settings.huggingface_use_local_text_cache else []
     
     # Combine all candidates
-    raw = [*audio_local, *face_local]
+    raw = [*audio_local, *face_local, *text_local]
     
     for item in raw:
         model = item.strip()
@@ -0,0 +1,48 @@
+"""Re-score stored assessments with the currently active fusion / calibration models.
+
+Run after retraining (train_nn.py / retrain_nn.py / calibrate_risk.py) so existing
+AnalysisResult and RiskScore rows reflect the new models. Progress is checkpointed
+in rescore_jobs; re-running continues an interrupted job.
+
+Usage:
+    cd backend
+    python rescore_history.py [--batch-size 200] [--throttle 0.5] [--limit N] [--fresh] [--dry-run]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+
+from app.core.database import create_db_and_tables
+from app.services.model_registry_service import sync_models
+from app.services.rescoring_service import rescore_history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=None, help="assessments per chunk (default RESCORE_BATCH_SIZE)")
+    parser.add_argument("--throttle", type=float, default=None, help="seconds to sleep between chunks (default RESCORE_THROTTLE_SECONDS)")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many assessments (resume later)")
+    parser.add_argument("--fresh", action="store_true", help="start a new job instead of resuming an unfinished one")
+    parser.add_argument("--dry-run", action="store_true", help="report the diff without writing anything")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    create_db_and_tables()
+    versions = sync_models()
+    print("Active models:", versions)
+
+    summary = rescore_history(
+        batch_size=args.batch_size,
+        throttle_seconds=args.throttle,
+        resume=not args.fresh,
+        limit=args.limit,
+        dry_run=args.dry_run,
+    )
+    print("\n=== MindSentry Re-scoring Summary ===")
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -32,10 +32,10 @@ from sklearn.preprocessing import MinMaxScaler
 from sqlmodel import Session, select
 
 from app.core.database import engine
-from app.models.extracted_feature import ExtractedFeature
 from app.models.inference_run import InferenceRun
 from app.models.risk_score import RiskScore
-from app.services.fusion_nn import FEATURE_NAMES, OUTPUT_NAMES, build_feature_vector, feature_vector_to_dict
+from app.services.feature_repository import FeatureRepository
+from app.services.fusion_nn import FEATURE_NAMES, OUTPUT_NAMES, build_feature_vector, export_arrays, feature_vector_to_dict
 from train_nn import generate_dataset
 
 
@@ -46,21 +46,6 @@ def _safe_float(value, default: float = 0.0) -> float:
         return float(default)
 
 
-def _load_feature_json(session: Session, assessment_id: str, modality: str) -> dict | None:
-    feature = session.exec(
-        select(ExtractedFeature)
-        .where(ExtractedFeature.assessment_id == assessment_id)
-        .where(ExtractedFeature.modality_type == modality)
-        .order_by(ExtractedFeature.computed_at.desc())
-    ).first()
-    if feature and feature.feature_json:
-        try:
-            return json.loads(feature.feature_json)
-        except Exception:
-            return None
-    return None
-
-
 def _load_history_samples(history_limit: int) -> tuple[np.ndarray, np.ndarray]:
     real_features: list[list[float]] = []
     real_targets: list[list[float]] = []
@@ -72,25 +57,30 @@ def _load_history_samples(history_limit: int) -> tuple[np.ndarray, np.ndarray]:
             .order_by(InferenceRun.created_at.desc())
         ).all()
 
+        parsed = []
         for run in list(runs)[:history_limit]:
             if not run.output_json:
                 continue
 
             try:
-                tracking = json.loads(run.output_json)
+                parsed.append((run, json.loads(run.output_json)))
             except Exception:
                 continue
 
+        # Feature blobs only for runs that predate model_input_features tracking, in one query
+        features = FeatureRepository(session)
+        features.load(run.assessment_id for run, tracking in parsed if not tracking.get("model_input_features"))
+
+        for run, tracking in parsed:
             model_inputs = tracking.get("model_input_features") or {}
             if not model_inputs:
-                text_feat = _load_feature_json(session, run.assessment_id, "text")
-                audio_feat = _load_feature_json(session, run.assessment_id, "audio")
-                video_feat = _load_feature_json(session, run.assessment_id, "video")
-                q_feat = _load_feature_json(session, run.assessment_id, "questionnaire")
-                questionnaire_data = q_feat
-                if questionnaire_data is None:
-                    questionnaire_data = None
-                feature_vector, _ = build_feature_vector(text_feat, audio_feat, video_feat, questionnaire_data)
+                modality_features = features.features(run.assessment_id)
+                feature_vector, _ = build_feature_vector(
+                    modality_features["text"],
+                    modality_features["audio"],
+                    modality_features["video"],
+                    modality_features["questionnaire"],
+                )
             else:
                 feature_vector = [
                     _safe_float(model_inputs.get(name, 0.0), 0.0)
@@ -204,10 +194,12 @@ def train(total_samples: int = 6000, real_weight: float = 0.4, history_limit: in
 
     with open(model_path, "wb") as f:
         pickle.dump(model, f)
+    arrays_path = export_arrays(model)
+    print(f"  Exported serving weights to: {arrays_path}")
 
     size_kb = model_path.stat().st_size / 1024
     print(f"\n  Saved to: {model_path}  ({size_kb:.1f} KB)")
-    print("  Restart the FastAPI server to activate the refreshed model.")
+    print("  A running server registers and activates it within MODEL_RELOAD_POLL_SECONDS.")
     return model_path
 
 
@@ -0,0 +1,84 @@
+"""Summarise shadow fusion-engine comparisons stored in fusion_shadow_results.
+
+Reports, per (primary, shadow) engine pair:
+- final_risk_level agreement rate and confusion counts
+- mean / p95 absolute delta per score
+- primary vs shadow latency p50/p95
+
+Usage:
+    cd backend
+    python shadow_report.py [--days 7]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models.fusion_shadow_result import FusionShadowResult
+from app.services.fusion_engine_service import COMPARED_SCORES
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"p50": None, "p95": None}
+    arr = np.asarray(values, dtype=np.float64)
+    return {"p50": round(float(np.percentile(arr, 50)), 3), "p95": round(float(np.percentile(arr, 95)), 3)}
+
+
+def report(days: float | None = None) -> None:
+    with Session(engine) as session:
+        query = select(FusionShadowResult)
+        if days:
+            since = (datetime.utcnow() - timedelta(days=days)).isoformat()
+            query = query.where(FusionShadowResult.created_at >= since)
+        rows = session.exec(query).all()
+
+    pairs: dict[tuple[str, str], list[FusionShadowResult]] = defaultdict(list)
+    for row in rows:
+        pairs[(row.primary_engine, row.shadow_engine)].append(row)
+
+    print("\n=== MindSentry Fusion Shadow Report ===")
+    if not pairs:
+        print("No shadow results recorded (check FUSION_SHADOW_ENGINES / FUSION_SHADOW_SAMPLE_RATE).")
+        return
+
+    for (primary, shadow), group in sorted(pairs.items()):
+        agree = sum(r.risk_level_agree or 0 for r in group)
+        print(f"\n{primary} (serving) vs {shadow} (shadow): n={len(group)}")
+        print(f"  final_risk_level agreement: {agree / len(group):.4f} ({agree}/{len(group)})")
+
+        confusion = Counter((r.primary_risk_level, r.shadow_risk_level) for r in group)
+        print("  risk level (primary -> shadow):")
+        for (a, b), count in sorted(confusion.items(), key=lambda item: -item[1]):
+            print(f"    {a} -> {b}: {count}")
+
+        deltas: dict[str, list[float]] = defaultdict(list)
+        for r in group:
+            for key, value in json.loads(r.score_deltas_json or "{}").items():
+                deltas[key].append(value)
+        print("  |delta| per score (mean / p95, shadow - primary mean):")
+        for key in COMPARED_SCORES:
+            values = deltas.get(key)
+            if not values:
+                continue
+            arr = np.asarray(values, dtype=np.float64)
+            print(
+                f"    {key:26s} {float(np.abs(arr).mean()):.4f} / {float(np.percentile(np.abs(arr), 95)):.4f}"
+                f"  bias {float(arr.mean()):+.4f}"
+            )
+
+        print("  latency ms primary:", _percentiles([r.primary_latency_ms for r in group if r.primary_latency_ms is not None]))
+        print("  latency ms shadow: ", _percentiles([r.shadow_latency_ms for r in group if r.shadow_latency_ms is not None]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=None, help="only include results from the last N days")
+    args = parser.parse_args()
+    report(args.days)
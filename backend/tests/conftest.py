@@ -0,0 +1,47 @@
+"""Shared fixtures: every test session runs against a throwaway mindsentry.db."""
+import os
+import tempfile
+
+# Settings and the engine are created at import, so point them at a scratch
+# database before anything from app/ is imported.
+_DB_DIR = tempfile.mkdtemp(prefix="mindsentry-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/mindsentry.db"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    from app.core.database import create_db_and_tables, engine
+    import app.models  # noqa: F401
+
+    create_db_and_tables()
+    return engine
+
+
+@pytest.fixture
+def assessment_id(db_engine):
+    from sqlmodel import Session
+    from app.models.assessment import Assessment
+
+    with Session(db_engine) as session:
+        with session.begin():
+            assessment = Assessment(user_id=1)
+            session.add(assessment)
+        return assessment.id
+
+
+@pytest.fixture
+def client(db_engine):
+    """TestClient authenticated as user 1 (the owner of ``assessment_id``)."""
+    from types import SimpleNamespace
+
+    from fastapi.testclient import TestClient
+
+    from app.api.auth import get_current_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, email="user@example.com")
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,30 @@
+from app.services import fusion_engine_service
+
+
+def _run(client, assessment_id):
+    response = client.post(f"/analysis/run/{assessment_id}")
+    assert response.status_code == 200
+    return response.headers["X-Analysis-Cache"], response.json()
+
+
+def test_unchanged_inputs_and_models_reuse_the_last_run(client, assessment_id, monkeypatch):
+    client.post("/text/submit", json={"assessment_id": assessment_id, "raw_text": "A quiet, fine day."})
+    first_cache, first = _run(client, assessment_id)
+    second_cache, second = _run(client, assessment_id)
+    assert (first_cache, second_cache) == ("miss", "hit")
+    assert second["stress_score"] == first["stress_score"]
+
+    client.post("/text/submit", json={"assessment_id": assessment_id, "raw_text": "Now I am panicking about exams."})
+    assert _run(client, assessment_id)[0] == "miss"
+    assert _run(client, assessment_id)[0] == "hit"
+
+    current = fusion_engine_service.engine_version()
+    monkeypatch.setattr(fusion_engine_service, "engine_version", lambda name=None: current + ":retrained")
+    assert _run(client, assessment_id)[0] == "miss"
+
+
+def test_fingerprint_ignores_key_order():
+    a = {"text_features": {"x": 1, "y": 2}, "audio_features": None}
+    b = {"audio_features": None, "text_features": {"y": 2, "x": 1}}
+    assert fusion_engine_service.input_fingerprint(a) == fusion_engine_service.input_fingerprint(b)
+    assert fusion_engine_service.input_fingerprint(a) != fusion_engine_service.input_fingerprint({**a, "audio_features": {}})
@@ -0,0 +1,64 @@
+import json
+
+from sqlmodel import Session
+
+from app.models.analysis_snapshot import AnalysisSnapshot
+from app.services import analysis_snapshot_service, rescoring_service
+
+
+def _snapshot(db_engine, assessment_id):
+    with Session(db_engine) as session:
+        return session.get(AnalysisSnapshot, assessment_id)
+
+
+def _submit_text(client, assessment_id, text):
+    response = client.post("/text/submit", json={"assessment_id": assessment_id, "raw_text": text})
+    assert response.status_code == 201
+
+
+def test_result_is_served_from_snapshot_and_matches_rebuild(db_engine, client, assessment_id):
+    _submit_text(client, assessment_id, "Work has been stressful but I slept well.")
+    assert client.post(f"/analysis/run/{assessment_id}").status_code == 200
+    snapshot = _snapshot(db_engine, assessment_id)
+    assert snapshot is not None
+
+    cached = client.get(f"/analysis/result/{assessment_id}")
+    assert cached.text == snapshot.payload_json
+
+    with Session(db_engine) as session:
+        with session.begin():
+            analysis_snapshot_service.invalidate(session, assessment_id)
+    rebuilt = client.get(f"/analysis/result/{assessment_id}")
+    assert rebuilt.json() == cached.json()
+    assert _snapshot(db_engine, assessment_id) is not None
+
+
+def test_new_features_invalidate_snapshot(db_engine, client, assessment_id):
+    _submit_text(client, assessment_id, "Feeling okay today.")
+    client.post(f"/analysis/run/{assessment_id}")
+    assert _snapshot(db_engine, assessment_id) is not None
+
+    _submit_text(client, assessment_id, "Actually I feel exhausted and overwhelmed.")
+    assert _snapshot(db_engine, assessment_id) is None
+
+
+def test_stale_payload_version_is_ignored(db_engine, client, assessment_id, monkeypatch):
+    _submit_text(client, assessment_id, "A calm evening.")
+    client.post(f"/analysis/run/{assessment_id}")
+    monkeypatch.setattr(analysis_snapshot_service, "PAYLOAD_VERSION", analysis_snapshot_service.PAYLOAD_VERSION + 1)
+    with Session(db_engine) as session:
+        assert analysis_snapshot_service.cached_json(session, assessment_id, 1) is None
+    assert client.get(f"/analysis/result/{assessment_id}").status_code == 200
+    assert _snapshot(db_engine, assessment_id).payload_version == analysis_snapshot_service.PAYLOAD_VERSION
+
+
+def test_rescoring_invalidates_snapshot(db_engine, client, assessment_id, monkeypatch):
+    _submit_text(client, assessment_id, "Busy week, a little anxious.")
+    client.post(f"/analysis/run/{assessment_id}")
+    assert _snapshot(db_engine, assessment_id) is not None
+
+    monkeypatch.setattr(rescoring_service, "_next_chunk", lambda session, after, size: [] if after else [assessment_id])
+    summary = rescoring_service.rescore_history(throttle_seconds=0, resume=False)
+    assert summary["processed"] == 1
+    assert _snapshot(db_engine, assessment_id) is None
+    assert json.loads(client.get(f"/analysis/result/{assessment_id}").text)["assessment_id"] == assessment_id
@@ -0,0 +1,24 @@
+import time
+
+from app.services.audio_inference_service import _audio_integrity, _early_reject_audio_result
+
+PREFLIGHT_FEATURES = {
+    "duration_seconds": 6.0,
+    "sample_rate_hz": 16000,
+    "rms_energy": 0.0004,
+    "silence_ratio": 0.95,
+    "clipping_ratio": 0.0,
+}
+
+
+def test_missing_voiced_ratio_is_not_low_voiced_content():
+    assert "low_voiced_content" not in _audio_integrity(PREFLIGHT_FEATURES, "")["audio_integrity_flags"]
+    flags = _audio_integrity({**PREFLIGHT_FEATURES, "voiced_ratio": 0.05}, "")["audio_integrity_flags"]
+    assert "low_voiced_content" in flags
+
+
+def test_early_reject_result_matches_full_result_shape():
+    result = _early_reject_audio_result("mostly_silent", dict(PREFLIGHT_FEATURES), time.perf_counter(), "clip.wav")
+    assert result["fingerprints"] == []
+    assert result["early_reject"] == {"gate": "mostly_silent"}
+    assert result["audio_integrity_flags"] == ["mostly_silent", "speech_content_mismatch"]
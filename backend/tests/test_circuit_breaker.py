@@ -0,0 +1,130 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.services.hf_inference_service import HFInferenceError, HuggingFaceInferenceClient
+
+MODEL = "org/model"
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    breaker.open_seconds = 0.0
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe_gets_configured_timeout():
+    breaker = CircuitBreaker(MODEL, min_timeout_seconds=0.1)
+    for _ in range(20):
+        breaker.record_success(0.2)
+    assert breaker.timeout(30.0) == pytest.approx(0.4)
+    _open(breaker)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert breaker.timeout(30.0) == 30.0
+
+
+def test_timeouts_raise_the_adaptive_budget():
+    breaker = CircuitBreaker(MODEL, min_timeout_seconds=0.1, failure_threshold=100)
+    for _ in range(20):
+        breaker.record_success(0.2)
+    for _ in range(5):
+        breaker.record_failure(breaker.timeout(30.0))
+    assert breaker.timeout(30.0) > 0.4
+
+
+def _client(handler, *, asynchronous=False) -> HuggingFaceInferenceClient:
+    client = HuggingFaceInferenceClient()
+    client.settings = client.settings.model_copy(update={"huggingface_api_key": "test", "huggingface_max_retries": 0})
+    transport = httpx.MockTransport(handler)
+    if asynchronous:
+        client._async_client = httpx.AsyncClient(base_url=client.base_url, transport=transport)
+    else:
+        client._client = httpx.Client(base_url=client.base_url, transport=transport)
+    return client
+
+
+def test_unexpected_error_settles_half_open_probe():
+    def handler(request):
+        raise RuntimeError("boom")
+
+    client = _client(handler)
+    breaker = client._breaker(MODEL)
+    _open(breaker)
+    with pytest.raises(HFInferenceError, match="boom"):
+        client._request(model_id=MODEL, payload={"inputs": "x"})
+    assert breaker.state == OPEN
+    assert breaker.allow(), "probe must not stay in flight after an unexpected error"
+
+
+@pytest.mark.parametrize("error", [httpx.DecodingError("bad gzip"), httpx.TooManyRedirects("loop"), TypeError("bad arg")])
+def test_other_errors_count_as_failures_and_are_wrapped(error):
+    def handler(request):
+        raise error
+
+    client = _client(handler)
+    with pytest.raises(HFInferenceError):
+        client._request(model_id=MODEL, payload={"inputs": "x"})
+    assert client._breaker(MODEL).consecutive_failures == 1
+
+    async_client = _client(handler, asynchronous=True)
+    with pytest.raises(HFInferenceError):
+        asyncio.run(async_client._arequest(model_id=MODEL, payload={"inputs": "x"}))
+    assert async_client._breaker(MODEL).consecutive_failures == 1
+
+
+def test_cancelled_async_probe_settles_breaker():
+    async def handler(request):
+        await asyncio.sleep(10)
+
+    client = _client(handler, asynchronous=True)
+    breaker = client._breaker(MODEL)
+    _open(breaker)
+
+    async def call():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client._arequest(model_id=MODEL, payload={"inputs": "x"}), timeout=0.05)
+
+    asyncio.run(call())
+    assert breaker.allow()
+
+
+def test_success_closes_breaker():
+    client = _client(lambda request: httpx.Response(200, json=[{"label": "joy", "score": 0.9}]))
+    breaker = client._breaker(MODEL)
+    _open(breaker)
+    assert client._request(model_id=MODEL, payload={"inputs": "x"})[0]["label"] == "joy"
+    assert breaker.state == CLOSED
+
+
+def test_client_errors_do_not_trip_breaker():
+    client = _client(lambda request: httpx.Response(401, json={"error": "nope"}))
+    with pytest.raises(HFInferenceError):
+        client._request(model_id=MODEL, payload={"inputs": "x"})
+    assert client._breaker(MODEL).consecutive_failures == 0
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_model_loading_retries_count_once_per_request(asynchronous):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503, json={"error": "Model is loading"})
+
+    client = _client(handler, asynchronous=asynchronous)
+    client.settings = client.settings.model_copy(
+        update={"huggingface_max_retries": 4, "huggingface_retry_backoff_seconds": 0.0}
+    )
+    request = client._arequest if asynchronous else client._request
+    with pytest.raises(HFInferenceError, match="hf_model_loading"):
+        result = request(model_id=MODEL, payload={"inputs": "x"}, wait_for_model=True)
+        if asynchronous:
+            asyncio.run(result)
+    breaker = client._breaker(MODEL)
+    assert len(calls) == 5
+    assert breaker.consecutive_failures == 1
+    assert breaker.state == CLOSED
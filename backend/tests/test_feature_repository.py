@@ -0,0 +1,36 @@
+import json
+
+from sqlmodel import Session
+
+from app.models.extracted_feature import ExtractedFeature
+from app.models.questionnaire import QuestionnaireResponse
+from app.services.feature_repository import FeatureRepository
+
+
+def test_latest_row_per_modality(db_engine, assessment_id):
+    with Session(db_engine) as session:
+        with session.begin():
+            for computed_at, modality, blob in (
+                ("2026-01-01T10:00:00", "text", json.dumps({"emotion": "sadness"})),
+                ("2026-01-01T11:00:00", "text", json.dumps({"emotion": "joy"})),
+                ("2026-01-01T09:00:00", "audio", "{not json"),
+            ):
+                session.add(ExtractedFeature(
+                    assessment_id=assessment_id, modality_type=modality, feature_json=blob, computed_at=computed_at,
+                ))
+
+    with Session(db_engine) as session:
+        features = FeatureRepository(session).load([assessment_id, "no-such-assessment"])
+    assert features[assessment_id]["text"] == {"emotion": "joy"}
+    assert features[assessment_id]["audio"] is None
+    assert features["no-such-assessment"] == {"text": None, "audio": None, "video": None, "questionnaire": None}
+
+
+def test_questionnaire_falls_back_to_latest_total(db_engine, assessment_id):
+    with Session(db_engine) as session:
+        with session.begin():
+            session.add(QuestionnaireResponse(assessment_id=assessment_id, template_id="t", total_score=4, submitted_at="2026-01-01T10:00:00"))
+            session.add(QuestionnaireResponse(assessment_id=assessment_id, template_id="t", total_score=9, submitted_at="2026-01-01T12:00:00"))
+
+    with Session(db_engine) as session:
+        assert FeatureRepository(session).questionnaire_data(assessment_id) == {"total_score": 9}
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+
+from app.core.config import get_settings
+from app.models.analysis_job import AnalysisJob
+from app.models.text_entry import TextEntry
+from app.services import job_queue_service as queue
+from app.services import job_worker_service
+
+
+@pytest.fixture
+def empty_queue(db_engine, monkeypatch):
+    with Session(db_engine) as session:
+        with session.begin():
+            session.execute(delete(AnalysisJob))
+    monkeypatch.setattr(get_settings(), "job_retry_backoff_seconds", 0)
+    monkeypatch.setattr(get_settings(), "job_max_attempts", 2)
+    monkeypatch.setattr(get_settings(), "job_poll_interval_seconds", 0.01)
+    return db_engine
+
+
+def _job(db_engine, job_id):
+    with Session(db_engine) as session:
+        return session.get(AnalysisJob, job_id)
+
+
+def test_each_job_is_claimed_by_exactly_one_worker(empty_queue, assessment_id):
+    for _ in range(5):
+        queue.enqueue("analyse_text", assessment_id, 1, {"raw_text": "hi"})
+    claimed, lock = [], threading.Lock()
+
+    def worker(n):
+        while (job := queue.claim(f"w{n}")) is not None:
+            with lock:
+                claimed.append(job["id"])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    assert len(claimed) == len(set(claimed)) == 5
+
+
+def test_higher_priority_is_claimed_first(empty_queue, assessment_id):
+    queue.enqueue("analyse_video", assessment_id, 1, {"storage_key": "v"})
+    fusion = queue.enqueue("run_analysis", assessment_id, 1)
+    assert queue.claim("w")["id"] == fusion.id
+
+
+def test_failure_retries_then_fails(empty_queue, assessment_id):
+    job = queue.enqueue("run_analysis", assessment_id, 1)
+    first = queue.claim("w1")
+    assert queue.fail(first, "w1", "boom")
+    assert _job(empty_queue, job.id).status == queue.QUEUED
+    second = queue.claim("w2")
+    assert second["attempts"] == 2
+    assert queue.fail(second, "w2", "boom again")
+    stored = _job(empty_queue, job.id)
+    assert (stored.status, stored.error) == (queue.FAILED, "boom again")
+    assert queue.claim("w3") is None
+
+
+def test_only_the_lease_owner_can_finish(empty_queue, assessment_id):
+    queue.enqueue("run_analysis", assessment_id, 1)
+    job = queue.claim("owner")
+    assert not queue.complete(job["id"], "intruder", {})
+    assert queue.complete(job["id"], "owner", {"ok": True})
+    assert _job(empty_queue, job["id"]).status == queue.SUCCEEDED
+
+
+def test_expired_lease_is_reclaimed_then_reaped(empty_queue, assessment_id, monkeypatch):
+    monkeypatch.setattr(get_settings(), "job_lease_seconds", 0)
+    job = queue.enqueue("run_analysis", assessment_id, 1)
+    queue.claim("lost-worker")
+    time.sleep(0.01)
+    reclaimed = queue.claim("second-worker")
+    assert reclaimed["id"] == job.id and reclaimed["attempts"] == 2
+    assert not queue.heartbeat(job.id, "lost-worker")
+    time.sleep(0.01)
+    assert queue.claim("third-worker") is None  # attempts used up
+    assert queue.reap_expired() == 1
+    assert _job(empty_queue, job.id).status == queue.FAILED
+
+
+def test_worker_runs_handlers_and_records_results(empty_queue, assessment_id, monkeypatch):
+    async def ok(job):
+        return {"echo": job["payload"]["raw_text"]}
+
+    async def broken(job):
+        raise ValueError("bad input")
+
+    monkeypatch.setitem(job_worker_service.HANDLERS, "analyse_text", ok)
+    monkeypatch.setitem(job_worker_service.HANDLERS, "run_analysis", broken)
+    text_job = queue.enqueue("analyse_text", assessment_id, 1, {"raw_text": "hello"})
+    fusion_job = queue.enqueue("run_analysis", assessment_id, 1)
+
+    async def run():
+        stop = asyncio.Event()
+        task = asyncio.create_task(job_worker_service.run_worker(stop, concurrency=2))
+        for _ in range(200):
+            await asyncio.sleep(0.02)
+            if all(_job(empty_queue, j.id).status in (queue.SUCCEEDED, queue.FAILED) for j in (text_job, fusion_job)):
+                break
+        stop.set()
+        await task
+
+    asyncio.run(run())
+    done = queue.job_to_dict(_job(empty_queue, text_job.id))
+    failed = _job(empty_queue, fusion_job.id)
+    assert done["status"] == queue.SUCCEEDED and done["result"] == {"echo": "hello"}
+    assert failed.status == queue.FAILED and failed.attempts == 2 and "bad input" in failed.error
+
+
+def test_retried_text_job_reuses_its_entry(empty_queue, assessment_id):
+    queue.enqueue("analyse_text", assessment_id, 1, {"raw_text": "feeling calm today", "safety_scanned": True})
+    job = queue.claim("w")
+    first = asyncio.run(job_worker_service._analyse_text(job))
+    second = asyncio.run(job_worker_service._analyse_text(job))
+    assert first == second
+    with Session(empty_queue) as session:
+        count = session.exec(
+            select(func.count()).select_from(TextEntry).where(TextEntry.source_job_id == job["id"])
+        ).one()
+    assert count == 1
+
+
+def test_job_endpoints_and_event_stream(empty_queue, assessment_id, client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "job_events_poll_seconds", 0.01)
+    response = client.post(f"/jobs/analysis/{assessment_id}")
+    assert response.status_code == 202
+    job = response.json()
+    assert client.get(job["status_url"]).json()["status"] == queue.QUEUED
+    assert [j["id"] for j in client.get(f"/jobs/assessment/{assessment_id}").json()] == [job["id"]]
+    assert client.get("/jobs/missing").status_code == 404
+
+    claimed = queue.claim("w")
+    queue.complete(claimed["id"], "w", {"cache": "miss"})
+    with client.stream("GET", job["events_url"]) as stream:
+        events = [line for line in stream.iter_lines() if line.startswith("event:")]
+    assert events == ["event: job", "event: done"]
@@ -0,0 +1,97 @@
+import pytest
+
+from app.services.agent_v2.health_safety import detect_severity
+from app.services.safety.crisis_detector import CrisisDetector
+from app.services.safety.keyword_matcher import CRISIS_PHRASES, HIGH_RISK_PHRASES, KeywordMatcher, scan_keywords
+from app.services.safety_service import scan_text
+from app.utils.constants import CRISIS_KEYWORDS, DISTRESS_KEYWORDS
+
+SUFFIXES = ("", "s", "es", "ness", "ing", "ed", "al", "ly")
+TEMPLATES = ("{}", "I keep thinking {} lately.", "honestly... {}!", "'{}'", "{}, again")
+
+
+def _corpus():
+    for phrase in (*CRISIS_KEYWORDS, *DISTRESS_KEYWORDS, *CRISIS_PHRASES, *HIGH_RISK_PHRASES):
+        for suffix in SUFFIXES:
+            for template in TEMPLATES:
+                yield template.format(phrase + suffix)
+                yield template.format((phrase + suffix).upper())
+
+
+def _baseline_scan_text(text):
+    lower = text.lower()
+    return {kw for kw in CRISIS_KEYWORDS if kw in lower}, {kw for kw in DISTRESS_KEYWORDS if kw in lower}
+
+
+def _baseline_detector(text):
+    lower = text.lower()
+    return {p for p in CRISIS_PHRASES if p in lower}, {p for p in HIGH_RISK_PHRASES if p in lower}
+
+
+@pytest.mark.parametrize("text", sorted(set(_corpus())))
+def test_safety_scans_keep_every_substring_hit(text):
+    hits = scan_keywords(text)
+    crisis, distress = _baseline_scan_text(text)
+    assert crisis <= set(hits.get("crisis", []))
+    assert distress <= set(hits.get("distress", []))
+    detector_crisis, detector_high = _baseline_detector(text)
+    assert detector_crisis <= set(hits.get("detector_crisis", []))
+    assert detector_high <= set(hits.get("detector_high_risk", []))
+
+
+@pytest.mark.parametrize("text, level", [
+    ("thinking about suicides lately", "crisis"),
+    ("I have had panic attacks all week", "high"),
+    ("I feel hopelessness", "high"),
+    ("I want to DIE", "crisis"),
+])
+def test_crisis_detector_levels(text, level):
+    assert CrisisDetector().detect(text)["risk_level"] == level
+
+
+@pytest.mark.parametrize("text, keyword", [
+    ("suicides", "suicide"),
+    ("pure hopelessness", "hopeless"),
+    ("just numbness", "numb"),
+    ("I feel self-harm urges", "self harm"),
+])
+def test_scan_text_flags_inflections(text, keyword):
+    assert keyword in scan_text(text)["matched_keywords"]
+
+
+def test_other_categories_still_need_whole_words():
+    hits = scan_keywords("this is thinking about history")
+    assert "intent_greeting" not in hits
+    assert scan_keywords("hi there")["intent_greeting"] == ["hi"]
+    assert "topic_scores" in hits
+
+
+def test_stem_and_whole_word_categories_can_share_a_phrase():
+    matcher = KeywordMatcher({"stem": ("panic",), "word": ("panic",)}, stem_categories=("stem",))
+    assert matcher.scan("panicky") == {"stem": ["panic"]}
+    assert matcher.scan("panicky, then panic") == {"stem": ["panic"], "word": ["panic"]}
+    assert matcher.scan("unpanic") == {}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I have been self-harming again", (True, "emergency")),
+    ("I overdosed last night", (True, "emergency")),
+    ("my chest pains are back", (True, "emergency")),
+    ("I panicked at work", (True, "emergency")),
+    ("my symptoms are critically bad", (True, "high")),
+    ("things have been difficulty after difficulty", (False, "moderate")),
+])
+def test_detect_severity_matches_inflections(text, expected):
+    assert detect_severity(text) == expected
+
+
+@pytest.mark.parametrize("text, category", [
+    ("I panicked before the exam", "tone_distress"),
+    ("my sleeping is off", "topic_health"),
+    ("show my scores trending", "topic_scores"),
+    ("I have been exercising more", "intent_health"),
+    ("my headaches are back", "intent_health"),
+    ("what were my scores yesterday", "intent_score"),
+])
+def test_tone_topic_and_intent_match_inflections(text, category):
+    assert category in scan_keywords(text)
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from sqlmodel import Session, select
+
+from app.api import audio_analysis, video_analysis
+from app.models.audio_recording import AudioRecording
+from app.models.extracted_feature import ExtractedFeature
+from app.models.safety_flag import SafetyFlag
+from app.models.video_recording import VideoRecording
+from app.services.safety_service import persist_text_flags
+from app.utils import file_handler
+
+
+def _count(db_engine, model, assessment_id):
+    with Session(db_engine) as session:
+        return len(session.exec(select(model).where(model.assessment_id == assessment_id)).all())
+
+
+def test_video_result_is_stored_once_per_storage_key(db_engine, assessment_id):
+    result = {"face_detected": 1, "lighting_score": 0.8}
+    with Session(db_engine) as session:
+        first = video_analysis._persist_video_result(session, assessment_id, 1, "frames/abc", dict(result))
+        second = video_analysis._persist_video_result(session, assessment_id, 1, "frames/abc", dict(result))
+    assert first.id == second.id
+    assert _count(db_engine, VideoRecording, assessment_id) == 1
+    assert _count(db_engine, ExtractedFeature, assessment_id) == 1
+
+
+def test_retried_audio_job_returns_stored_recording(db_engine, assessment_id, monkeypatch):
+    with Session(db_engine) as session:
+        with session.begin():
+            session.add(AudioRecording(assessment_id=assessment_id, user_id=1, storage_key="audio/abc.wav"))
+
+    async def must_not_run(*args, **kwargs):
+        raise AssertionError("audio was analysed again")
+
+    monkeypatch.setattr(audio_analysis, "analyse_audio_async", must_not_run)
+    with Session(db_engine) as session:
+        recording = asyncio.run(audio_analysis.process_audio(session, assessment_id, 1, "audio/abc.wav"))
+    assert recording.storage_key == "audio/abc.wav"
+    assert _count(db_engine, AudioRecording, assessment_id) == 1
+
+
+def test_rescanned_transcript_does_not_duplicate_flags(db_engine, assessment_id):
+    text = "some days I want to die"
+    assert persist_text_flags(assessment_id, 1, text, True)["flags_persisted"] == 1
+    assert persist_text_flags(assessment_id, 1, text, True)["flags_persisted"] == 0
+    assert _count(db_engine, SafetyFlag, assessment_id) == 1
+
+
+@pytest.mark.parametrize("raw", ["0,nan", "0,inf", "-1,2", "0", "0,x"])
+def test_bad_frame_timestamps_are_rejected(raw):
+    with pytest.raises(HTTPException) as exc:
+        video_analysis._parse_timestamps(raw, 2)
+    assert exc.value.status_code == 422
+
+
+def test_rejected_frame_batch_is_not_stored(client, assessment_id, monkeypatch, tmp_path):
+    monkeypatch.setattr(file_handler, "BASE_UPLOAD_DIR", tmp_path)
+    frames = [("files", (f"{i}.jpg", b"\xff\xd8frame", "image/jpeg")) for i in range(2)]
+    response = client.post(f"/video/frames/{assessment_id}", files=frames, data={"timestamps": "0,nan"})
+    assert response.status_code == 422
+    assert not any(tmp_path.rglob("*"))
@@ -0,0 +1,55 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+MIGRATIONS = Path(__file__).resolve().parents[1] / "migrations"
+
+
+def test_latest_feature_index_migration_upgrades_existing_table():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE extracted_features (id VARCHAR(32) PRIMARY KEY, assessment_id VARCHAR(32), "
+        "modality_type VARCHAR(24), feature_json TEXT, computed_at VARCHAR(32))"
+    )
+    script = (MIGRATIONS / "003_extracted_features_latest_idx.sql").read_text()
+    conn.executescript(script)
+    conn.executescript(script)  # idempotent
+
+    plan = " ".join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT feature_json FROM extracted_features "
+        "WHERE assessment_id = 'a' AND modality_type = 'text' ORDER BY computed_at DESC"
+    ))
+    assert "idx_extracted_features_latest" in plan
+
+
+def test_text_entry_job_migration_adds_unique_source_job_id():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE text_entries (id VARCHAR(32) PRIMARY KEY, assessment_id VARCHAR(32), raw_text TEXT)")
+    conn.executescript((MIGRATIONS / "004_text_entries_source_job_id.sql").read_text())
+
+    conn.execute("INSERT INTO text_entries (id, source_job_id) VALUES ('a', NULL), ('b', NULL), ('c', 'job-1')")
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO text_entries (id, source_job_id) VALUES ('d', 'job-1')")
+
+
+def test_model_registry_migration_dedupes_then_enforces_unique_versions():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE model_registry (id VARCHAR(32) PRIMARY KEY, model_name VARCHAR(256), "
+        "version VARCHAR(32), active INTEGER, created_at VARCHAR(32))"
+    )
+    conn.executemany("INSERT INTO model_registry VALUES (?, ?, ?, ?, ?)", [
+        ("old", "fusion_nn", "abc", 0, "2024-01-01"),
+        ("live", "fusion_nn", "abc", 1, "2024-01-02"),
+        ("other", "fusion_nn", "def", 0, "2024-01-03"),
+        ("hf1", "hf", None, 1, "2024-01-01"),
+        ("hf2", "hf", None, 1, "2024-01-01"),
+    ])
+    script = (MIGRATIONS / "005_model_registry_unique_version.sql").read_text()
+    conn.executescript(script)
+    conn.executescript(script)  # idempotent
+
+    assert {row[0] for row in conn.execute("SELECT id FROM model_registry")} == {"live", "other", "hf1", "hf2"}
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO model_registry (id, model_name, version) VALUES ('dup', 'fusion_nn', 'def')")
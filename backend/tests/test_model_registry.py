@@ -0,0 +1,38 @@
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.models.model_registry import ModelRegistry
+from app.services import model_registry_service as registry
+
+MODEL = "test_model"
+
+
+def _rows(db_engine):
+    with Session(db_engine) as session:
+        return session.exec(select(ModelRegistry).where(ModelRegistry.model_name == MODEL)).all()
+
+
+def test_version_registered_concurrently_is_kept_once(db_engine, monkeypatch, tmp_path):
+    with Session(db_engine) as session:
+        with session.begin():
+            session.execute(delete(ModelRegistry).where(ModelRegistry.model_name == MODEL))
+    artifact = tmp_path / "model.npz"
+    artifact.write_bytes(b"weights")
+    version = registry.artifact_version(artifact)
+    monkeypatch.setattr(registry, "_VERSIONS_DIR", tmp_path / "versions")
+    copy2 = registry.shutil.copy2
+
+    def copy_while_another_process_registers(src, dst):
+        with Session(db_engine) as other:
+            with other.begin():
+                other.add(ModelRegistry(model_name=MODEL, version=version, active=1))
+        return copy2(src, dst)
+
+    monkeypatch.setattr(registry.shutil, "copy2", copy_while_another_process_registers)
+    spec = {"path": artifact, "family": "test", "framework": "numpy"}
+    with Session(db_engine) as session:
+        with session.begin():
+            registry._register(session, MODEL, spec)
+
+    rows = _rows(db_engine)
+    assert [(row.version, row.active) for row in rows] == [(version, 1)]
@@ -0,0 +1,31 @@
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.services import replay_detection_service as replay
+
+
+def test_near_duplicate_found_behind_crowded_chunk(db_engine, assessment_id, monkeypatch):
+    monkeypatch.setattr(get_settings(), "replay_hash_max_distance", 3)
+    target = 0x0123_4567_89AB_CDEF
+    near = target ^ 0b101  # 2 bits away
+    # Same low chunk as the target, upper 48 bits (nearly) inverted: shares a chunk, never within range
+    upper = ((1 << 64) - 1) & ~0xFFFF
+    crowd = [f"{(target & 0xFFFF) | ((~target ^ (i << 16)) & upper):016x}" for i in range(700)]
+    with Session(db_engine) as session:
+        with session.begin():
+            replay.record_fingerprints(session, "video", "phash", [f"{near:016x}"], "older-assessment", 7)
+            replay.record_fingerprints(session, "video", "phash", crowd, "crowd-assessment", 8)
+
+    with Session(db_engine) as session:
+        matches = replay.find_near_duplicates(session, "video", f"{target:016x}", assessment_id)
+    assert [row.user_id for row in matches] == [7]
+
+
+def test_own_assessment_is_ignored(db_engine, assessment_id):
+    value = f"{0x0F0F_F0F0_3C3C_C3C3:016x}"
+    with Session(db_engine) as session:
+        with session.begin():
+            replay.record_fingerprints(session, "audio", "audio_fp", [value], assessment_id, 1)
+    with Session(db_engine) as session:
+        assert replay.find_near_duplicates(session, "audio", value, assessment_id) == []
+        assert len(replay.find_near_duplicates(session, "audio", value, "another-assessment")) == 1
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from sqlmodel import Session, select
+
+from app.models.analysis_result import AnalysisResult
+from app.models.assessment import Assessment
+from app.models.extracted_feature import ExtractedFeature
+from app.models.inference_run import InferenceRun
+from app.models.rescore_job import RescoreJob
+from app.services import fusion_engine_service, rescoring_service
+
+
+@pytest.fixture
+def scored_assessments(db_engine):
+    # Earlier jobs from other tests must not be resumed here
+    with Session(db_engine) as session:
+        with session.begin():
+            for job in session.exec(select(RescoreJob).where(RescoreJob.status != "completed")).all():
+                job.status = "completed"
+    ids = []
+    with Session(db_engine) as session:
+        with session.begin():
+            for score in (5, 12, 20):
+                assessment = Assessment(user_id=1)
+                session.add(assessment)
+                session.flush()
+                ids.append(assessment.id)
+                session.add(AnalysisResult(assessment_id=assessment.id, user_id=1, stress_score=0.5, mood_score=0.5))
+                session.add(ExtractedFeature(
+                    assessment_id=assessment.id,
+                    modality_type="questionnaire",
+                    feature_json=json.dumps({"total_score": score}),
+                ))
+    return ids
+
+
+def _runs(db_engine, ids):
+    with Session(db_engine) as session:
+        return session.exec(select(InferenceRun).where(InferenceRun.assessment_id.in_(ids))).all()
+
+
+def test_crash_before_checkpoint_leaves_no_partial_chunk(db_engine, scored_assessments, monkeypatch):
+    real_update = rescoring_service._update_job
+
+    def crash(session, job_id, **values):
+        if "last_assessment_id" in values:
+            raise RuntimeError("killed")
+        real_update(session, job_id, **values)
+
+    monkeypatch.setattr(rescoring_service, "_update_job", crash)
+    with pytest.raises(RuntimeError):
+        rescoring_service.rescore_history(batch_size=1000, throttle_seconds=0)
+    assert _runs(db_engine, scored_assessments) == []
+
+    monkeypatch.setattr(rescoring_service, "_update_job", real_update)
+    summary = rescoring_service.rescore_history(batch_size=1000, throttle_seconds=0)
+    assert summary["finished"]
+    runs = _runs(db_engine, scored_assessments)
+    assert sorted(run.assessment_id for run in runs) == sorted(scored_assessments)
+    with Session(db_engine) as session:
+        job = session.get(RescoreJob, summary["job_id"])
+        assert job.status == "completed"
+        assert job.processed == summary["processed"] >= len(scored_assessments)
+
+
+def test_resume_requires_same_engine_version(db_engine, scored_assessments, monkeypatch):
+    monkeypatch.setattr(rescoring_service, "_next_chunk", lambda session, after, size: [])
+    with Session(db_engine) as session:
+        with session.begin():
+            stale = RescoreJob(status="failed", engine_version="nn_v1:old:identity", last_assessment_id="0")
+            session.add(stale)
+        stale_id = stale.id
+
+    summary = rescoring_service.rescore_history(throttle_seconds=0)
+    assert summary["job_id"] != stale_id
+    with Session(db_engine) as session:
+        new_job = session.get(RescoreJob, summary["job_id"])
+        assert new_job.engine_version == fusion_engine_service.engine_version()
+        assert new_job.last_assessment_id is None
+        assert "superseded" in session.get(RescoreJob, stale_id).error
+    with Session(db_engine) as session:
+        with session.begin():
+            session.get(RescoreJob, summary["job_id"]).status = "failed"
+    assert rescoring_service.rescore_history(throttle_seconds=0)["job_id"] == summary["job_id"]
@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from app.core.config import get_settings
+from app.services import text_inference_service as tis
+from app.services.text_batch_engine import TextBatchEngine
+
+
+@pytest.fixture
+def local_engine(monkeypatch):
+    monkeypatch.setattr(tis, "_LOCAL_TEXT_FAILED_UNTIL", {})
+    monkeypatch.setattr(tis, "_TEXT_BATCH_ENGINE", None)
+    monkeypatch.setattr(get_settings(), "huggingface_text_timeout_seconds", 0.2)
+    monkeypatch.setattr(get_settings(), "text_batch_max_size", 4)
+    return get_settings().huggingface_text_model
+
+
+def test_load_failure_disables_local_model(local_engine, monkeypatch):
+    def fail_load(model_name):
+        raise RuntimeError("transformers_unavailable:missing")
+
+    monkeypatch.setattr(tis, "_get_local_text_pipeline", fail_load)
+    label, _, warnings = tis._classify_chunks_locally(["hello"])
+    assert label is None and "unavailable" in warnings[0]
+    assert local_engine in tis._LOCAL_TEXT_FAILED_UNTIL
+
+
+def test_slow_batch_does_not_disable_local_model(local_engine, monkeypatch):
+    release = threading.Event()
+
+    def slow_batch(texts):
+        release.wait(5)
+        return [[{"label": "joy", "score": 1.0}] for _ in texts]
+
+    monkeypatch.setattr(tis, "_TEXT_BATCH_ENGINE", TextBatchEngine(slow_batch, max_batch_size=4))
+    label, _, warnings = tis._classify_chunks_locally(["hello"])
+    release.set()
+    assert label is None and warnings
+    assert local_engine not in tis._LOCAL_TEXT_FAILED_UNTIL
+
+
+def test_submit_timeout_scales_with_chunk_count(local_engine, monkeypatch):
+    seen = {}
+
+    class Engine:
+        max_batch_size = 4
+
+        def submit(self, chunks, timeout=None):
+            seen["timeout"] = timeout
+            return [[{"label": "joy", "score": 1.0}] for _ in chunks]
+
+    monkeypatch.setattr(tis, "_TEXT_BATCH_ENGINE", Engine())
+    tis._classify_chunks_locally(["a"] * 9)
+    assert seen["timeout"] == pytest.approx(0.6)
+
+
+def test_submit_timeout_bounds_the_whole_submission():
+    release = threading.Event()
+
+    def slow_batch(texts):
+        release.wait(5)
+        return texts
+
+    engine = TextBatchEngine(slow_batch, max_batch_size=1)
+    with pytest.raises(TimeoutError):
+        engine.submit(["a", "b", "c"], timeout=0.1)
+    release.set()
+
+
+def test_timed_out_texts_are_not_run():
+    release = threading.Event()
+    seen = []
+
+    def slow_batch(texts):
+        seen.extend(texts)
+        release.wait(5)
+        return texts
+
+    engine = TextBatchEngine(slow_batch, max_batch_size=1)
+    with pytest.raises(TimeoutError):
+        engine.submit(["a", "b", "c"], timeout=0.1)
+    release.set()
+    assert engine.submit(["d"], timeout=5) == ["d"]
+    assert seen == ["a", "d"]
@@ -0,0 +1,39 @@
+import json
+from types import SimpleNamespace
+
+from sqlmodel import Session
+
+import tune_cascade
+from app.models.extracted_feature import ExtractedFeature
+from app.models.text_entry import TextEntry
+
+
+def test_text_samples_pair_each_feature_with_its_own_entry(db_engine, assessment_id, monkeypatch):
+    monkeypatch.setattr(tune_cascade, "text_first_stage", lambda text: SimpleNamespace(label=text, margin=1.0))
+    rows = [
+        ("2026-01-01T10:00:00.000100", "first entry", "2026-01-01T10:00:00.000200", "sadness"),
+        ("2026-01-01T10:05:00.000100", "second entry", "2026-01-01T10:05:00.000050", "joy"),
+        ("2026-01-01T10:09:00", "third entry", None, None),
+    ]
+    with Session(db_engine) as session:
+        with session.begin():
+            for entry_at, text, feature_at, emotion in rows:
+                session.add(TextEntry(assessment_id=assessment_id, user_id=1, raw_text=text, created_at=entry_at))
+                if feature_at:
+                    session.add(ExtractedFeature(
+                        assessment_id=assessment_id,
+                        modality_type="text",
+                        feature_json=json.dumps({"inference_source": "local", "emotion": emotion}),
+                        computed_at=feature_at,
+                    ))
+            # A heavy feature with no entry written alongside it is dropped
+            session.add(ExtractedFeature(
+                assessment_id=assessment_id,
+                modality_type="text",
+                feature_json=json.dumps({"inference_source": "local", "emotion": "anger"}),
+                computed_at="2026-01-01T11:00:00",
+            ))
+
+    with Session(db_engine) as session:
+        samples = [s for s in tune_cascade._text_samples(session) if s[0].endswith("entry")]
+    assert sorted(samples) == [("first entry", 1.0, "sadness"), ("second entry", 1.0, "joy")]
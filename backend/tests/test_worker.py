@@ -0,0 +1,24 @@
+import asyncio
+
+import worker
+from app.core.config import get_settings
+
+
+def test_worker_keeps_syncing_models(monkeypatch):
+    calls = []
+    monkeypatch.setattr(get_settings(), "model_reload_poll_seconds", 0.01)
+    monkeypatch.setattr(worker, "sync_models", lambda: calls.append(1))
+
+    async def run():
+        task = asyncio.create_task(worker._model_reload_loop())
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    asyncio.run(run())
+    assert len(calls) >= 2
+
+
+def test_reload_loop_disabled_when_poll_is_zero(monkeypatch):
+    monkeypatch.setattr(get_settings(), "model_reload_poll_seconds", 0)
+    monkeypatch.setattr(worker, "sync_models", lambda: (_ for _ in ()).throw(AssertionError("synced")))
+    asyncio.run(asyncio.wait_for(worker._model_reload_loop(), timeout=1))
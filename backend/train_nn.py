@@ -2,7 +2,8 @@
 MindSentry Fusion Neural Network Training Script
 =================================================
 Generates synthetic training data covering 5 wellness archetypes,
-then trains a sklearn MLPRegressor and saves it to ml_models/fusion_nn.pkl.
+then trains a sklearn MLPRegressor and saves it to ml_models/fusion_nn.pkl
+(plus the fusion_nn.npz arrays the scoring service actually serves from).
 
 Usage:
     cd backend
@@ -24,6 +25,8 @@ from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error
 
+from app.services.fusion_nn import export_arrays
+
 
 # ── Reproducibility ───────────────────────────────────────────
 RNG = np.random.default_rng(42)
@@ -318,11 +321,13 @@ def train(total_samples: int = 6000):
 
     with open(model_path, "wb") as f:
         pickle.dump(model, f)
+    arrays_path = export_arrays(model)
+    print(f"  Exported serving weights to: {arrays_path}")
 
     size_kb = model_path.stat().st_size / 1024
     print(f"\n  Saved to: {model_path}  ({size_kb:.1f} KB)")
     print("\n  The scoring service will automatically use this model.")
-    print("  Restart the FastAPI server to activate it.")
+    print("  A running server registers and activates it within MODEL_RELOAD_POLL_SECONDS.")
 
 
 if __name__ == "__main__":
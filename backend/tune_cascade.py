@@ -0,0 +1,177 @@
+"""Tune cascade inference thresholds from stored ExtractedFeature rows.
+
+For every stored result where the heavy model produced a label, compare it
+with the first-stage label and pick the lowest margin threshold whose
+first-stage decisions still agree with the heavy model at the target rate.
+
+Text samples are re-scored from the stored TextEntry raw text, so history
+recorded before the cascade existed is usable. Face samples come from the
+per-frame cascade metadata recorded in video feature rows (escalations and
+audited first-stage hits).
+
+Usage:
+    cd backend
+    python tune_cascade.py
+
+Optional arguments:
+    --target-agreement F   Required first-stage/heavy agreement (default: 0.90)
+    --min-samples N        Minimum samples above a threshold to trust it (default: 20)
+    --dry-run              Print the report without writing the thresholds file
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models.extracted_feature import ExtractedFeature
+from app.models.text_entry import TextEntry
+from app.services.cascade_inference_service import _THRESHOLDS_PATH, text_first_stage
+
+_HEAVY_TEXT_SOURCES = {"huggingface", "local"}
+_PAIR_TOLERANCE_SECONDS = 5.0
+
+
+def _load_json(raw: str | None) -> dict | None:
+    if not raw:
+        return None
+    try:
+        payload = json.loads(raw)
+    except Exception:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _timestamp(value: str | None) -> float | None:
+    try:
+        return datetime.fromisoformat(value).timestamp() if value else None
+    except ValueError:
+        return None
+
+
+def _text_samples(session: Session) -> list[tuple[str | None, float, str]]:
+    """Pair each heavy-model text feature with the entry it was computed from.
+
+    process_text writes the entry and its feature in one transaction, so the
+    entry of the same assessment closest in time is the source; features with
+    no entry within ``_PAIR_TOLERANCE_SECONDS`` are skipped.
+    """
+    features = session.exec(
+        select(ExtractedFeature).where(ExtractedFeature.modality_type == "text")
+    ).all()
+    entries: dict[str, list[tuple[float, TextEntry]]] = defaultdict(list)
+    for entry in session.exec(
+        select(TextEntry).where(TextEntry.assessment_id.in_({f.assessment_id for f in features}))
+    ).all():
+        created = _timestamp(entry.created_at)
+        if created is not None:
+            entries[entry.assessment_id].append((created, entry))
+
+    samples = []
+    for feature in features:
+        payload = _load_json(feature.feature_json)
+        computed = _timestamp(feature.computed_at)
+        if not payload or payload.get("inference_source") not in _HEAVY_TEXT_SOURCES or computed is None:
+            continue
+        candidates = entries.get(feature.assessment_id)
+        if not candidates:
+            continue
+        gap, entry = min(((abs(created - computed), entry) for created, entry in candidates), key=lambda c: c[0])
+        if gap > _PAIR_TOLERANCE_SECONDS:
+            continue
+        first_stage = text_first_stage(entry.raw_text or "")
+        samples.append((first_stage.label, first_stage.margin, str(payload.get("emotion"))))
+    return samples
+
+
+def _face_samples(session: Session) -> list[tuple[str | None, float, str]]:
+    samples = []
+    rows = session.exec(
+        select(ExtractedFeature).where(ExtractedFeature.modality_type == "video")
+    ).all()
+    for feature in rows:
+        payload = _load_json(feature.feature_json) or {}
+        for step in payload.get("cascade") or []:
+            if step.get("heavy_label"):
+                samples.append((
+                    step.get("first_stage_label"),
+                    float(step.get("first_stage_margin") or 0.0),
+                    str(step["heavy_label"]),
+                ))
+    return samples
+
+
+def _sweep(samples: list[tuple[str | None, float, str]], target_agreement: float, min_samples: int) -> dict:
+    labelled = [(label, margin, heavy) for label, margin, heavy in samples if label is not None]
+    report = {"sample_count": len(samples), "threshold": None, "rows": []}
+    if not labelled:
+        return report
+
+    margins = np.asarray([m for _, m, _ in labelled], dtype=np.float64)
+    agree = np.asarray([1.0 if label == heavy else 0.0 for label, _, heavy in labelled])
+    for threshold in np.round(np.linspace(0.0, 1.0, 21), 2):
+        served = margins >= threshold
+        n_served = int(served.sum())
+        agreement = float(agree[served].mean()) if n_served else None
+        coverage = n_served / len(samples)
+        report["rows"].append({
+            "threshold": float(threshold),
+            "served": n_served,
+            "coverage": round(coverage, 4),
+            "agreement": round(agreement, 4) if agreement is not None else None,
+        })
+        if (
+            report["threshold"] is None
+            and agreement is not None
+            and n_served >= min_samples
+            and agreement >= target_agreement
+        ):
+            report["threshold"] = float(threshold)
+    return report
+
+
+def tune(target_agreement: float = 0.9, min_samples: int = 20, dry_run: bool = False) -> dict:
+    with Session(engine) as session:
+        reports = {
+            "text": _sweep(_text_samples(session), target_agreement, min_samples),
+            "face": _sweep(_face_samples(session), target_agreement, min_samples),
+        }
+
+    print("\n=== MindSentry Cascade Threshold Tuning ===")
+    for modality, report in reports.items():
+        print(f"\n[{modality}] samples={report['sample_count']} chosen_threshold={report['threshold']}")
+        for row in report["rows"]:
+            print(
+                f"  t={row['threshold']:.2f}  served={row['served']:5d}  "
+                f"coverage={row['coverage']:.3f}  agreement={row['agreement']}"
+            )
+
+    thresholds = {m: r["threshold"] for m, r in reports.items() if r["threshold"] is not None}
+    if dry_run or not thresholds:
+        print("\nNo thresholds written." if not thresholds else "\nDry run: thresholds not written.")
+        return thresholds
+
+    payload = {
+        **thresholds,
+        "target_agreement": target_agreement,
+        "sample_counts": {m: r["sample_count"] for m, r in reports.items()},
+    }
+    _THRESHOLDS_PATH.parent.mkdir(exist_ok=True)
+    _THRESHOLDS_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"\nSaved thresholds to: {_THRESHOLDS_PATH}")
+    print("Restart the FastAPI server to activate the tuned thresholds.")
+    return thresholds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune MindSentry cascade inference thresholds")
+    parser.add_argument("--target-agreement", type=float, default=0.9)
+    parser.add_argument("--min-samples", type=int, default=20)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    tune(args.target_agreement, args.min_samples, args.dry_run)
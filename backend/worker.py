@@ -0,0 +1,88 @@
+"""Analysis worker – consumes the durable job queue (analysis_jobs).
+
+Start one or more of these next to the API when ANALYSIS_JOBS_ENABLED=true.
+Workers need the same database and uploads directory as the API; each loads
+its own models, so scale them by adding processes or machines. Like the API,
+they re-sync the fusion / calibration models every MODEL_RELOAD_POLL_SECONDS.
+
+Usage:
+    cd backend
+    python worker.py [--concurrency 2] [--types analyse_audio,analyse_video] [--no-warmup]
+"""
+# ── Same offline lock as app/main.py: must precede any HF import ──────
+import os as _os
+_os.environ["HF_HUB_OFFLINE"] = "1"
+_os.environ["TRANSFORMERS_OFFLINE"] = "1"
+_os.environ["HF_HUB_DISABLE_SYMLINKS_WARNING"] = "1"
+# ── END offline lock ──────────────────────────────────────────────────
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.core.config import get_settings
+from app.core.database import create_db_and_tables
+from app.main import _setup_hf_environment
+from app.services.cpu_budget_service import autotune_cpu_budget
+from app.services.hf_inference_service import close_hf_client
+from app.services.job_worker_service import HANDLERS, run_worker
+from app.services.model_registry_service import sync_models
+from app.services.text_emotion_cache import load_text_emotion_cache, save_text_emotion_cache
+from app.services.warmup_service import run_warmup
+
+logger = logging.getLogger("worker")
+
+
+async def _model_reload_loop() -> None:
+    """Pick up retrained / rolled-back fusion and calibration models, as the API lifespan does."""
+    interval = get_settings().model_reload_poll_seconds
+    if interval <= 0:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(sync_models)
+        except Exception as exc:
+            logger.error("Model registry sync failed: %s", exc, exc_info=True)
+
+
+async def _main(concurrency, job_types, warmup: bool) -> None:
+    create_db_and_tables()
+    _setup_hf_environment()
+    load_text_emotion_cache()
+    await asyncio.to_thread(autotune_cpu_budget)
+    await asyncio.to_thread(sync_models)
+    if warmup:
+        await asyncio.to_thread(run_warmup)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            signal.signal(sig, lambda *_: loop.call_soon_threadsafe(stop.set))
+    reload_task = asyncio.create_task(_model_reload_loop())
+    try:
+        await run_worker(stop, concurrency=concurrency, job_types=job_types)
+    finally:
+        reload_task.cancel()
+        save_text_emotion_cache()
+        await close_hf_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=None, help="jobs processed at once (default WORKER_CONCURRENCY)")
+    parser.add_argument("--types", default=None, help=f"comma-separated job types to consume (default all: {', '.join(HANDLERS)})")
+    parser.add_argument("--no-warmup", action="store_true", help="skip loading models up front")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    job_types = [t.strip() for t in args.types.split(",") if t.strip()] if args.types else None
+    asyncio.run(_main(args.concurrency, job_types, warmup=not args.no_warmup))
+
+
+if __name__ == "__main__":
+    main()